@@ -331,10 +331,17 @@ def _trace_single_entity(entity_type: str, value: str, postgres_client, neo4j_cl
             sys.path.remove(blueprint_path)
         sys.path.insert(0, blueprint_path)
         
-        # Clear ALL src modules to force completely fresh import
-        modules_to_clear = [k for k in list(sys.modules.keys()) if k == 'src' or k.startswith('src.')]
-        for mod in modules_to_clear:
-            del sys.modules[mod]
+        # Clear src modules only when another blueprint's src package is loaded;
+        # BlackWire's own modules are kept so their in-memory caches and
+        # connection pools survive between traces
+        blackwire_src = blueprint_dir / 'src'
+        if any(
+            name in sys.modules and Path(getattr(sys.modules[name], '__file__', None) or '').parent != package_dir
+            for name, package_dir in (('src', blackwire_src), ('src.enrichment', blackwire_src / 'enrichment'))
+        ):
+            modules_to_clear = [k for k in list(sys.modules.keys()) if k == 'src' or k.startswith('src.')]
+            for mod in modules_to_clear:
+                del sys.modules[mod]
         
         # Now import - should use BlackWire's module
         from src.enrichment.enrichment_pipeline import enrich_entity
@@ -218,6 +218,32 @@ class PostgresClient:
             ON investigations(entity_type, entity_id)
         """)
         
+        # Indexes for the network-detection counts in risk assessment
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_phone_numbers_voip_provider
+            ON phone_numbers(voip_provider)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_phone_numbers_country_carrier
+            ON phone_numbers(country, carrier)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_domain_enrichment_registrar
+            ON domain_enrichment(registrar)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_domain_enrichment_ip_address
+            ON domain_enrichment(ip_address)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_domain_enrichment_ip_addresses
+            ON domain_enrichment USING GIN (ip_addresses)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_messaging_handles_platform
+            ON messaging_handles(platform)
+        """)
+        
         self.conn.commit()
         cursor.close()
         print("✅ PostgreSQL tables created/verified")
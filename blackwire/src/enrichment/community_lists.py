@@ -1,19 +1,98 @@
 """Community-maintained lists of scam accounts, phone numbers, and domains."""
 
+import threading
 import requests
-from typing import Dict, List, Set, Optional
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, FrozenSet, List, Set, Optional, Tuple
 from src.utils.logger import logger
 from src.utils.cache import get_cached, set_cached
+from src.utils.disk_cache import get_disk_cached, set_disk_cached, get_disk_cached_bytes, set_disk_cached_bytes
 from src.utils.retry import retry_with_backoff
 
+# Try to import pyahocorasick for single-pass document scanning (optional)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
 
-def get_scam_phone_numbers() -> Set[str]:
+
+# Process-wide indexes built once per refresh window so lookups never rebuild sets
+_SCAM_LIST_TTL = timedelta(hours=24)
+# An empty list usually means every source failed, so it is re-fetched much sooner
+_SCAM_LIST_RETRY = timedelta(minutes=5)
+_SCAM_PHONES: Optional[FrozenSet[str]] = None
+_SCAM_PHONES_LAST10: Optional[FrozenSet[str]] = None
+_SCAM_PHONES_EXPIRES: Optional[datetime] = None
+_SCAM_PHONES_AUTOMATON = None
+_SCAM_INSTAGRAM: Optional[FrozenSet[str]] = None
+_SCAM_INSTAGRAM_EXPIRES: Optional[datetime] = None
+_SCAM_LISTS_LOCK = threading.Lock()
+
+
+def _get_scam_phone_index() -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """Return (full numbers, last-10-digit suffixes) for the scam phone list."""
+    global _SCAM_PHONES, _SCAM_PHONES_LAST10, _SCAM_PHONES_EXPIRES, _SCAM_PHONES_AUTOMATON
+    
+    if _SCAM_PHONES is not None and datetime.now() < _SCAM_PHONES_EXPIRES:
+        return _SCAM_PHONES, _SCAM_PHONES_LAST10
+    
+    with _SCAM_LISTS_LOCK:
+        # Another thread may have rebuilt the index while we waited
+        if _SCAM_PHONES is None or datetime.now() >= _SCAM_PHONES_EXPIRES:
+            phone_numbers = frozenset(_fetch_scam_phone_numbers())
+            _SCAM_PHONES_LAST10 = frozenset(p[-10:] for p in phone_numbers if len(p) >= 10)
+            _SCAM_PHONES_AUTOMATON = _build_automaton(phone_numbers)
+            _SCAM_PHONES = phone_numbers
+            _SCAM_PHONES_EXPIRES = datetime.now() + (_SCAM_LIST_TTL if phone_numbers else _SCAM_LIST_RETRY)
+        return _SCAM_PHONES, _SCAM_PHONES_LAST10
+
+
+def _build_automaton(patterns: FrozenSet[str]):
+    """Compile patterns into an Aho-Corasick automaton (None if unavailable or empty)."""
+    if not AHOCORASICK_AVAILABLE or not patterns:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for pattern in patterns:
+        automaton.add_word(pattern, pattern)
+    automaton.make_automaton()
+    return automaton
+
+
+def _pack_phone_numbers(phone_numbers: Set[str]) -> bytes:
+    """Pack digit-only numbers as sorted unsigned 64-bit ints for the disk cache."""
+    # Prefix a '1' so leading zeros survive the int round-trip (max 18 digits fits in u64)
+    packed = array("Q", sorted(int("1" + p) for p in phone_numbers if len(p) <= 18))
+    return packed.tobytes()
+
+
+def _unpack_phone_numbers(data: bytes) -> Set[str]:
+    """Inverse of _pack_phone_numbers."""
+    packed = array("Q")
+    packed.frombytes(data)
+    return {str(n)[1:] for n in packed}
+
+
+def get_scam_phone_numbers() -> FrozenSet[str]:
+    """Get community-maintained list of scam phone numbers (digits only)."""
+    return _get_scam_phone_index()[0]
+
+
+def _fetch_scam_phone_numbers() -> Set[str]:
     """Fetch community-maintained list of scam phone numbers."""
     # Check cache first (update daily)
     cached = get_cached("community_lists", "scam_phones", ttl_hours=24)
     if cached:
         return set(cached)
     
+    # Survives restarts and is shared by all worker processes
+    packed = get_disk_cached_bytes("community_lists", "scam_phones")
+    if packed:
+        return _unpack_phone_numbers(packed)
+    
     phone_numbers = set()
     
     # Source 1: GitHub repos with spam/scam number lists
@@ -40,17 +119,36 @@ def get_scam_phone_numbers() -> Set[str]:
     # Cache for 24 hours
     if phone_numbers:
         set_cached("community_lists", "scam_phones", list(phone_numbers), ttl_hours=24)
+        set_disk_cached_bytes("community_lists", "scam_phones", _pack_phone_numbers(phone_numbers), ttl_hours=24)
     
     return phone_numbers
 
 
-def get_scam_instagram_accounts() -> Set[str]:
+def get_scam_instagram_accounts() -> FrozenSet[str]:
+    """Get community-maintained list of scam Instagram accounts (lowercase, no @)."""
+    global _SCAM_INSTAGRAM, _SCAM_INSTAGRAM_EXPIRES
+    
+    if _SCAM_INSTAGRAM is not None and datetime.now() < _SCAM_INSTAGRAM_EXPIRES:
+        return _SCAM_INSTAGRAM
+    
+    with _SCAM_LISTS_LOCK:
+        if _SCAM_INSTAGRAM is None or datetime.now() >= _SCAM_INSTAGRAM_EXPIRES:
+            _SCAM_INSTAGRAM = frozenset(_fetch_scam_instagram_accounts())
+            _SCAM_INSTAGRAM_EXPIRES = datetime.now() + (_SCAM_LIST_TTL if _SCAM_INSTAGRAM else _SCAM_LIST_RETRY)
+        return _SCAM_INSTAGRAM
+
+
+def _fetch_scam_instagram_accounts() -> Set[str]:
     """Fetch community-maintained list of scam Instagram accounts."""
     # Check cache first (update daily)
     cached = get_cached("community_lists", "scam_instagram", ttl_hours=24)
     if cached:
         return set(cached)
     
+    disk_cached = get_disk_cached("community_lists", "scam_instagram")
+    if disk_cached:
+        return set(disk_cached)
+    
     accounts = set()
     
     # Source 1: GitHub repos with scam account lists
@@ -79,6 +177,7 @@ def get_scam_instagram_accounts() -> Set[str]:
     # Cache for 24 hours
     if accounts:
         set_cached("community_lists", "scam_instagram", list(accounts), ttl_hours=24)
+        set_disk_cached("community_lists", "scam_instagram", sorted(accounts), ttl_hours=24)
     
     return accounts
 
@@ -89,7 +188,7 @@ def check_phone_against_community_lists(phone: str) -> Optional[Dict]:
         # Clean phone number for comparison
         phone_clean = ''.join(filter(str.isdigit, phone))
         
-        scam_numbers = get_scam_phone_numbers()
+        scam_numbers, scam_last10 = _get_scam_phone_index()
         
         # Check exact match
         if phone_clean in scam_numbers:
@@ -99,21 +198,52 @@ def check_phone_against_community_lists(phone: str) -> Optional[Dict]:
                 "note": "Phone number found in community-maintained scam database"
             }
         
-        # Check if last 10 digits match (for numbers with country codes)
-        if len(phone_clean) > 10:
-            last_10 = phone_clean[-10:]
-            if last_10 in scam_numbers:
-                return {
-                    "found": True,
-                    "source": "Community scam list",
-                    "note": "Phone number found in community-maintained scam database (partial match)"
-                }
+        # Check if last 10 digits match (for numbers with or without country codes)
+        if phone_clean[-10:] in scam_last10:
+            return {
+                "found": True,
+                "source": "Community scam list",
+                "note": "Phone number found in community-maintained scam database (partial match)"
+            }
     except Exception as e:
         logger.debug(f"Community list phone check error: {e}")
     
     return None
 
 
+def check_document_for_scam_phones(text: str) -> List[str]:
+    """
+    Scan free text (chat logs, emails, etc.) for any known scam phone number.
+    
+    Uses a single Aho-Corasick pass over the text when pyahocorasick is
+    installed, instead of extracting candidate numbers and looking each one up.
+    
+    Args:
+        text: Document text to scan
+    
+    Returns:
+        Distinct scam numbers found in the text, in order of first appearance
+    """
+    if not text:
+        return []
+    
+    try:
+        scam_numbers, _ = _get_scam_phone_index()
+        automaton = _SCAM_PHONES_AUTOMATON
+        
+        if automaton is not None:
+            hits = [number for _, number in automaton.iter(text)]
+        else:
+            # Fallback: substring scan per pattern (fine for small lists)
+            hits = sorted((number for number in scam_numbers if number in text), key=text.find)
+        
+        return list(dict.fromkeys(hits))
+    except Exception as e:
+        logger.debug(f"Community list document scan error: {e}")
+    
+    return []
+
+
 def check_instagram_against_community_lists(username: str) -> Optional[Dict]:
     """Check if Instagram username is in community scam lists."""
     try:
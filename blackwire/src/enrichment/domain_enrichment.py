@@ -1,13 +1,38 @@
 """Domain enrichment - adapts patterns from AIPornTracker."""
 
 import os
-import requests
+import asyncio
+import functools
 import whois
-from typing import Dict, Optional
-import socket
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 import dns.resolver
 from dotenv import load_dotenv
 
+try:
+    import whoisit
+    WHOISIT_AVAILABLE = True
+except ImportError:
+    WHOISIT_AVAILABLE = False
+    whoisit = None
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+    uvloop = None
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
+
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -16,15 +41,219 @@ from src.utils.rate_limiter import check_rate_limit, record_api_request
 from src.utils.retry import retry_with_backoff
 from src.utils.logger import logger
 from src.utils.config import Config
+from src.utils.cache import TTLCache
+from src.utils.disk_cache import get_disk_cached, set_disk_cached
+from src.utils.http_session import create_session
+from src.utils.dns_resolver import get_async_resolver, resolve_many
 
 load_dotenv()
 
 
+# Record types fetched for every domain
+_DNS_RECORD_TYPES = ("A", "MX", "NS", "AAAA", "CNAME")
+
+# URL shortener hosts (their own DNS/WHOIS says nothing about the target)
+_SHORTLINK_DOMAINS = ("bit.ly", "t.co", "tinyurl.com", "short.link", "rebrand.ly", "cutt.ly")
+
+# Definitive DNS outcomes (not retried through the full resolver)
+_DNS_FINAL_ERRORS = (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer)
+
+# How long enrich_domain waits on a single stage (each stage also has its own network timeouts)
+_STAGE_TIMEOUT_SECONDS = 30
+
+# Per-process lookup caches (WHOIS changes rarely, geo daily, page content more often)
+_WHOIS_CACHE = TTLCache(maxsize=10000, ttl_seconds=7 * 86400)
+_IP_LOCATION_CACHE = TTLCache(maxsize=50000, ttl_seconds=86400)
+_CMS_CACHE = TTLCache(maxsize=10000, ttl_seconds=6 * 3600)
+
+# ip-api.com fields requested for both single and batch lookups (batch takes <= 100 IPs)
+_IP_API_FIELDS = "status,message,country,city,isp,org,as,asname,query"
+_IP_API_BATCH_SIZE = 100
+_MISSING = object()
+
+# Disk cache TTLs (hours) so lookups also survive restarts and are shared across workers
+_WHOIS_DISK_TTL_HOURS = 7 * 24
+_IP_LOCATION_DISK_TTL_HOURS = 24
+_CMS_DISK_TTL_HOURS = 6
+_DNS_DISK_TTL_HOURS = 1
+
+# CDN indicators matched against nameserver/CNAME targets, in priority order
+_CDN_MAP = {
+    "cloudflare": "Cloudflare",
+    "cloudfront": "AWS CloudFront",
+    "fastly": "Fastly",
+    "akamai": "Akamai",
+    "incapdns": "Incapsula",
+    "azure": "Azure CDN",
+    "google": "Google Cloud CDN"
+}
+# ISP names that mean geolocation reflects a CDN edge, not the origin server
+_CDN_ISP_KEYS = frozenset(["cloudflare", "fastly", "cloudfront", "akamai"])
+_CDN_RE = re.compile("(" + "|".join(_CDN_MAP) + ")", re.I)
+
+# Basic CMS detection patterns (dict order is match priority)
+_CMS_PATTERNS = {
+    "WordPress": ["wp-content", "wp-includes", "wp-json", "/wp-admin/", "wordpress"],
+    "Joomla": ["joomla", "/administrator/", "com_content", "option=com_"],
+    "Drupal": ["drupal", "sites/all/", "/sites/default/", "drupal.js"],
+    "Shopify": ["shopify", "cdn.shopify.com", "myshopify.com", "shopify-analytics"],
+    "Squarespace": ["squarespace", "sqs-cdn", "squarespace.com"],
+    "Magento": ["magento", "/media/", "/skin/", "mage/"],
+    "WooCommerce": ["woocommerce", "wc-", "woocommerce-"],
+    "Ghost": ["ghost", "ghost.org"],
+    "Wix": ["wix.com", "wixstatic.com", "wixpress.com"]
+}
+_CMS_NAMES = list(_CMS_PATTERNS)
+_CMS_NAMES_LC = {cms.lower(): cms for cms in _CMS_PATTERNS}
+_WORD_RE = re.compile(r"[a-z]+")
+_CMS_MAX_BYTES = 128 * 1024
+_META_GENERATOR_RE = re.compile(r'<meta[^>]+name=["\']generator["\'][^>]+content=["\']([^"\']+)["\']', re.I)
+
+# Shared keep-alive session: avoids a fresh TCP/TLS handshake per lookup
+SESSION = create_session(pool_connections=32, pool_maxsize=64)
+
+# Per-service concurrency caps for enrich_domain_async, so batch runs don't
+# flood upstream resolvers/APIs or exhaust file descriptors
+_SERVICE_CONCURRENCY = {
+    "dns": 256,
+    "whois": 16,
+    "crt.sh": 8,
+    "ip-api.com": 45,
+    "http": 64,
+}
+
+_enrichment_pool = None
+_enrichment_pool_lock = threading.Lock()
+_service_semaphores = {}
+_service_semaphores_lock = threading.Lock()
+
+# The same caps across all event loops: each sync enrich_domain call runs its own
+# loop, so only these bound concurrent callers' blocking stages process-wide
+_SERVICE_THREAD_SLOTS = {
+    service: threading.BoundedSemaphore(limit) for service, limit in _SERVICE_CONCURRENCY.items()
+}
+
+
+def _get_enrichment_pool() -> ThreadPoolExecutor:
+    """Get the shared thread pool that runs blocking enrichment stages (WHOIS, HTTP)."""
+    global _enrichment_pool
+    if _enrichment_pool is None:
+        with _enrichment_pool_lock:
+            if _enrichment_pool is None:
+                _enrichment_pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="domain-enrich")
+    return _enrichment_pool
+
+
+def _get_service_semaphores() -> Dict[str, asyncio.Semaphore]:
+    """Get the per-service semaphores for the running event loop (semaphores are loop-bound)."""
+    loop = asyncio.get_running_loop()
+    with _service_semaphores_lock:
+        semaphores = _service_semaphores.get(loop)
+        if semaphores is None:
+            # Drop entries for loops that have finished (e.g. previous asyncio.run calls)
+            for stale_loop in [other for other in _service_semaphores if other.is_closed()]:
+                _service_semaphores.pop(stale_loop, None)
+            semaphores = {service: asyncio.Semaphore(limit) for service, limit in _SERVICE_CONCURRENCY.items()}
+            _service_semaphores[loop] = semaphores
+    return semaphores
+
+
+def _run_with_service_slot(service: str, func, *args, **kwargs):
+    """Run a blocking stage while holding one of the service's process-wide slots."""
+    with _SERVICE_THREAD_SLOTS[service]:
+        return func(*args, **kwargs)
+
+
+async def _resolve_all(domain: str) -> list:
+    """
+    Query every record type at once; failed lookups come back as exceptions.
+    
+    With explicit upstreams configured, all types go out pipelined on one UDP
+    socket; any type that gets no definitive answer that way (timeout, socket
+    error) is retried through the full resolver.
+    """
+    answers = [None] * len(_DNS_RECORD_TYPES)
+    if Config.DNS_NAMESERVERS:
+        try:
+            answers = await resolve_many(domain, _DNS_RECORD_TYPES)
+        except Exception as e:
+            logger.debug(f"Pipelined DNS query failed for {domain}: {e}")
+    
+    retry = [
+        i for i, answer in enumerate(answers)
+        if answer is None or (isinstance(answer, BaseException) and not isinstance(answer, _DNS_FINAL_ERRORS))
+    ]
+    if retry:
+        resolver = get_async_resolver()
+        retried = await asyncio.gather(
+            *[resolver.resolve(domain, _DNS_RECORD_TYPES[i]) for i in retry],
+            return_exceptions=True
+        )
+        for i, answer in zip(retry, retried):
+            answers[i] = answer
+    return answers
+
+
+def _load_cached_dns_records(domain: str) -> Optional[Dict[str, Any]]:
+    """Load persisted DNS answers; record types that had no answer come back as errors."""
+    cached = get_disk_cached("dns_records", domain.lower())
+    if cached is None:
+        return None
+    return {
+        rt: answers if answers is not None else LookupError(f"No {rt} record (cached)")
+        for rt, answers in cached.items()
+    }
+
+
+def _store_dns_records(domain: str, dns_records: Dict[str, Any]) -> None:
+    """Persist DNS answers as strings, but only when the A lookup succeeded."""
+    if isinstance(dns_records.get("A"), BaseException):
+        return
+    set_disk_cached("dns_records", domain.lower(), {
+        rt: None if isinstance(answers, BaseException) else [str(answer) for answer in answers]
+        for rt, answers in dns_records.items()
+    }, ttl_hours=_DNS_DISK_TTL_HOURS)
+
+
+def _dns_answer(dns_records: Dict[str, Any], record_type: str):
+    """Return the answer for a record type, re-raising its lookup error if it failed."""
+    answer = dns_records[record_type]
+    if isinstance(answer, BaseException):
+        raise answer
+    return answer
+
+
 def enrich_domain(domain: str) -> Dict:
     """
     Enrich a domain with DNS, IP, hosting, and redirect chain data.
     This adapts the domain enrichment patterns from AIPornTracker.
     
+    Synchronous wrapper around enrich_domain_async; async callers should
+    await enrich_domain_async directly instead.
+    
+    Args:
+        domain: Domain name to enrich
+        
+    Returns:
+        Dictionary containing enrichment data
+    """
+    if UVLOOP_AVAILABLE:
+        return uvloop.run(enrich_domain_async(domain))
+    return asyncio.run(enrich_domain_async(domain))
+
+
+async def enrich_domain_async(domain: str) -> Dict:
+    """
+    Enrich a domain without blocking the event loop.
+    
+    DNS is queried with the async resolver; blocking WHOIS/HTTP stages run on
+    the shared thread pool via run_in_executor. Known shortlinks only get
+    their redirect chain, and names that don't resolve stop after DNS.
+    Otherwise independent lookups run concurrently in two waves: everything
+    that only needs the domain name first, then the lookups that depend on
+    the resolved IP address or WHOIS registrar. Many domains can be enriched
+    concurrently on one event loop.
+    
     Args:
         domain: Domain name to enrich
         
@@ -60,289 +289,140 @@ def enrich_domain(domain: str) -> Dict:
     
     try:
         # Remove protocol if present
+        original_url = domain.strip()
         domain = domain.replace("http://", "").replace("https://", "").replace("www.", "")
         domain = domain.split("/")[0].strip()
         
-        # Check if it's a shortlink
-        shortlink_domains = ["bit.ly", "t.co", "tinyurl.com", "short.link", "rebrand.ly", "cutt.ly"]
-        for short_domain in shortlink_domains:
-            if short_domain in domain.lower():
+        # Check if it's a shortlink (exact host or subdomain, so e.g. microsoft.com isn't "t.co")
+        domain_lower = domain.lower()
+        for short_domain in _SHORTLINK_DOMAINS:
+            if domain_lower == short_domain or domain_lower.endswith("." + short_domain):
                 result["is_shortlink"] = True
                 result["shortlink_provider"] = short_domain
                 break
         
-        # DNS lookup
-        try:
-            ip = socket.gethostbyname(domain)
-            result["ip_address"] = ip
-            result["ip_addresses"] = [ip]
-        except socket.gaierror:
-            result["errors"].append(f"DNS lookup failed for {domain}")
-        
-        # Get A records
-        try:
-            answers = dns.resolver.resolve(domain, 'A')
-            result["ip_addresses"] = [str(answer) for answer in answers]
-            result["ip_address"] = result["ip_addresses"][0] if result["ip_addresses"] else None
-        except Exception as e:
-            logger.debug(f"DNS A record lookup failed for {domain}: {e}")
-            result["errors"].append(f"A record lookup failed: {str(e)}")
+        loop = asyncio.get_running_loop()
+        pool = _get_enrichment_pool()
+        semaphores = _get_service_semaphores()
         
-        # Get MX records
-        try:
-            mx_answers = dns.resolver.resolve(domain, 'MX')
-            mx_list = [str(mx) for mx in mx_answers]
-            result["dns_records"]["MX"] = mx_list
-            result["mx_records"] = mx_list
-        except Exception as e:
-            logger.debug(f"DNS MX record lookup failed for {domain}: {e}")
-            pass  # MX records are optional
+        async def run_limited(service, awaitable_factory):
+            # Stage timeout starts once a slot for the service is free, so queued
+            # stages in a large batch are not timed out while waiting their turn
+            async with semaphores[service]:
+                return await asyncio.wait_for(awaitable_factory(), _STAGE_TIMEOUT_SECONDS)
         
-        # Get NS records (nameservers)
-        try:
-            ns_answers = dns.resolver.resolve(domain, 'NS')
-            ns_list = [str(ns).rstrip('.') for ns in ns_answers]
-            result["dns_records"]["NS"] = ns_list
-            result["name_servers"] = ns_list
-        except Exception as e:
-            logger.debug(f"DNS NS record lookup failed for {domain}: {e}")
-            pass
+        def run_blocking(service, func, *args, **kwargs):
+            call = functools.partial(_run_with_service_slot, service, func, *args, **kwargs)
+            return asyncio.ensure_future(run_limited(service, lambda: loop.run_in_executor(pool, call)))
         
-        # Get AAAA records (IPv6)
-        try:
-            aaaa_answers = dns.resolver.resolve(domain, 'AAAA')
-            ipv6_list = [str(ip) for ip in aaaa_answers]
-            result["dns_records"]["AAAA"] = ipv6_list
-            result["ipv6_addresses"] = ipv6_list
-        except Exception as e:
-            logger.debug(f"DNS AAAA record lookup failed for {domain}: {e}")
-            pass
+        # Shortlink hosts say nothing about the target: just record where it redirects
+        if result["is_shortlink"]:
+            try:
+                result["redirect_chain"] = await run_blocking("http", _follow_redirects, original_url)
+            except Exception as e:
+                logger.debug(f"Shortlink redirect lookup failed for {original_url}: {e}")
+            return result
         
-        # Get CNAME records
-        try:
-            cname_answers = dns.resolver.resolve(domain, 'CNAME')
-            result["dns_records"]["CNAME"] = [str(cname).rstrip('.') for cname in cname_answers]
-        except Exception as e:
-            logger.debug(f"DNS CNAME record lookup failed for {domain}: {e}")
-            pass
+        # DNS lookup first (the A query also provides ip_address)
+        dns_records = _load_cached_dns_records(domain)
+        if dns_records is None:
+            try:
+                dns_records = dict(zip(
+                    _DNS_RECORD_TYPES,
+                    await run_limited("dns", lambda: _resolve_all(domain))
+                ))
+                _store_dns_records(domain, dns_records)
+            except Exception as e:
+                dns_records = dict.fromkeys(_DNS_RECORD_TYPES, e)
+        _apply_dns_records(result, domain, dns_records)
+        _detect_cdn(result)
         
-        # Detect CDN from nameservers or CNAME
-        cdn_indicators = {
-            "cloudflare": "Cloudflare",
-            "cloudfront": "AWS CloudFront",
-            "fastly": "Fastly",
-            "akamai": "Akamai",
-            "incapdns": "Incapsula",
-            "azure": "Azure CDN",
-            "google": "Google Cloud CDN"
-        }
+        # Names that don't exist can't yield WHOIS/CT/CMS/threat results worth the I/O
+        # (timeouts and SERVFAIL may be transient, so those still get the full enrichment)
+        if all(isinstance(dns_records.get(rt), dns.resolver.NXDOMAIN) for rt in ("A", "AAAA")):
+            result["errors"].append("Domain does not resolve - skipping further enrichment")
+            return result
         
-        ns_list = result.get("name_servers", [])
-        cname_list = result["dns_records"].get("CNAME", [])
-        for indicator, cdn_name in cdn_indicators.items():
-            if any(indicator.lower() in str(ns).lower() for ns in ns_list) or \
-               any(indicator.lower() in str(cname).lower() for cname in cname_list):
-                result["cdn"] = cdn_name
-                break
+        # Wave 1: lookups that only need the domain name
+        whois_future = run_blocking("whois", enrich_whois, domain)
+        ct_future = run_blocking("crt.sh", _get_certificate_transparency, domain)
+        security_future = run_blocking("http", _analyze_domain_security, domain)
+        threat_future = run_blocking("http", _check_threat_intel, domain=domain)
+        cms_future = run_blocking("http", _detect_cms_basic, domain)
         
         # WHOIS lookup (FREE - no API key needed)
         try:
-            whois_data = enrich_whois(domain)
-            result.update(whois_data)
-            
-            # Extract additional WHOIS fields from whois_data
-            if whois_data.get("whois_data"):
-                whois_info = whois_data["whois_data"]
-                
-                # Extract expiration date
-                if whois_info.get("expiration_date"):
-                    exp_date = whois_info["expiration_date"]
-                    if isinstance(exp_date, list) and exp_date:
-                        exp_date = exp_date[0]
-                    result["expiration_date"] = str(exp_date)
-                
-                # Extract updated date
-                if whois_info.get("updated_date"):
-                    upd_date = whois_info["updated_date"]
-                    if isinstance(upd_date, list) and upd_date:
-                        upd_date = upd_date[0]
-                    result["updated_date"] = str(upd_date)
-                
-                # Extract name servers (if not already from DNS)
-                if whois_info.get("name_servers"):
-                    ns_list = whois_info["name_servers"]
-                    if isinstance(ns_list, list):
-                        ns_list = [str(ns).rstrip('.') for ns in ns_list]
-                    else:
-                        ns_list = [str(ns_list).rstrip('.')]
-                    
-                    # Merge with DNS NS records (prefer DNS if available)
-                    if not result.get("name_servers"):
-                        result["name_servers"] = ns_list
-                    else:
-                        # Merge and dedupe
-                        all_ns = list(set(result["name_servers"] + ns_list))
-                        result["name_servers"] = all_ns
-                
-                # Extract WHOIS status
-                if whois_info.get("status"):
-                    status_list = whois_info["status"]
-                    if isinstance(status_list, list):
-                        result["whois_status"] = ", ".join(str(s) for s in status_list)
-                    else:
-                        result["whois_status"] = str(status_list)
+            whois_data = await whois_future
+            _apply_whois(result, whois_data)
         except Exception as e:
             logger.debug(f"WHOIS lookup failed for {domain}: {e}")
             result["errors"].append(f"WHOIS lookup failed: {str(e)}")
         
+        # Wave 2: lookups that need the IP address or registrar from wave 1
+        ip_address = result.get("ip_address")
+        ip_location_future = None
+        ip_threat_future = None
+        if ip_address:
+            ip_location_future = run_blocking("ip-api.com", enrich_ip_location, ip_address)
+            ip_threat_future = run_blocking("http", _check_threat_intel, ip=ip_address)
+        rdap_future = run_blocking("http", _lookup_rdap, domain, ip_address)
+        
         # IP location lookup (FREE APIs)
         # Note: If using CDN (Cloudflare, etc.), location will be CDN location, not actual server
-        if result.get("ip_address"):
+        if ip_location_future is not None:
             # Check if it's a CDN IP (Cloudflare, etc.)
-            isp_value = result.get("isp") or ""
-            is_cdn = result.get("cdn") or any(cdn in isp_value.lower() for cdn in ["cloudflare", "fastly", "cloudfront", "akamai"])
+            isp_lower = (result.get("isp") or "").lower()
+            is_cdn = result.get("cdn") or any(key in isp_lower for key in _CDN_ISP_KEYS)
             
-            if check_rate_limit("ip-api.com"):
-                try:
-                    ip_data = enrich_ip_location(result["ip_address"])
-                    record_api_request("ip-api.com")
-                    
-                    # If it's a CDN, note that location is CDN location, not actual server
-                    if is_cdn:
-                        ip_data["location_note"] = "Location shown is CDN/proxy location, not actual server location"
-                        # Don't show city/country for CDN IPs as it's misleading
-                        if "city" in ip_data:
-                            ip_data["city"] = None
-                        if "country" in ip_data:
-                            ip_data["country"] = None
-                    
-                    result.update(ip_data)
-                except Exception as e:
-                    logger.debug(f"IP location lookup failed for {result['ip_address']}: {e}")
-                    result["errors"].append(f"IP location lookup failed: {str(e)}")
+            try:
+                ip_data = await ip_location_future
+                
+                # If it's a CDN, note that location is CDN location, not actual server
+                if is_cdn:
+                    ip_data["location_note"] = "Location shown is CDN/proxy location, not actual server location"
+                    # Don't show city/country for CDN IPs as it's misleading
+                    if "city" in ip_data:
+                        ip_data["city"] = None
+                    if "country" in ip_data:
+                        ip_data["country"] = None
+                
+                result.update(ip_data)
+            except Exception as e:
+                logger.debug(f"IP location lookup failed for {ip_address}: {e}")
+                result["errors"].append(f"IP location lookup failed: {str(e)}")
         
         # Enhanced enrichment: Certificate Transparency, Reverse WHOIS, Email Discovery
         try:
-            from src.enrichment.enhanced_enrichment import (
-                get_certificate_transparency,
-                reverse_whois,
-                discover_emails
-            )
-            
-            # Certificate Transparency logs (free, no API key)
-            ct_data = get_certificate_transparency(domain)
+            ct_data = await ct_future
             if ct_data.get("related_domains"):
                 result["ct_related_domains"] = ct_data["related_domains"][:20]  # Limit to 20
                 result["ct_subdomains"] = ct_data.get("subdomains", [])[:20]
                 result["ct_certificates"] = len(ct_data.get("certificates", []))
             
-            # Reverse WHOIS (find domains with same registrant)
-            if result.get("registrar"):
-                reverse_whois_data = reverse_whois(domain, registrar=result.get("registrar"))
-                if reverse_whois_data.get("related_domains"):
-                    result["reverse_whois_domains"] = reverse_whois_data["related_domains"][:20]
-            
-            # Email discovery
-            email_data = discover_emails(domain)
-            if email_data.get("emails"):
-                result["discovered_emails"] = email_data["emails"]
+            # Reuses the CT result instead of querying crt.sh again
+            result.update(_discover_related(domain, result.get("registrar"), ct_data))
         except Exception as e:
             logger.debug(f"Enhanced enrichment failed: {e}")
             # Don't add to errors - these are optional enhancements
         
         # RDAP and Advanced Security Analysis (RDAP, SSL/TLS, Email Security, Typosquatting)
-        # These run independently - SSL/TLS, email security, and typosquatting don't require whoisit
-        # Note: check_rate_limit and record_api_request are already imported at module level
         try:
-            from src.enrichment.rdap_enrichment import (
-                enrich_with_rdap,
-                analyze_ssl_tls,
-                analyze_email_security,
-                detect_typosquatting
-            )
-            
-            # RDAP lookup (requires whoisit, optional)
-            try:
-                if check_rate_limit("rdap"):
-                    rdap_result = enrich_with_rdap(domain, result.get("ip_address"))
-                    if rdap_result.get("rdap_available"):
-                        result["rdap"] = rdap_result.get("rdap_data", {})
-                    record_api_request("rdap")
-            except Exception as e:
-                logger.debug(f"RDAP lookup failed: {e}")
-            
-            # SSL/TLS analysis (always runs, no external dependencies)
-            try:
-                if check_rate_limit("ssl_analysis"):
-                    ssl_result = analyze_ssl_tls(domain)
-                    if ssl_result.get("ssl_available"):
-                        result["ssl_info"] = {
-                            "available": True,
-                            "certificate": ssl_result.get("certificate", {}),
-                            "protocols": ssl_result.get("protocols", {}),
-                            "cipher_suites": ssl_result.get("cipher_suites", []),
-                            "security_grade": ssl_result.get("grade", "F"),
-                            "security_issues": ssl_result.get("security_issues", [])
-                        }
-                    record_api_request("ssl_analysis")
-            except Exception as e:
-                logger.debug(f"SSL/TLS analysis failed: {e}")
-            
-            # Email security (SPF/DMARC/DKIM) - always runs
-            try:
-                # Check rate limit, but if it fails, still try (DNS lookups are cheap)
-                if check_rate_limit("email_security"):
-                    email_result = analyze_email_security(domain)
-                    # Always add email security data (function always returns a dict)
-                    result["email_security"] = {
-                        "spf": email_result.get("spf", {}),
-                        "dmarc": email_result.get("dmarc", {}),
-                        "dkim": email_result.get("dkim", {}),
-                        "security_score": email_result.get("security_score", 0)
-                    }
-                    record_api_request("email_security")
-                else:
-                    # Rate limited, but still try (DNS is cheap)
-                    logger.debug("Email security rate limited, but attempting anyway (DNS is cheap)")
-                    email_result = analyze_email_security(domain)
-                    result["email_security"] = {
-                        "spf": email_result.get("spf", {}),
-                        "dmarc": email_result.get("dmarc", {}),
-                        "dkim": email_result.get("dkim", {}),
-                        "security_score": email_result.get("security_score", 0)
-                    }
-            except Exception as e:
-                logger.debug(f"Email security analysis failed: {e}")
-                # Add empty structure so UI knows we tried
-                result["email_security"] = {
-                    "spf": {"present": False, "issues": ["Analysis failed"]},
-                    "dmarc": {"present": False, "issues": ["Analysis failed"]},
-                    "dkim": {"present": False, "issues": ["Analysis failed"]},
-                    "security_score": 0
-                }
-            
-            # Typosquatting detection - always runs (no rate limit needed)
-            try:
-                typosquatting_result = detect_typosquatting(domain)
-                # Always add typosquatting data (function always returns a dict)
-                result["typosquatting"] = {
-                    "risk_level": typosquatting_result.get("risk_level", "low"),
-                    "similarity_score": typosquatting_result.get("similarity_score", 0.0),
-                    "patterns_detected": typosquatting_result.get("patterns_detected", []),
-                    "recommendations": typosquatting_result.get("recommendations", [])
-                }
-            except Exception as e:
-                logger.debug(f"Typosquatting detection failed: {e}")
-                
+            rdap_data = await rdap_future
+            if rdap_data is not None:
+                result["rdap"] = rdap_data
         except Exception as e:
-            logger.debug(f"RDAP enrichment module import failed: {e}")
+            logger.debug(f"RDAP lookup failed for {domain}: {e}")
             # Don't add to errors - RDAP enrichment is optional
         
+        try:
+            result.update(await security_future)
+        except Exception as e:
+            logger.debug(f"Security analysis failed for {domain}: {e}")
+            # Don't add to errors - security analysis is optional
+        
         # Threat Intelligence (VirusTotal, abuse.ch, blocklists)
         try:
-            from src.enrichment.threat_intel import check_threat_intel
-            
-            threat_data = check_threat_intel(domain=domain)
+            threat_data = await threat_future
             # Always include threat intel data, not just when malicious
             result["threat_intel"] = threat_data.get("details", {})
             result["threat_level"] = threat_data.get("threat_level", "clean")
@@ -361,8 +441,8 @@ def enrich_domain(domain: str) -> Dict:
                 result["threat_warning"] = "Low threat detected - possible false positive"
             
             # Also check IP if available
-            if result.get("ip_address"):
-                ip_threat = check_threat_intel(ip=result["ip_address"])
+            if ip_threat_future is not None:
+                ip_threat = await ip_threat_future
                 if ip_threat.get("is_malicious"):
                     result["is_malicious"] = True
                     if not result.get("threat_sources"):
@@ -375,7 +455,7 @@ def enrich_domain(domain: str) -> Dict:
         # Basic CMS detection (header-based, similar to AIPornTracker)
         try:
             if not result.get("cms"):
-                cms = _detect_cms_basic(domain)
+                cms = await cms_future
                 if cms:
                     result["cms"] = cms
         except Exception as e:
@@ -390,52 +470,274 @@ def enrich_domain(domain: str) -> Dict:
     return result
 
 
-def _detect_cms_basic(domain: str) -> Optional[str]:
-    """Basic CMS detection using HTTP headers and content patterns (FREE, no API key needed)."""
+def _follow_redirects(url: str) -> List[str]:
+    """Follow a URL's redirects with a HEAD request and return every URL visited."""
+    if not url.startswith(("http://", "https://")):
+        url = f"https://{url}"
+    response = SESSION.head(url, allow_redirects=True, timeout=(3, 7))
+    return [hop.url for hop in response.history] + [response.url]
+
+
+def _apply_dns_records(result: Dict, domain: str, dns_records: Dict[str, Any]) -> None:
+    """Merge A/MX/NS/AAAA/CNAME answers into the result."""
+    # Get A records
     try:
-        url = f"http://{domain}" if not domain.startswith("http") else domain
-        response = requests.get(url, timeout=10, allow_redirects=True, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        answers = _dns_answer(dns_records, "A")
+        result["ip_addresses"] = [str(answer) for answer in answers]
+        result["ip_address"] = result["ip_addresses"][0] if result["ip_addresses"] else None
+    except Exception as e:
+        logger.debug(f"DNS A record lookup failed for {domain}: {e}")
+        result["errors"].append(f"A record lookup failed: {str(e)}")
+    
+    # Get MX records
+    try:
+        mx_answers = _dns_answer(dns_records, "MX")
+        mx_list = [str(mx) for mx in mx_answers]
+        result["dns_records"]["MX"] = mx_list
+        result["mx_records"] = mx_list
+    except Exception as e:
+        logger.debug(f"DNS MX record lookup failed for {domain}: {e}")
+        pass  # MX records are optional
+    
+    # Get NS records (nameservers)
+    try:
+        ns_answers = _dns_answer(dns_records, "NS")
+        ns_list = [str(ns).rstrip('.') for ns in ns_answers]
+        result["dns_records"]["NS"] = ns_list
+        result["name_servers"] = ns_list
+    except Exception as e:
+        logger.debug(f"DNS NS record lookup failed for {domain}: {e}")
+        pass
+    
+    # Get AAAA records (IPv6)
+    try:
+        aaaa_answers = _dns_answer(dns_records, "AAAA")
+        ipv6_list = [str(ip) for ip in aaaa_answers]
+        result["dns_records"]["AAAA"] = ipv6_list
+        result["ipv6_addresses"] = ipv6_list
+    except Exception as e:
+        logger.debug(f"DNS AAAA record lookup failed for {domain}: {e}")
+        pass
+    
+    # Get CNAME records
+    try:
+        cname_answers = _dns_answer(dns_records, "CNAME")
+        result["dns_records"]["CNAME"] = [str(cname).rstrip('.') for cname in cname_answers]
+    except Exception as e:
+        logger.debug(f"DNS CNAME record lookup failed for {domain}: {e}")
+        pass
+
+
+def _detect_cdn(result: Dict) -> None:
+    """Detect CDN from nameservers or CNAME."""
+    ns_list = result.get("name_servers", [])
+    cname_list = result["dns_records"].get("CNAME", [])
+    blob = "\n".join(map(str, ns_list + cname_list))
+    if not blob:
+        return
+    
+    found = {match.lower() for match in _CDN_RE.findall(blob)}
+    # Keep indicator priority (e.g. Cloudflare NS wins over a Google CNAME)
+    for indicator, cdn_name in _CDN_MAP.items():
+        if indicator in found:
+            result["cdn"] = cdn_name
+            break
+
+
+def _apply_whois(result: Dict, whois_data: Dict) -> None:
+    """Merge WHOIS data into the result, extracting the additional WHOIS fields."""
+    result.update(whois_data)
+    
+    # Extract additional WHOIS fields from whois_data
+    if whois_data.get("whois_data"):
+        whois_info = whois_data["whois_data"]
         
-        headers = response.headers
-        content = response.text.lower()
+        # Extract expiration date
+        if whois_info.get("expiration_date"):
+            exp_date = whois_info["expiration_date"]
+            if isinstance(exp_date, list) and exp_date:
+                exp_date = exp_date[0]
+            result["expiration_date"] = str(exp_date)
         
-        # Basic CMS detection patterns
-        cms_patterns = {
-            "WordPress": ["wp-content", "wp-includes", "wp-json", "/wp-admin/", "wordpress"],
-            "Joomla": ["joomla", "/administrator/", "com_content", "option=com_"],
-            "Drupal": ["drupal", "sites/all/", "/sites/default/", "drupal.js"],
-            "Shopify": ["shopify", "cdn.shopify.com", "myshopify.com", "shopify-analytics"],
-            "Squarespace": ["squarespace", "sqs-cdn", "squarespace.com"],
-            "Magento": ["magento", "/media/", "/skin/", "mage/"],
-            "WooCommerce": ["woocommerce", "wc-", "woocommerce-"],
-            "Drupal": ["drupal", "sites/all/", "/sites/default/"],
-            "Ghost": ["ghost", "ghost.org"],
-            "Wix": ["wix.com", "wixstatic.com", "wixpress.com"]
-        }
+        # Extract updated date
+        if whois_info.get("updated_date"):
+            upd_date = whois_info["updated_date"]
+            if isinstance(upd_date, list) and upd_date:
+                upd_date = upd_date[0]
+            result["updated_date"] = str(upd_date)
         
-        # Check content for CMS patterns
-        for cms_name, patterns in cms_patterns.items():
-            for pattern in patterns:
-                if pattern in content or pattern in str(headers).lower():
-                    return cms_name
+        # Extract name servers (if not already from DNS)
+        if whois_info.get("name_servers"):
+            ns_list = whois_info["name_servers"]
+            if isinstance(ns_list, list):
+                ns_list = [str(ns).rstrip('.') for ns in ns_list]
+            else:
+                ns_list = [str(ns_list).rstrip('.')]
+            
+            # Merge with DNS NS records (prefer DNS if available)
+            if not result.get("name_servers"):
+                result["name_servers"] = ns_list
+            elif ns_list:
+                # Merge and dedupe
+                result["name_servers"] = list({*result["name_servers"], *ns_list})
         
-        # Check X-Powered-By header
-        powered_by = headers.get("X-Powered-By", "").lower()
-        if powered_by:
-            for cms_name in cms_patterns.keys():
-                if cms_name.lower() in powered_by:
-                    return cms_name
+        # Extract WHOIS status
+        if whois_info.get("status"):
+            status_list = whois_info["status"]
+            if isinstance(status_list, list):
+                result["whois_status"] = ", ".join(map(str, status_list))
+            else:
+                result["whois_status"] = str(status_list)
+
+
+def _get_certificate_transparency(domain: str) -> Dict:
+    """Certificate Transparency logs (free, no API key)."""
+    from src.enrichment.enhanced_enrichment import get_certificate_transparency
+    return get_certificate_transparency(domain)
+
+
+def _discover_related(domain: str, registrar: Optional[str], ct_data: Optional[Dict] = None) -> Dict:
+    """Reverse WHOIS (find domains with same registrant) and email discovery."""
+    from src.enrichment.enhanced_enrichment import reverse_whois, discover_emails
+    
+    related = {}
+    
+    # Reverse WHOIS (find domains with same registrant)
+    if registrar:
+        reverse_whois_data = reverse_whois(domain, registrar=registrar, ct_data=ct_data)
+        if reverse_whois_data.get("related_domains"):
+            related["reverse_whois_domains"] = reverse_whois_data["related_domains"][:20]
+    
+    # Email discovery
+    email_data = discover_emails(domain, ct_data=ct_data)
+    if email_data.get("emails"):
+        related["discovered_emails"] = email_data["emails"]
+    
+    return related
+
+
+def _lookup_rdap(domain: str, ip_address: Optional[str]) -> Optional[Dict]:
+    """RDAP lookup (requires whoisit, optional). Returns RDAP data or None."""
+    from src.enrichment.rdap_enrichment import enrich_with_rdap
+    
+    try:
+        rdap_result = enrich_with_rdap(domain, ip_address)
+        if rdap_result.get("rdap_available"):
+            return rdap_result.get("rdap_data", {})
+    except Exception as e:
+        logger.debug(f"RDAP lookup failed: {e}")
+    
+    return None
+
+
+def _analyze_domain_security(domain: str) -> Dict:
+    """
+    SSL/TLS, email security (SPF/DMARC/DKIM), and typosquatting analysis.
+    These run independently - they don't require whoisit.
+    """
+    from src.enrichment.rdap_enrichment import (
+        analyze_ssl_tls,
+        analyze_email_security,
+        detect_typosquatting
+    )
+    
+    security = {}
+    
+    # SSL/TLS analysis (always runs, no external dependencies)
+    try:
+        if check_rate_limit("ssl_analysis"):
+            ssl_result = analyze_ssl_tls(domain)
+            if ssl_result.get("ssl_available"):
+                security["ssl_info"] = {
+                    "available": True,
+                    "certificate": ssl_result.get("certificate", {}),
+                    "protocols": ssl_result.get("protocols", {}),
+                    "cipher_suites": ssl_result.get("cipher_suites", []),
+                    "security_grade": ssl_result.get("grade", "F"),
+                    "security_issues": ssl_result.get("security_issues", [])
+                }
+            record_api_request("ssl_analysis")
+    except Exception as e:
+        logger.debug(f"SSL/TLS analysis failed: {e}")
+    
+    # Email security (SPF/DMARC/DKIM) - always runs
+    try:
+        # Check rate limit, but if it fails, still try (DNS lookups are cheap)
+        if check_rate_limit("email_security"):
+            email_result = analyze_email_security(domain)
+            record_api_request("email_security")
+        else:
+            # Rate limited, but still try (DNS is cheap)
+            logger.debug("Email security rate limited, but attempting anyway (DNS is cheap)")
+            email_result = analyze_email_security(domain)
+        # Always add email security data (function always returns a dict)
+        security["email_security"] = {
+            "spf": email_result.get("spf", {}),
+            "dmarc": email_result.get("dmarc", {}),
+            "dkim": email_result.get("dkim", {}),
+            "security_score": email_result.get("security_score", 0)
+        }
+    except Exception as e:
+        logger.debug(f"Email security analysis failed: {e}")
+        # Add empty structure so UI knows we tried
+        security["email_security"] = {
+            "spf": {"present": False, "issues": ["Analysis failed"]},
+            "dmarc": {"present": False, "issues": ["Analysis failed"]},
+            "dkim": {"present": False, "issues": ["Analysis failed"]},
+            "security_score": 0
+        }
+    
+    # Typosquatting detection - always runs (no rate limit needed)
+    try:
+        typosquatting_result = detect_typosquatting(domain)
+        # Always add typosquatting data (function always returns a dict)
+        security["typosquatting"] = {
+            "risk_level": typosquatting_result.get("risk_level", "low"),
+            "similarity_score": typosquatting_result.get("similarity_score", 0.0),
+            "patterns_detected": typosquatting_result.get("patterns_detected", []),
+            "recommendations": typosquatting_result.get("recommendations", [])
+        }
+    except Exception as e:
+        logger.debug(f"Typosquatting detection failed: {e}")
+    
+    return security
+
+
+def _check_threat_intel(domain: Optional[str] = None, ip: Optional[str] = None) -> Dict:
+    """Threat Intelligence (VirusTotal, abuse.ch, blocklists)."""
+    from src.enrichment.threat_intel import check_threat_intel
+    return check_threat_intel(domain=domain, ip=ip)
+
+
+def _detect_cms_basic(domain: str) -> Optional[str]:
+    """Basic CMS detection using HTTP headers and content patterns (FREE, no API key needed)."""
+    cache_key = domain.lower()
+    cached = _CMS_CACHE.get(cache_key, _MISSING)
+    if cached is not _MISSING:
+        return cached
+    
+    # Stored wrapped so "no CMS detected" (None) is distinguishable from a miss
+    cached = get_disk_cached("cms", cache_key)
+    if cached is not None:
+        _CMS_CACHE.set(cache_key, cached.get("cms"))
+        return cached.get("cms")
+    
+    try:
+        url = f"http://{domain}" if not domain.startswith("http") else domain
+        # Only the start of the page is needed; cap bytes read (Range is a hint for
+        # servers that honour it) so huge homepages don't dominate latency/memory
+        with SESSION.get(url, stream=True, timeout=(3, 7), allow_redirects=True,
+                         headers={"Range": f"bytes=0-{_CMS_MAX_BYTES - 1}"}) as response:
+            raw = response.raw.read(_CMS_MAX_BYTES, decode_content=True)
+            headers = response.headers
         
-        # Check meta generator tag
-        import re
-        meta_tags = re.findall(r'<meta[^>]+name=["\']generator["\'][^>]+content=["\']([^"\']+)["\']', content)
-        for meta_content in meta_tags:
-            meta_lower = meta_content.lower()
-            for cms_name in cms_patterns.keys():
-                if cms_name.lower() in meta_lower:
-                    return cms_name
+        # CMS patterns are ASCII: lowercase the bytes and map them 1:1 to str via
+        # latin-1 instead of charset detection + UTF-8 decode + str.lower()
+        cms = _match_cms(headers, raw.lower().decode("latin-1"))
+        # Only cache once the page was fetched, so network failures are retried
+        _CMS_CACHE.set(cache_key, cms)
+        set_disk_cached("cms", cache_key, {"cms": cms}, ttl_hours=_CMS_DISK_TTL_HOURS)
+        return cms
     
     except Exception as e:
         logger.debug(f"Basic CMS detection failed for {domain}: {e}")
@@ -443,58 +745,204 @@ def _detect_cms_basic(domain: str) -> Optional[str]:
     return None
 
 
+def _build_cms_automaton():
+    """Build one Aho-Corasick automaton mapping each CMS pattern to its priority rank."""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for rank, patterns in enumerate(_CMS_PATTERNS.values()):
+        for pattern in patterns:
+            existing = automaton.get(pattern, None)
+            if existing is None or rank < existing:
+                automaton.add_word(pattern, rank)
+    automaton.make_automaton()
+    return automaton
+
+
+_CMS_AC = _build_cms_automaton()
+
+
+def _scan_cms_patterns(text: str) -> Optional[int]:
+    """Return the best (lowest) CMS priority rank whose patterns occur in text."""
+    if _CMS_AC is not None:
+        best = None
+        for _, rank in _CMS_AC.iter(text):
+            if best is None or rank < best:
+                best = rank
+                if rank == 0:
+                    break
+        return best
+    
+    # Fallback: plain substring checks, in priority order
+    for rank, patterns in enumerate(_CMS_PATTERNS.values()):
+        if any(pattern in text for pattern in patterns):
+            return rank
+    return None
+
+
+def _match_cms(headers, content: str) -> Optional[str]:
+    """Match CMS patterns against response headers and lowercased page content."""
+    # Check content and headers for CMS patterns (first CMS in priority order wins)
+    ranks = [
+        rank for rank in (_scan_cms_patterns(content), _scan_cms_patterns(str(headers).lower()))
+        if rank is not None
+    ]
+    if ranks:
+        return _CMS_NAMES[min(ranks)]
+    
+    # Check X-Powered-By header
+    powered_by = headers.get("X-Powered-By", "").lower()
+    if powered_by:
+        cms = _lookup_cms_name(powered_by)
+        if cms:
+            return cms
+    
+    # Check meta generator tag
+    meta_tags = _META_GENERATOR_RE.findall(content)
+    for meta_content in meta_tags:
+        cms = _lookup_cms_name(meta_content.lower())
+        if cms:
+            return cms
+    
+    return None
+
+
+def _lookup_cms_name(text: str) -> Optional[str]:
+    """Return the CMS named by a word in lowercased text (e.g. "wordpress/6.4" -> "WordPress")."""
+    for token in _WORD_RE.findall(text):
+        cms = _CMS_NAMES_LC.get(token)
+        if cms:
+            return cms
+    return None
+
+
 def enrich_whois(domain: str) -> Dict:
-    """Enrich domain with WHOIS data (FREE - python-whois library)."""
-    result = {
-        "registrar": None,
-        "creation_date": None,
-        "whois_data": {}
-    }
+    """
+    Enrich domain with registration data.
+    
+    Tries RDAP first (the domain object from enrich_with_rdap, cached and
+    shared with the RDAP stage of enrich_domain) and falls back to port-43 WHOIS (python-whois) when RDAP is
+    unavailable or fails. Both return the same result shape.
+    """
+    cache_key = domain.lower()
+    cached = _WHOIS_CACHE.get(cache_key)
+    if cached is not None:
+        return dict(cached)
+    
+    cached = get_disk_cached("whois", cache_key)
+    if cached is not None:
+        _WHOIS_CACHE.set(cache_key, dict(cached))
+        return cached
+    
+    result = _whois_via_rdap(domain) or _whois_via_python_whois(domain)
+    if result is None:
+        return {
+            "registrar": None,
+            "creation_date": None,
+            "whois_data": {}
+        }
+    
+    _WHOIS_CACHE.set(cache_key, dict(result))
+    set_disk_cached("whois", cache_key, result, ttl_hours=_WHOIS_DISK_TTL_HOURS)
+    return result
+
+
+def _whois_via_rdap(domain: str) -> Optional[Dict]:
+    """
+    Registration data from the RDAP domain object (FREE - whoisit library). Returns None on failure.
+    
+    Uses enrich_with_rdap, so the object is cached and shared with the RDAP
+    stage of enrich_domain instead of being queried twice.
+    """
+    if not WHOISIT_AVAILABLE:
+        return None
+    
+    from src.enrichment.rdap_enrichment import enrich_with_rdap
+    
+    try:
+        rdap = enrich_with_rdap(domain)["rdap_data"].get("domain")
+    except Exception as e:
+        logger.debug(f"RDAP registration lookup failed for {domain}, falling back to WHOIS: {e}")
+        return None
+    if not rdap:
+        logger.debug(f"No RDAP registration data for {domain}, falling back to WHOIS")
+        return None
     
+    return {
+        "registrar": _vcard_name(rdap.get("registrar")),
+        "creation_date": _normalize_creation_date(rdap.get("registration_date"), domain),
+        "whois_data": {
+            "expiration_date": rdap.get("expiration_date"),
+            "updated_date": rdap.get("last_changed"),
+            "name_servers": [
+                ns["ldhName"].lower() for ns in rdap.get("nameservers") or [] if ns.get("ldhName")
+            ],
+            "status": rdap.get("status") or None,
+        }
+    }
+
+
+def _vcard_name(vcard_array) -> Optional[str]:
+    """Formatted name ("fn" property) from an RDAP jCard, e.g. ["vcard", [["fn", {}, "text", "Name"], ...]]."""
+    if not isinstance(vcard_array, list) or len(vcard_array) < 2:
+        return None
+    for prop in vcard_array[1]:
+        if len(prop) >= 4 and prop[0] == "fn":
+            return prop[3] or None
+    return None
+
+
+def _whois_via_python_whois(domain: str) -> Optional[Dict]:
+    """Registration data from port-43 WHOIS (FREE - python-whois library). Returns None on failure."""
     try:
         w = whois.whois(domain)
         
         if w:
-            result["registrar"] = w.registrar if hasattr(w, 'registrar') and w.registrar else None
-            
             # Handle creation date (can be a list or single date)
-            # Note: Some registrars return their own creation date, not the domain's
-            if hasattr(w, 'creation_date'):
-                creation_date = w.creation_date
-                if isinstance(creation_date, list) and creation_date:
-                    creation_date = creation_date[0]
-                if creation_date:
-                    from datetime import datetime
-                    if isinstance(creation_date, datetime):
-                        # Check if date seems suspicious (very old dates might be registrar's, not domain's)
-                        # If date is before 2005, it's likely wrong (registrar's creation date, not domain's)
-                        if creation_date.year >= 2005:
-                            result["creation_date"] = creation_date.strftime('%Y-%m-%d')
-                        else:
-                            logger.debug(f"Suspicious creation date {creation_date} for {domain} - likely registrar's date, not domain's")
-                            result["creation_date"] = None
-                    else:
-                        # Try to parse string date
-                        try:
-                            parsed_date = datetime.strptime(str(creation_date)[:10], '%Y-%m-%d')
-                            if parsed_date.year >= 2005:
-                                result["creation_date"] = str(creation_date)[:10]
-                            else:
-                                result["creation_date"] = None
-                        except:
-                            result["creation_date"] = None
+            creation_date = w.creation_date if hasattr(w, 'creation_date') else None
+            if isinstance(creation_date, list) and creation_date:
+                creation_date = creation_date[0]
             
             # Store raw WHOIS data for extraction
-            result["whois_data"] = {
-                "expiration_date": w.expiration_date if hasattr(w, 'expiration_date') and w.expiration_date else None,
-                "updated_date": w.updated_date if hasattr(w, 'updated_date') and w.updated_date else None,
-                "name_servers": list(w.name_servers) if hasattr(w, 'name_servers') and w.name_servers else [],
-                "status": w.status if hasattr(w, 'status') and w.status else None,
+            return {
+                "registrar": w.registrar if hasattr(w, 'registrar') and w.registrar else None,
+                "creation_date": _normalize_creation_date(creation_date, domain),
+                "whois_data": {
+                    "expiration_date": w.expiration_date if hasattr(w, 'expiration_date') and w.expiration_date else None,
+                    "updated_date": w.updated_date if hasattr(w, 'updated_date') and w.updated_date else None,
+                    "name_servers": list(w.name_servers) if hasattr(w, 'name_servers') and w.name_servers else [],
+                    "status": w.status if hasattr(w, 'status') and w.status else None,
+                }
             }
     except Exception as e:
         logger.debug(f"WHOIS lookup failed for {domain}: {e}")
     
-    return result
+    return None
+
+
+def _normalize_creation_date(creation_date, domain: str) -> Optional[str]:
+    """Format a creation date as YYYY-MM-DD, discarding implausible (pre-2005) dates."""
+    # Note: Some registrars return their own creation date, not the domain's
+    if not creation_date:
+        return None
+    
+    if isinstance(creation_date, datetime):
+        # Check if date seems suspicious (very old dates might be registrar's, not domain's)
+        # If date is before 2005, it's likely wrong (registrar's creation date, not domain's)
+        if creation_date.year >= 2005:
+            return creation_date.strftime('%Y-%m-%d')
+        logger.debug(f"Suspicious creation date {creation_date} for {domain} - likely registrar's date, not domain's")
+        return None
+    
+    # Try to parse string date
+    try:
+        parsed_date = datetime.strptime(str(creation_date)[:10], '%Y-%m-%d')
+        if parsed_date.year >= 2005:
+            return str(creation_date)[:10]
+    except ValueError:
+        pass
+    return None
 
 
 @retry_with_backoff(max_retries=2, base_delay=1.0)
@@ -511,28 +959,34 @@ def enrich_ip_location(ip_address: str) -> Dict:
     if not ip_address:
         return result
     
+    cached = _IP_LOCATION_CACHE.get(ip_address)
+    if cached is not None:
+        return dict(cached)
+    
+    cached = get_disk_cached("ip_location", ip_address)
+    if cached is not None:
+        _IP_LOCATION_CACHE.set(ip_address, dict(cached))
+        return cached
+    
+    # Only lookups that reach the network count against the ip-api.com limit
+    if not check_rate_limit("ip-api.com"):
+        logger.debug(f"ip-api.com rate limit reached, skipping location lookup for {ip_address}")
+        return result
+    record_api_request("ip-api.com")
+    
     try:
         # Method 1: ip-api.com (FREE - 45 requests/minute, no key required)
-        url = f"http://ip-api.com/json/{ip_address}?fields=status,message,country,city,isp,org,as,asname,query"
-        response = requests.get(url, timeout=Config.API_TIMEOUT_SECONDS)
+        url = f"http://ip-api.com/json/{ip_address}?fields={_IP_API_FIELDS}"
+        response = SESSION.get(url, timeout=Config.API_TIMEOUT_SECONDS)
         
         if response.status_code == 200:
-            data = response.json()
-            if data.get("status") == "success":
-                result["country"] = data.get("country")
-                result["city"] = data.get("city")
-                result["isp"] = data.get("isp") or data.get("org")
-                
-                as_str = data.get("as", "")
-                if as_str:
-                    result["asn"] = as_str.replace("AS", "").strip()
-                    result["host_name"] = data.get("asname") or data.get("org", "").split()[0]
+            _apply_ip_api_data(result, response.json())
         
         # Method 2: IPLocate.io (FREE - no key required for basic)
         if not result.get("isp"):
             try:
                 url = f"https://www.iplocate.io/api/lookup/{ip_address}"
-                response = requests.get(url, timeout=10)
+                response = SESSION.get(url, timeout=10)
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -542,8 +996,86 @@ def enrich_ip_location(ip_address: str) -> Dict:
             except:
                 pass  # Fallback failed, continue
     
+        if any(result.values()):
+            _IP_LOCATION_CACHE.set(ip_address, dict(result))
+            set_disk_cached("ip_location", ip_address, result, ttl_hours=_IP_LOCATION_DISK_TTL_HOURS)
+    
     except Exception as e:
         print(f"IP location lookup failed for {ip_address}: {e}")
     
     return result
 
+
+def enrich_ip_locations(ip_addresses: List[str]) -> Dict[str, Dict]:
+    """
+    Enrich many IP addresses at once using the ip-api.com batch endpoint.
+    
+    Sends up to 100 IPs per POST instead of one request per IP, and stores
+    each result in the IP location cache. Batch drivers can call this with
+    all IPs up front so later enrich_ip_location/enrich_domain calls for
+    those IPs are served from the cache.
+    
+    Args:
+        ip_addresses: IP addresses to look up (duplicates and empties ignored)
+    
+    Returns:
+        Dict mapping IP address to its location data (same shape as enrich_ip_location)
+    """
+    results = {}
+    pending = []
+    
+    for ip_address in dict.fromkeys(ip for ip in ip_addresses if ip):
+        cached = _IP_LOCATION_CACHE.get(ip_address)
+        if cached is not None:
+            results[ip_address] = dict(cached)
+        else:
+            pending.append(ip_address)
+    
+    for start in range(0, len(pending), _IP_API_BATCH_SIZE):
+        batch = pending[start:start + _IP_API_BATCH_SIZE]
+        if not check_rate_limit("ip-api.com/batch"):
+            logger.debug(f"ip-api.com batch rate limit reached, {len(pending) - start} IPs not looked up")
+            break
+        
+        try:
+            response = SESSION.post(
+                "http://ip-api.com/batch",
+                json=[{"query": ip, "fields": _IP_API_FIELDS} for ip in batch],
+                timeout=Config.API_TIMEOUT_SECONDS
+            )
+            record_api_request("ip-api.com/batch")
+            
+            if response.status_code != 200:
+                logger.debug(f"ip-api.com batch lookup returned HTTP {response.status_code}")
+                continue
+            
+            for data in response.json():
+                ip_address = data.get("query")
+                if not ip_address:
+                    continue
+                
+                result = dict.fromkeys(("host_name", "asn", "isp", "country", "city"))
+                _apply_ip_api_data(result, data)
+                results[ip_address] = result
+                if any(result.values()):
+                    _IP_LOCATION_CACHE.set(ip_address, dict(result))
+                    set_disk_cached("ip_location", ip_address, result, ttl_hours=_IP_LOCATION_DISK_TTL_HOURS)
+        except Exception as e:
+            logger.debug(f"ip-api.com batch lookup failed: {e}")
+    
+    return results
+
+
+def _apply_ip_api_data(result: Dict, data: Dict) -> None:
+    """Merge a successful ip-api.com response into an IP location result."""
+    if data.get("status") != "success":
+        return
+    
+    result["country"] = data.get("country")
+    result["city"] = data.get("city")
+    result["isp"] = data.get("isp") or data.get("org")
+    
+    as_str = data.get("as", "")
+    if as_str:
+        result["asn"] = as_str.replace("AS", "").strip()
+        result["host_name"] = data.get("asname") or data.get("org", "").split()[0]
@@ -1,19 +1,38 @@
 """Enhanced enrichment features: reverse WHOIS, certificate transparency, social media, email discovery."""
 
-import requests
 from typing import Dict, List, Optional
 import re
 from src.utils.logger import logger
 from src.utils.retry import retry_with_backoff
 from src.utils.rate_limiter import check_rate_limit, record_api_request
 from src.utils.cache import get_cached, set_cached
+from src.utils.http_session import create_session
+
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+    ijson = None
 
 
 # Rate limiting handled via check_rate_limit/record_api_request
 
+# Bounds on how much of a crt.sh response is parsed (popular domains return huge arrays)
+_CT_MAX_CERTIFICATES = 5000
+_CT_MAX_DOMAINS = 1000
+
+# crt.sh name_value holds several names separated by commas or newlines
+_NAME_SPLIT_RE = re.compile(r'[,\n]')
+
+# Shared keep-alive session for crt.sh and other lookups
+SESSION = create_session(pool_connections=32, pool_maxsize=64)
+
 
 def reverse_whois(domain: str, registrar: Optional[str] = None, 
-                  registrant_email: Optional[str] = None) -> Dict:
+                  registrant_email: Optional[str] = None,
+                  ct_data: Optional[Dict] = None) -> Dict:
     """
     Find other domains registered by the same entity (reverse WHOIS).
     
@@ -21,6 +40,8 @@ def reverse_whois(domain: str, registrar: Optional[str] = None,
         domain: Domain to search
         registrar: Registrar name (if known)
         registrant_email: Registrant email (if known)
+        ct_data: Result of get_certificate_transparency(domain), if the caller
+            already has it (avoids a second CT lookup)
     
     Returns:
         Dict with related domains
@@ -43,7 +64,7 @@ def reverse_whois(domain: str, registrar: Optional[str] = None,
     
     # Method 2: Certificate Transparency logs (free, no API key)
     # Domains with same registrant often share certificates
-    ct_results = get_certificate_transparency(domain)
+    ct_results = ct_data if ct_data is not None else get_certificate_transparency(domain)
     if ct_results.get("related_domains"):
         results["related_domains"].extend(ct_results["related_domains"])
         results["source"] = "certificate_transparency"
@@ -58,7 +79,7 @@ def reverse_whois(domain: str, registrar: Optional[str] = None,
     results["related_domains"] = [d for d in results["related_domains"] if d != domain]
     
     # Cache for 7 days
-    set_cache(cache_key, results, ttl=604800)
+    set_cached("reverse_whois", domain, results, ttl_hours=168)
     
     return results
 
@@ -90,42 +111,72 @@ def get_certificate_transparency(domain: str) -> Dict:
                 "output": "json"
             }
             
-            response = requests.get(url, params=params, timeout=15)
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Extract unique domain names from certificates
-                all_domains = set()
-                for cert in data:
-                    name_value = cert.get("name_value", "")
-                    # Parse domain names (can be comma-separated or newline-separated)
-                    domains = re.split(r'[,\n]', name_value)
-                    for d in domains:
-                        d = d.strip().lower()
-                        # Remove wildcards
-                        d = d.replace("*.", "")
-                        if d and domain in d:
-                            all_domains.add(d)
+            with SESSION.get(url, params=params, stream=True, timeout=15) as response:
+                if response.status_code == 200:
+                    all_domains, certificates = _parse_ct_certificates(response, domain)
                     
-                    # Also check common_name
-                    cn = cert.get("common_name", "").lower()
-                    if cn and domain in cn:
-                        all_domains.add(cn.replace("*.", ""))
-                
-                results["related_domains"] = list(all_domains)
-                results["certificates"] = data[:20]  # Limit to 20 certs
-                results["subdomains"] = [d for d in all_domains if d.startswith(domain)]
-                
-                record_api_request("crt.sh")
+                    results["related_domains"] = list(all_domains)
+                    results["certificates"] = certificates
+                    results["subdomains"] = [d for d in all_domains if d.startswith(domain)]
+                    
+                    record_api_request("crt.sh")
     except Exception as e:
         logger.debug(f"Certificate Transparency lookup failed: {e}")
     
-    # Cache for 24 hours
+    # Cache for 24 hours (only the trimmed result, not the raw response)
     set_cached("ct_logs", domain, results, ttl_hours=24)
     
     return results
 
 
+def _iter_ct_certificates(response):
+    """Yield crt.sh certificate entries, streaming the JSON array when ijson is installed."""
+    if IJSON_AVAILABLE:
+        # Let urllib3 undo gzip/deflate before ijson reads the raw stream
+        response.raw.decode_content = True
+        yield from ijson.items(response.raw, "item", use_float=True)
+    else:
+        yield from response.json()
+
+
+def _parse_ct_certificates(response, domain: str):
+    """
+    Collect related domain names and the first certificates from a crt.sh response.
+    
+    Stops early once enough certificates and domains have been seen, so huge
+    responses for popular domains cost bounded memory and time.
+    
+    Returns:
+        Tuple of (set of related domains, list of up to 20 certificates)
+    """
+    # Extract unique domain names from certificates
+    all_domains = set()
+    certificates = []
+    for i, cert in enumerate(_iter_ct_certificates(response)):
+        if len(certificates) < 20:  # Limit to 20 certs
+            certificates.append(cert)
+        
+        name_value = cert.get("name_value", "")
+        # Parse domain names (can be comma-separated or newline-separated)
+        domains = _NAME_SPLIT_RE.split(name_value)
+        for d in domains:
+            d = d.strip().lower()
+            # Remove wildcards
+            d = d.replace("*.", "")
+            if d and domain in d:
+                all_domains.add(d)
+        
+        # Also check common_name
+        cn = cert.get("common_name", "").lower()
+        if cn and domain in cn:
+            all_domains.add(cn.replace("*.", ""))
+        
+        if i + 1 >= _CT_MAX_CERTIFICATES or len(all_domains) >= _CT_MAX_DOMAINS:
+            break
+    
+    return all_domains, certificates
+
+
 def _search_domains_by_email(email: str) -> List[str]:
     """Search for domains registered with a specific email (limited free options)."""
     domains = []
@@ -140,7 +191,7 @@ def _search_domains_by_email(email: str) -> List[str]:
     return domains
 
 
-def discover_emails(domain: str) -> Dict:
+def discover_emails(domain: str, ct_data: Optional[Dict] = None) -> Dict:
     """
     Discover email addresses associated with a domain.
     
@@ -149,6 +200,11 @@ def discover_emails(domain: str) -> Dict:
     - WHOIS data
     - Social media profiles
     - Public records
+    
+    Args:
+        domain: Domain to search
+        ct_data: Result of get_certificate_transparency(domain), if the caller
+            already has it (avoids a second CT lookup)
     """
     results = {
         "emails": [],
@@ -161,7 +217,7 @@ def discover_emails(domain: str) -> Dict:
         return cached
     
     # Method 1: Certificate Transparency logs
-    ct_results = get_certificate_transparency(domain)
+    ct_results = ct_data if ct_data is not None else get_certificate_transparency(domain)
     # Extract emails from certificate data if available
     
     # Method 2: Common email patterns
@@ -180,7 +236,7 @@ def discover_emails(domain: str) -> Dict:
     results["sources"] = ["common_patterns"]
     
     # Cache for 7 days
-    set_cache(cache_key, results, ttl=604800)
+    set_cached("email_discovery", domain, results, ttl_hours=168)
     
     return results
 
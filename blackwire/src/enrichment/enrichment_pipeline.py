@@ -1,13 +1,18 @@
 """Main enrichment pipeline that orchestrates all enrichment steps."""
 
 import sys
+import asyncio
+import importlib.util
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.utils.cache import get_cached, set_cached
+from src.utils.cache import get_cached, set_cached, get_cached_many, set_cached_many
 from src.utils.logger import logger
 from src.utils.validation import (
     validate_phone, validate_domain, validate_wallet, validate_handle, sanitize_input
@@ -15,6 +20,69 @@ from src.utils.validation import (
 from src.utils.config import Config
 
 
+@dataclass(slots=True)
+class EnrichResult:
+    """Result of enriching one entity; converted to a plain dict at the API boundary."""
+    entity_type: str
+    value: str
+    enriched: bool = False
+    data: Dict = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+    
+    def to_dict(self) -> Dict:
+        """Return the public result dict (shallow: data and errors are not copied)."""
+        return {
+            "entity_type": self.entity_type,
+            "value": self.value,
+            "enriched": self.enriched,
+            "data": self.data,
+            "errors": self.errors
+        }
+
+
+def _lazy_module(name: str):
+    """
+    Return a module that is only executed on first attribute access.
+    
+    Keeps heavy enrichers (phonenumbers, whois, ...) out of pipeline import
+    time without re-running an import statement on every call.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+_phone_enrichment = _lazy_module("src.enrichment.phone_enrichment")
+_domain_enrichment = _lazy_module("src.enrichment.domain_enrichment")
+_wallet_enrichment = _lazy_module("src.enrichment.wallet_enrichment")
+_messaging_enrichment = _lazy_module("src.enrichment.messaging_enrichment")
+
+# Serialises first access to the lazy enricher modules
+_ENRICHER_LOAD_LOCK = threading.Lock()
+
+_VALIDATORS = {
+    "phone": validate_phone,
+    "domain": validate_domain,
+    "wallet": validate_wallet,
+    "handle": validate_handle,
+}
+
+# entity_type -> (lazy module, enrichment function name)
+_ENRICHERS = {
+    "phone": (_phone_enrichment, "enrich_phone"),
+    "domain": (_domain_enrichment, "enrich_domain"),
+    "wallet": (_wallet_enrichment, "enrich_wallet"),
+    "handle": (_messaging_enrichment, "enrich_handle"),
+}
+
+
 def enrich_entity(entity_type: str, value: str) -> Dict:
     """
     Enrich an entity (phone, domain, wallet, handle) with all available data sources.
@@ -30,77 +98,152 @@ def enrich_entity(entity_type: str, value: str) -> Dict:
     # Sanitize input
     value = sanitize_input(value)
     
-    result = {
-        "entity_type": entity_type,
-        "value": value,
-        "enriched": False,
-        "data": {},
-        "errors": []
-    }
-    
-    # Validate entity type
-    if entity_type not in ["phone", "domain", "wallet", "handle"]:
-        result["errors"].append(f"Unknown entity type: {entity_type}")
-        return result
-    
-    # Validate input format
-    is_valid = False
-    validation_error = None
-    
-    if entity_type == "phone":
-        is_valid, validation_error = validate_phone(value)
-    elif entity_type == "domain":
-        is_valid, validation_error = validate_domain(value)
-    elif entity_type == "wallet":
-        is_valid, validation_error = validate_wallet(value)
-    elif entity_type == "handle":
-        is_valid, validation_error = validate_handle(value)
-    
-    if not is_valid:
-        result["errors"].append(validation_error or "Invalid input format")
-        return result
+    result = _prepare_result(entity_type, value)
+    if result.errors:
+        return result.to_dict()
     
     # Check cache first (if enabled)
     if Config.CACHE_ENABLED:
         cached_data = get_cached(entity_type, value, Config.CACHE_TTL_HOURS)
         if cached_data:
             logger.info(f"Cache hit for {entity_type}: {value[:20]}...")
-            result["data"] = cached_data
-            result["enriched"] = True
-            return result
+            result.data = cached_data
+            result.enriched = True
+            return result.to_dict()
     
     logger.info(f"Enriching {entity_type}: {value[:50]}...")
     
     try:
-        if entity_type == "phone":
-            from .phone_enrichment import enrich_phone
-            result["data"] = enrich_phone(value)
-            result["enriched"] = True
-            
-        elif entity_type == "domain":
-            from .domain_enrichment import enrich_domain
-            result["data"] = enrich_domain(value)
-            result["enriched"] = True
-            
-        elif entity_type == "wallet":
-            from .wallet_enrichment import enrich_wallet
-            result["data"] = enrich_wallet(value)
-            result["enriched"] = True
-            
-        elif entity_type == "handle":
-            from .messaging_enrichment import enrich_handle
-            result["data"] = enrich_handle(value)
-            result["enriched"] = True
+        result.data = _run_enricher(entity_type, value)
+        result.enriched = True
         
         # Cache successful enrichment
-        if result["enriched"] and Config.CACHE_ENABLED and not result["data"].get("errors"):
-            set_cached(entity_type, value, result["data"], Config.CACHE_TTL_HOURS)
+        if result.enriched and Config.CACHE_ENABLED and not result.data.get("errors"):
+            set_cached(entity_type, value, result.data, Config.CACHE_TTL_HOURS)
             logger.debug(f"Cached enrichment for {entity_type}: {value[:20]}...")
             
     except Exception as e:
         error_msg = str(e)
-        result["errors"].append(error_msg)
+        result.errors.append(error_msg)
         logger.error(f"Enrichment failed for {entity_type} {value[:20]}: {error_msg}", exc_info=True)
     
+    return result.to_dict()
+
+
+def enrich_entities(pairs: List[Tuple[str, str]], max_concurrency: int = 8) -> List[Dict]:
+    """
+    Enrich many entities in one call.
+    
+    Cache lookups and writes are done per entity type in bulk, duplicate
+    values are enriched once, and uncached entities are enriched concurrently
+    (domains on the event loop, other types on worker threads).
+    
+    Args:
+        pairs: List of (entity_type, value) tuples
+        max_concurrency: Maximum number of enrichments running at once
+        
+    Returns:
+        List of results in the same order as pairs, each shaped like enrich_entity's
+    """
+    return asyncio.run(_enrich_entities_async(pairs, max_concurrency))
+
+
+async def _enrich_entities_async(pairs: List[Tuple[str, str]], max_concurrency: int) -> List[Dict]:
+    """Validate, bulk cache lookup, then enrich uncached entities concurrently."""
+    results = []
+    pending = {}  # entity_type -> {value: [result, ...]}
+    
+    for entity_type, value in pairs:
+        value = sanitize_input(value)
+        result = _prepare_result(entity_type, value)
+        results.append(result)
+        if not result.errors:
+            pending.setdefault(entity_type, {}).setdefault(value, []).append(result)
+    
+    # Bulk cache lookup, one pass per entity type
+    if Config.CACHE_ENABLED:
+        for entity_type, by_value in pending.items():
+            cached = get_cached_many(entity_type, list(by_value), Config.CACHE_TTL_HOURS)
+            for value, cached_data in cached.items():
+                if cached_data:
+                    for result in by_value.pop(value):
+                        result.data = cached_data
+                        result.enriched = True
+    
+    # Resolve each enricher once here instead of per job on the worker threads
+    enrichers = {
+        entity_type: _get_enricher(entity_type)
+        for entity_type, by_value in pending.items() if by_value
+    }
+    
+    semaphore = asyncio.Semaphore(max_concurrency)
+    loop = asyncio.get_running_loop()
+    
+    async def enrich_one(entity_type: str, value: str) -> Dict:
+        async with semaphore:
+            logger.info(f"Enriching {entity_type}: {value[:50]}...")
+            if entity_type == "domain":
+                return await _domain_enrichment.enrich_domain_async(value)
+            return await loop.run_in_executor(pool, enrichers[entity_type], value)
+    
+    jobs = [(entity_type, value) for entity_type, by_value in pending.items() for value in by_value]
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        outcomes = await asyncio.gather(
+            *[enrich_one(entity_type, value) for entity_type, value in jobs],
+            return_exceptions=True
+        )
+    
+    to_cache = {}
+    for (entity_type, value), outcome in zip(jobs, outcomes):
+        for result in pending[entity_type][value]:
+            if isinstance(outcome, BaseException):
+                result.errors.append(str(outcome))
+                logger.error(f"Enrichment failed for {entity_type} {value[:20]}: {outcome}")
+            else:
+                result.data = outcome
+                result.enriched = True
+        
+        if not isinstance(outcome, BaseException) and not outcome.get("errors"):
+            to_cache.setdefault(entity_type, {})[value] = outcome
+    
+    # Bulk cache write of successful enrichments
+    if Config.CACHE_ENABLED:
+        for entity_type, items in to_cache.items():
+            set_cached_many(entity_type, items, Config.CACHE_TTL_HOURS)
+    
+    return [result.to_dict() for result in results]
+
+
+def _prepare_result(entity_type: str, value: str) -> EnrichResult:
+    """Build the result skeleton, recording an error if the type or format is invalid."""
+    result = EnrichResult(entity_type, value)
+    
+    # Validate entity type
+    validator = _VALIDATORS.get(entity_type)
+    if validator is None:
+        result.errors.append(f"Unknown entity type: {entity_type}")
+        return result
+    
+    # Validate input format
+    is_valid, validation_error = validator(value)
+    if not is_valid:
+        result.errors.append(validation_error or "Invalid input format")
+    
     return result
 
+
+def _get_enricher(entity_type: str):
+    """
+    Get the enrichment function for an entity type (loading its module on first use).
+    
+    The first attribute access on a lazy module runs the module, which is not
+    thread-safe, so lookups are serialised (request threads call this too).
+    """
+    module, func_name = _ENRICHERS[entity_type]
+    with _ENRICHER_LOAD_LOCK:
+        return getattr(module, func_name)
+
+
+def _run_enricher(entity_type: str, value: str) -> Dict:
+    """Run the enrichment function for an entity type."""
+    return _get_enricher(entity_type)(value)
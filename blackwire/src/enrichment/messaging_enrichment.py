@@ -2,7 +2,13 @@
 
 import re
 import json
-import requests
+import math
+import time
+import random
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from urllib3.util.retry import Retry
 from typing import Dict, Optional, List
 import sys
 from pathlib import Path
@@ -10,11 +16,95 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.utils.logger import logger
-from src.utils.retry import retry_with_backoff
 from src.utils.rate_limiter import check_rate_limit, record_api_request
-from src.utils.cache import get_cached, set_cached
+from src.utils.cache import TTLCache, get_cached, set_cached
+from src.utils.http_session import create_session
 from src.enrichment.threat_intel import check_threat_intel
 
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+    aiohttp = None
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
+
+
+_INSTAGRAM_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1"
+}
+_TELEGRAM_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+
+# Bytes of an Instagram profile page read for the private-account check
+# (the markers sit in the <head>/login prompt near the top of the page)
+_INSTAGRAM_MAX_BYTES = 16 * 1024
+# Private-profile markers, matched case-insensitively on the raw page bytes in one pass
+_IG_REDIRECT = frozenset((301, 302))
+_IG_PRIVATE_RE = re.compile(rb'log in|this account is private|"is_private":\s*true', re.I)
+
+# Bounded in-process L1 for cross-platform results, in front of the shared cache
+_CROSS_PLATFORM_CACHE = TTLCache(maxsize=4096, ttl_seconds=3600)
+_CROSS_PLATFORM_TTL_HOURS = 24
+# XFetch early refresh: a cached entry is recomputed in the background with
+# probability rising as it nears expiry, so hot usernames never all expire at once
+_XFETCH_BETA = 1.0
+
+# ETag/Last-Modified of the last profile response, kept longer than the results
+# so an expired result can be revalidated with a conditional GET
+_VALIDATOR_TTL_HOURS = 168
+
+# Single-flight map: username -> Future of the in-progress cross-platform check
+_INFLIGHT: Dict[str, Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
+_INFLIGHT_WAIT_SECONDS = 30
+
+# Shared pool for the per-handle lookups in enrich_handle (the cross-platform
+# check waits on the network while the pattern checks run)
+_osint_pool = ThreadPoolExecutor(max_workers=4)
+
+# Shared keep-alive session for the blocking profile checks; transient statuses
+# are retried by urllib3 (honouring Retry-After) rather than re-running the checks
+_HTTP_RETRY = Retry(
+    total=2,
+    backoff_factor=0.3,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset(["GET", "HEAD"]),
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+SESSION = create_session(pool_connections=10, pool_maxsize=50, max_retries=_HTTP_RETRY)
+
+# Separators dropped before phone detection (one translate pass instead of chained replaces)
+_STRIP_PHONE_TBL = str.maketrans("", "", " -()")
+_PHONE_START_CHARS = frozenset("+0123456789")
+
+# Handle detection and username analysis patterns (compiled once at import)
+_PHONE_RE = re.compile(r'[\+]?[(]?[0-9]{1,4}[)]?[-\s\.]?[(]?[0-9]{1,4}[)]?[-\s\.]?[0-9]{1,9}')
+_USERNAME_RE = re.compile(r'^[a-zA-Z0-9._]{1,30}$')
+# All username traits in one pass: each optional lookahead sets its group when the trait holds
+_OSINT_RE = re.compile(r"""
+    (?:(?=(?P<alnum>[a-z0-9]+$)))?
+    (?:(?=(?P<letters_then_numbers>[a-z]+[0-9]+$)))?
+    (?:(?=.*?(?P<official>(?i:bot|admin|support|official))))?
+""", re.VERBOSE | re.DOTALL)
+_SUSPICIOUS_RES = tuple(re.compile(p) for p in [
+    r'^[0-9]{6,}$',  # All numbers
+    r'^[a-z]{1,3}[0-9]{4,}$',  # Very short prefix + numbers
+])
+
 
 def enrich_handle(handle: str) -> Dict:
     """
@@ -48,59 +138,46 @@ def enrich_handle(handle: str) -> Dict:
     try:
         handle = handle.strip().lower()
         
-        # Detect if it's a phone number
-        phone_pattern = re.compile(r'[\+]?[(]?[0-9]{1,4}[)]?[-\s\.]?[(]?[0-9]{1,4}[)]?[-\s\.]?[0-9]{1,9}')
-        if phone_pattern.match(handle.replace(" ", "").replace("-", "").replace("(", "").replace(")", "")):
-            result["is_phone"] = True
-            result["phone_linked"] = handle
-            result["detected_platforms"] = ["WhatsApp", "SMS", "Telegram"]
-            result["platform"] = "WhatsApp"  # Default for phone numbers
-        
-        # Detect Instagram username (@username or username)
-        elif handle.startswith("@") or (not "@" in handle and len(handle) > 0):
-            username = handle.lstrip("@")
-            if re.match(r'^[a-zA-Z0-9._]{1,30}$', username):
-                result["is_username"] = True
-                result["normalized_handle"] = username
-                result["detected_platforms"].append("Instagram")
-                result["possible_platforms"].extend(["Instagram", "Telegram", "Twitter/X"])
-                if not result["platform"]:
-                    result["platform"] = "Instagram"
-                result["handle"] = username
-        
-        # Detect Telegram username (@username or t.me/username)
-        if handle.startswith("@") or "t.me/" in handle:
-            username = handle.replace("t.me/", "").lstrip("@")
-            if "Telegram" not in result["detected_platforms"]:
-                result["detected_platforms"].append("Telegram")
-            if "Telegram" not in result["possible_platforms"]:
-                result["possible_platforms"].append("Telegram")
-            if not result["platform"]:
-                result["platform"] = "Telegram"
-            if not result["normalized_handle"]:
-                result["normalized_handle"] = username
-            result["handle"] = username
+        # Pick the detection path from the first character so only the relevant checks run
+        first = handle[:1]
+        if first == "@":
+            # @username is valid on both Instagram and Telegram
+            _detect_username(result, handle.lstrip("@"))
+            _detect_telegram(result, handle)
+        else:
+            # Phone numbers start with + or a digit once separators are removed
+            stripped = handle.translate(_STRIP_PHONE_TBL)
+            if stripped[:1] in _PHONE_START_CHARS and _PHONE_RE.match(stripped):
+                _detect_phone(result, handle)
+            elif first and "@" not in handle:
+                _detect_username(result, handle)
+            
+            if "t.me/" in handle:
+                _detect_telegram(result, handle)
         
         # Enhanced enrichment: Cross-platform presence, profile checks, OSINT
         if result.get("normalized_handle"):
             username = result["normalized_handle"]
             
+            # Run the lookups side by side
+            cross_future = _osint_pool.submit(_check_cross_platform_presence, username)
+            metadata_future = _osint_pool.submit(_get_profile_metadata, username, result.get("platform"))
+            osint_future = _osint_pool.submit(_gather_osint_data, username)
+            threat_future = _osint_pool.submit(_check_handle_threat_intel, username)
+            
             # Check cross-platform presence
-            cross_platform = _check_cross_platform_presence(username)
+            cross_platform = cross_future.result()
             result["cross_platform_presence"] = cross_platform
             result["profile_exists"] = {k: v.get("exists", False) for k, v in cross_platform.items()}
             
             # Get profile metadata where available
-            profile_metadata = _get_profile_metadata(username, result.get("platform"))
-            result["account_metadata"] = profile_metadata
+            result["account_metadata"] = metadata_future.result()
             
             # OSINT data gathering
-            osint_data = _gather_osint_data(username)
-            result["osint_data"] = osint_data
+            result["osint_data"] = osint_future.result()
             
             # Threat intelligence check
-            threat_data = _check_handle_threat_intel(username)
-            result["threat_intel"] = threat_data
+            result["threat_intel"] = threat_future.result()
             
             # Check against community scam lists (free, no API key needed)
             try:
@@ -138,43 +215,291 @@ def enrich_handle(handle: str) -> Dict:
     return result
 
 
+def _detect_phone(result: Dict, handle: str) -> None:
+    """Mark a handle that looks like a phone number."""
+    result["is_phone"] = True
+    result["phone_linked"] = handle
+    result["detected_platforms"] = ["WhatsApp", "SMS", "Telegram"]
+    result["platform"] = "WhatsApp"  # Default for phone numbers
+
+
+def _detect_username(result: Dict, username: str) -> None:
+    """Detect Instagram username (@username or username)."""
+    if _USERNAME_RE.match(username):
+        result["is_username"] = True
+        result["normalized_handle"] = username
+        result["detected_platforms"].append("Instagram")
+        result["possible_platforms"].extend(["Instagram", "Telegram", "Twitter/X"])
+        if not result["platform"]:
+            result["platform"] = "Instagram"
+        result["handle"] = username
+
+
+def _detect_telegram(result: Dict, handle: str) -> None:
+    """Detect Telegram username (@username or t.me/username)."""
+    username = handle.replace("t.me/", "").lstrip("@")
+    if "Telegram" not in result["detected_platforms"]:
+        result["detected_platforms"].append("Telegram")
+    if "Telegram" not in result["possible_platforms"]:
+        result["possible_platforms"].append("Telegram")
+    if not result["platform"]:
+        result["platform"] = "Telegram"
+    if not result["normalized_handle"]:
+        result["normalized_handle"] = username
+    result["handle"] = username
+
+
 def _check_cross_platform_presence(username: str) -> Dict:
-    """Check if username exists on multiple platforms."""
-    results = {}
+    """
+    Check if username exists on multiple platforms (all platforms checked concurrently).
     
-    # Check cache (but use shorter TTL for Instagram since structure changes)
-    cached = get_cached("cross_platform", username, ttl_hours=24)  # 1 day (reduced from 7 days)
+    Concurrent calls for the same username share one set of profile requests:
+    the first caller runs the checks and the others wait for its result.
+    """
+    cached = _load_cached_cross_platform(username)
     if cached:
         return cached
     
-    # Instagram check (public profile check)
+    return _fetch_cross_platform_presence(username)
+
+
+def _fetch_cross_platform_presence(username: str) -> Dict:
+    """Run the profile checks for username (single-flight), bypassing the cache."""
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(username)
+        leader = future is None
+        if leader:
+            future = Future()
+            _INFLIGHT[username] = future
+    
+    if not leader:
+        try:
+            return future.result(timeout=_INFLIGHT_WAIT_SECONDS)
+        except FutureTimeoutError:
+            # Leader still running; report no presence rather than failing the handle
+            logger.debug(f"Timed out waiting for in-flight profile checks for {username}")
+            return {}
+    
+    return _lead_cross_platform_checks(username, future)
+
+
+def _lead_cross_platform_checks(username: str, future: Future) -> Dict:
+    """Run the profile checks as the registered in-flight leader, publishing the outcome to future."""
     try:
-        if check_rate_limit("instagram_check"):
-            instagram_result = _check_instagram_profile(username)
-            results["Instagram"] = instagram_result
-            record_api_request("instagram_check")
-    except Exception as e:
-        logger.debug(f"Instagram check failed: {e}")
+        if AIOHTTP_AVAILABLE:
+            results = asyncio.run(_check_cross_platform_presence_async(username, use_cache=False))
+        else:
+            results = _check_cross_platform_presence_threaded(username)
+        future.set_result(results)
+        return results
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(username, None)
+
+
+def _check_cross_platform_presence_threaded(username: str) -> Dict:
+    """Without aiohttp, run the blocking checks side by side on threads."""
+    started_at = time.time()
+    checks = {
+        platform: check for platform, check in _PLATFORM_CHECKS.items()
+        if check_rate_limit(_PLATFORM_RATE_LIMITS[platform])
+    }
+    with ThreadPoolExecutor(max_workers=max(len(checks), 1)) as pool:
+        futures = {platform: pool.submit(check, username) for platform, check in checks.items()}
+        outcomes = {}
+        for platform, future in futures.items():
+            try:
+                outcomes[platform] = future.result()
+            except Exception as e:
+                outcomes[platform] = e
     
-    # Telegram check (public API)
+    return _store_cross_platform_results(username, outcomes, started_at)
+
+
+async def _check_cross_platform_presence_async(username: str, session=None, use_cache: bool = True) -> Dict:
+    """
+    Check if username exists on multiple platforms, issuing all profile requests at once.
+    
+    Args:
+        username: Username to check
+        session: Optional aiohttp.ClientSession to reuse (one is opened and closed otherwise)
+        use_cache: Return cached results when available (False forces fresh checks)
+    
+    Returns:
+        Dict of platform -> profile check result (same shape as the sync version)
+    """
+    # Check cache (but use shorter TTL for Instagram since structure changes)
+    if use_cache:
+        cached = _load_cached_cross_platform(username)
+        if cached:
+            return cached
+    
+    started_at = time.time()
+    platforms = [p for p in _PLATFORM_CHECKS if check_rate_limit(_PLATFORM_RATE_LIMITS[p])]
+    
+    own_session = session is None
+    if own_session:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit_per_host=3, ttl_dns_cache=300, use_dns_cache=True),
+            timeout=aiohttp.ClientTimeout(total=15)
+        )
     try:
-        if check_rate_limit("telegram_check"):
-            telegram_result = _check_telegram_username(username)
-            results["Telegram"] = telegram_result
-            record_api_request("telegram_check")
-    except Exception as e:
-        logger.debug(f"Telegram check failed: {e}")
+        async_checks = {
+            "Instagram": _check_instagram_profile_async,
+            "Telegram": _check_telegram_username_async,
+        }
+        responses = await asyncio.gather(
+            *[async_checks[platform](session, username) for platform in platforms],
+            return_exceptions=True
+        )
+    finally:
+        if own_session:
+            await session.close()
+    
+    return _store_cross_platform_results(username, dict(zip(platforms, responses)), started_at)
+
+
+def _load_cached_cross_platform(username: str) -> Optional[Dict]:
+    """
+    Look up cross-platform results in the L1 cache, then the shared cache.
+    
+    A hit close to expiry may also schedule a background refresh (XFetch);
+    the cached results are still returned straight away.
+    """
+    entry = _CROSS_PLATFORM_CACHE.get(username)
+    if entry is None:
+        entry = get_cached("cross_platform", username, ttl_hours=_CROSS_PLATFORM_TTL_HOURS)  # 1 day (reduced from 7 days)
+        if not entry:
+            return None
+        _CROSS_PLATFORM_CACHE.set(username, entry)
+    
+    if _should_refresh_early(entry):
+        _schedule_cross_platform_refresh(username)
+    return entry["results"]
+
+
+def _should_refresh_early(entry: Dict) -> bool:
+    """XFetch test: now - delta * beta * ln(rand) >= expiry, where delta is how long the checks took."""
+    expires_at = entry["computed_at"] + _CROSS_PLATFORM_TTL_HOURS * 3600
+    jitter = -entry["delta"] * _XFETCH_BETA * math.log(1.0 - random.random())
+    return time.time() + jitter >= expires_at
+
+
+def _schedule_cross_platform_refresh(username: str) -> None:
+    """Recompute cross-platform results on the shared pool unless a check is already running."""
+    # Check and register under one lock hold, so two cache hits can't queue two refreshes
+    with _INFLIGHT_LOCK:
+        if username in _INFLIGHT:
+            return
+        future = Future()
+        _INFLIGHT[username] = future
+    logger.debug(f"Early refresh of cross-platform results for {username}")
+    _osint_pool.submit(_lead_cross_platform_checks, username, future)
+
+
+def _store_cross_platform_results(username: str, outcomes: Dict, started_at: float) -> Dict:
+    """Record API usage for completed checks, drop failed ones, and cache the results."""
+    results = {}
+    for platform, outcome in outcomes.items():
+        if isinstance(outcome, BaseException):
+            logger.debug(f"{platform} check failed: {outcome}")
+            continue
+        results[platform] = outcome
+        record_api_request(_PLATFORM_RATE_LIMITS[platform])
     
     # Twitter/X check (limited - would need API)
     # TikTok, Snapchat, etc. - limited public access
     
-    # Cache results (shorter TTL)
-    set_cached("cross_platform", username, results, ttl_hours=24)
+    # Cache results (shorter TTL), with the timings XFetch needs
+    now = time.time()
+    entry = {"results": results, "computed_at": now, "delta": now - started_at}
+    set_cached("cross_platform", username, entry, ttl_hours=_CROSS_PLATFORM_TTL_HOURS)
+    _CROSS_PLATFORM_CACHE.set(username, entry)
     
     return results
 
 
-@retry_with_backoff(max_retries=2)
+def _load_profile_validators(platform: str, username: str) -> Optional[Dict]:
+    """Get the last result and its ETag/Last-Modified for a profile page, if any."""
+    return get_cached("profile_validators", f"{platform}:{username}", ttl_hours=_VALIDATOR_TTL_HOURS)
+
+
+def _store_profile_validators(platform: str, username: str, result: Dict,
+                              etag: Optional[str], last_modified: Optional[str]) -> None:
+    """Remember a profile result with the validators needed to revalidate it later."""
+    if result.get("error") or not (etag or last_modified):
+        return
+    set_cached("profile_validators", f"{platform}:{username}", {
+        "result": result,
+        "etag": etag,
+        "last_modified": last_modified
+    }, ttl_hours=_VALIDATOR_TTL_HOURS)
+
+
+def _conditional_headers(headers: Dict, validators: Optional[Dict]) -> Dict:
+    """Add If-None-Match/If-Modified-Since to request headers when validators are known."""
+    if not validators:
+        return headers
+    headers = dict(headers)
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def _revalidated(platform: str, username: str, validators: Dict) -> Dict:
+    """Handle a 304 Not Modified: reuse the stored result and extend its lifetime."""
+    result = dict(validators["result"])
+    _store_profile_validators(platform, username, result, validators.get("etag"), validators.get("last_modified"))
+    return result
+
+
+def _instagram_result_template(username: str) -> Dict:
+    return {
+        "exists": False,
+        "url": f"https://www.instagram.com/{username}/",
+        "status": None,
+        "is_private": False
+    }
+
+
+def _apply_instagram_response(result: Dict, status_code: int, html_content: bytes) -> None:
+    """Interpret an Instagram profile page response (html_content is the raw top of the page)."""
+    # 200 = profile exists, 404 = doesn't exist, 301/302 = redirect (might be private)
+    if status_code == 200:
+        result["exists"] = True
+        result["status"] = "public"
+        
+        # Try to detect if profile is private by checking for login redirect indicators
+        if _IG_PRIVATE_RE.search(html_content):
+            result["is_private"] = True
+            result["status"] = "private"
+    elif status_code in _IG_REDIRECT:
+        result["exists"] = True
+        result["status"] = "private_or_redirect"
+        result["is_private"] = True
+    else:
+        result["exists"] = False
+        result["status"] = "not_found"
+
+
+def _apply_telegram_response(result: Dict, status_code: int, content: str) -> None:
+    """Interpret a t.me username page response (content lowercased)."""
+    # Telegram returns 200 if username exists, 404 if not
+    if status_code == 200:
+        result["exists"] = True
+        # Try to extract basic info from page
+        if "telegram" in content:
+            result["status"] = "exists"
+    else:
+        result["exists"] = False
+        result["status"] = "not_found"
+
+
 def _check_instagram_profile(username: str) -> Dict:
     """
     Check if Instagram profile exists.
@@ -182,48 +507,22 @@ def _check_instagram_profile(username: str) -> Dict:
     Note: Instagram requires JavaScript to load profile data, so we can only
     detect if the profile exists, not extract detailed metadata without a headless browser.
     """
-    result = {
-        "exists": False,
-        "url": f"https://www.instagram.com/{username}/",
-        "status": None,
-        "is_private": False
-    }
+    result = _instagram_result_template(username)
+    validators = _load_profile_validators("Instagram", username)
     
     try:
         # Try to access profile page (public check)
         url = f"https://www.instagram.com/{username}/"
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1"
-        }
-        response = requests.get(url, headers=headers, timeout=15, allow_redirects=True)
-        
-        # 200 = profile exists, 404 = doesn't exist, 301/302 = redirect (might be private)
-        if response.status_code == 200:
-            result["exists"] = True
-            result["status"] = "public"
-            
-            # Try to detect if profile is private by checking for login redirect indicators
-            html_content = response.text.lower()
-            if "log in" in html_content or "this account is private" in html_content:
-                result["is_private"] = True
-                result["status"] = "private"
-        elif response.status_code in [301, 302]:
-            result["exists"] = True
-            result["status"] = "private_or_redirect"
-            result["is_private"] = True
-                
-        elif response.status_code in [301, 302]:
-            result["exists"] = True
-            result["status"] = "private_or_redirect"
-            result["is_private"] = True
-        else:
-            result["exists"] = False
-            result["status"] = "not_found"
+        headers = _conditional_headers(_INSTAGRAM_HEADERS, validators)
+        # Stream and read only the top of the page instead of the whole body
+        with SESSION.get(url, headers=headers, timeout=15, allow_redirects=True,
+                         stream=True) as response:
+            if response.status_code == 304 and validators:
+                return _revalidated("Instagram", username, validators)
+            head = response.raw.read(_INSTAGRAM_MAX_BYTES, decode_content=True) if response.status_code == 200 else b""
+            _apply_instagram_response(result, response.status_code, head)
+            _store_profile_validators("Instagram", username, result,
+                                      response.headers.get("ETag"), response.headers.get("Last-Modified"))
             
     except Exception as e:
         logger.debug(f"Instagram profile check error: {e}")
@@ -232,29 +531,72 @@ def _check_instagram_profile(username: str) -> Dict:
     return result
 
 
-@retry_with_backoff(max_retries=2)
+async def _check_instagram_profile_async(session, username: str) -> Dict:
+    """Async version of _check_instagram_profile using a shared aiohttp session."""
+    result = _instagram_result_template(username)
+    validators = _load_profile_validators("Instagram", username)
+    
+    try:
+        url = f"https://www.instagram.com/{username}/"
+        headers = _conditional_headers(_INSTAGRAM_HEADERS, validators)
+        async with session.get(url, headers=headers, allow_redirects=True) as response:
+            if response.status == 304 and validators:
+                return _revalidated("Instagram", username, validators)
+            head = b""
+            if response.status == 200:
+                while len(head) < _INSTAGRAM_MAX_BYTES:
+                    chunk = await response.content.read(_INSTAGRAM_MAX_BYTES - len(head))
+                    if not chunk:
+                        break
+                    head += chunk
+            _apply_instagram_response(result, response.status, head)
+            _store_profile_validators("Instagram", username, result,
+                                      response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    except Exception as e:
+        logger.debug(f"Instagram profile check error: {e}")
+        result["error"] = str(e)
+    
+    return result
+
+
 def _check_telegram_username(username: str) -> Dict:
     """Check if Telegram username exists."""
     result = {"exists": False, "url": f"https://t.me/{username}"}
+    validators = _load_profile_validators("Telegram", username)
     
     try:
         # Telegram public username check
         url = f"https://t.me/{username}"
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=10, allow_redirects=False)
-        
-        # Telegram returns 200 if username exists, 404 if not
-        if response.status_code == 200:
-            result["exists"] = True
-            # Try to extract basic info from page
-            content = response.text.lower()
-            if "telegram" in content:
-                result["status"] = "exists"
-        else:
-            result["exists"] = False
-            result["status"] = "not_found"
+        headers = _conditional_headers(_TELEGRAM_HEADERS, validators)
+        response = SESSION.get(url, headers=headers, timeout=10, allow_redirects=False)
+        if response.status_code == 304 and validators:
+            return _revalidated("Telegram", username, validators)
+        _apply_telegram_response(result, response.status_code, response.text.lower())
+        _store_profile_validators("Telegram", username, result,
+                                  response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    except Exception as e:
+        logger.debug(f"Telegram username check error: {e}")
+        result["error"] = str(e)
+    
+    return result
+
+
+async def _check_telegram_username_async(session, username: str) -> Dict:
+    """Async version of _check_telegram_username using a shared aiohttp session."""
+    result = {"exists": False, "url": f"https://t.me/{username}"}
+    validators = _load_profile_validators("Telegram", username)
+    
+    try:
+        url = f"https://t.me/{username}"
+        headers = _conditional_headers(_TELEGRAM_HEADERS, validators)
+        async with session.get(url, headers=headers, allow_redirects=False,
+                               timeout=aiohttp.ClientTimeout(total=10)) as response:
+            if response.status == 304 and validators:
+                return _revalidated("Telegram", username, validators)
+            content = (await response.text(errors="ignore")).lower()
+            _apply_telegram_response(result, response.status, content)
+            _store_profile_validators("Telegram", username, result,
+                                      response.headers.get("ETag"), response.headers.get("Last-Modified"))
     except Exception as e:
         logger.debug(f"Telegram username check error: {e}")
         result["error"] = str(e)
@@ -262,6 +604,17 @@ def _check_telegram_username(username: str) -> Dict:
     return result
 
 
+# Blocking profile checks and the rate-limit bucket each one counts against
+_PLATFORM_CHECKS = {
+    "Instagram": _check_instagram_profile,
+    "Telegram": _check_telegram_username,
+}
+_PLATFORM_RATE_LIMITS = {
+    "Instagram": "instagram_check",
+    "Telegram": "telegram_check",
+}
+
+
 def _get_profile_metadata(username: str, platform: Optional[str] = None) -> Dict:
     """Get profile metadata where available."""
     metadata = {}
@@ -278,6 +631,138 @@ def _get_profile_metadata(username: str, platform: Optional[str] = None) -> Dict
     return metadata
 
 
+# Common male first names (sample - would ideally use a comprehensive database)
+_MALE_NAMES = frozenset({
+    "john", "james", "robert", "michael", "william", "david", "richard", "joseph", "thomas", "charles",
+    "daniel", "matthew", "anthony", "mark", "donald", "steven", "paul", "andrew", "joshua", "kenneth",
+    "kevin", "brian", "george", "timothy", "ronald", "jason", "edward", "jeffrey", "ryan", "jacob",
+    "gary", "nicholas", "eric", "stephen", "jonathan", "larry", "justin", "scott", "brandon", "benjamin",
+    "samuel", "frank", "gregory", "raymond", "alexander", "patrick", "jack", "dennis", "jerry", "tyler",
+    "aaron", "jose", "henry", "adam", "douglas", "nathan", "zachary", "peter", "kyle", "noah",
+    "ethan", "jeremy", "walter", "christian", "keith", "roger", "terry", "austin", "sean", "gerald",
+    "carl", "harold", "dylan", "arthur", "jordan", "bryan", "billy", "joe", "bruce", "albert",
+    "willie", "gabriel", "logan", "alan", "juan", "wayne", "roy", "ralph", "randy", "eugene",
+    "vincent", "russell", "louis", "philip", "bobby", "johnny", "lawrence", "nicholas", "mason", "lucas"
+})
+
+# Common female first names (sample)
+_FEMALE_NAMES = frozenset({
+    "mary", "patricia", "jennifer", "linda", "elizabeth", "barbara", "susan", "jessica", "sarah", "karen",
+    "nancy", "lisa", "betty", "margaret", "sandra", "ashley", "kimberly", "emily", "donna", "michelle",
+    "dorothy", "carol", "amanda", "melissa", "deborah", "stephanie", "rebecca", "sharon", "laura", "cynthia",
+    "kathleen", "amy", "angela", "shirley", "anna", "brenda", "pamela", "emma", "nicole", "virginia",
+    "maria", "heather", "diane", "julie", "joyce", "victoria", "kelly", "christina", "joan", "evelyn",
+    "judith", "megan", "cheryl", "andrea", "hannah", "jacqueline", "martha", "gloria", "teresa", "samantha",
+    "janet", "rachel", "catherine", "maria", "frances", "ann", "kathryn", "sara", "janice", "jean",
+    "alice", "madison", "doris", "abigail", "julia", "judy", "grace", "denise", "amber", "marilyn",
+    "beverly", "danielle", "theresa", "sophia", "marie", "diana", "brittany", "natalie", "florence", "rose",
+    "alexis", "kayla", "lauren", "lillian", "audrey", "eva", "lucy", "carolyn", "gabrielle", "avery",
+    "chloe", "ella", "aria", "scarlett", "zoey", "penelope", "layla", "nora", "lily", "eleanor"
+})
+
+# Name endings more common for one gender (less reliable than the name lists)
+_FEMALE_ENDINGS = ("a", "ia", "ella", "ette", "ine")
+_MALE_ENDINGS = ("er", "on", "en", "an", "el")
+
+
+def _build_reverse_trie(endings_by_gender: Dict[str, tuple]) -> Dict:
+    """
+    Build a trie over reversed name endings; the None key of a node holds the
+    gender whose ending ends there (female wins ties, as in the original checks).
+    """
+    root = {}
+    for gender, endings in endings_by_gender.items():
+        for ending in endings:
+            node = root
+            for ch in reversed(ending):
+                node = node.setdefault(ch, {})
+            node.setdefault(None, gender)
+    return root
+
+
+_ENDING_TRIE = _build_reverse_trie({"female": _FEMALE_ENDINGS, "male": _MALE_ENDINGS})
+
+
+def _gender_from_ending(name: str) -> Optional[str]:
+    """Walk the name backwards through _ENDING_TRIE; any female ending beats a male one."""
+    node = _ENDING_TRIE
+    match = None
+    for ch in reversed(name):
+        node = node.get(ch)
+        if node is None:
+            break
+        gender = node.get(None)
+        if gender == "female":
+            return gender
+        if gender:
+            match = gender
+    return match
+
+# Country name mappings (common variations)
+_COUNTRY_MAP = {
+    "usa": "United States", "us": "United States", "united states": "United States", "america": "United States",
+    "uk": "United Kingdom", "united kingdom": "United Kingdom", "england": "United Kingdom", "britain": "United Kingdom",
+    "canada": "Canada", "ca": "Canada",
+    "australia": "Australia", "au": "Australia",
+    "germany": "Germany", "de": "Germany", "deutschland": "Germany",
+    "france": "France", "fr": "France",
+    "spain": "Spain", "es": "Spain", "espana": "Spain",
+    "italy": "Italy", "it": "Italy", "italia": "Italy",
+    "japan": "Japan", "jp": "Japan",
+    "south korea": "South Korea", "korea": "South Korea", "kr": "South Korea",
+    "china": "China", "cn": "China",
+    "india": "India", "in": "India",
+    "brazil": "Brazil", "br": "Brazil", "brasil": "Brazil",
+    "mexico": "Mexico", "mx": "Mexico",
+    "netherlands": "Netherlands", "nl": "Netherlands", "holland": "Netherlands",
+    "sweden": "Sweden", "se": "Sweden",
+    "norway": "Norway", "no": "Norway",
+    "denmark": "Denmark", "dk": "Denmark",
+    "poland": "Poland", "pl": "Poland",
+    "russia": "Russia", "ru": "Russia",
+    "turkey": "Turkey", "tr": "Turkey",
+    "saudi arabia": "Saudi Arabia", "sa": "Saudi Arabia",
+    "uae": "United Arab Emirates", "united arab emirates": "United Arab Emirates",
+    "south africa": "South Africa", "za": "South Africa",
+    "nigeria": "Nigeria", "ng": "Nigeria",
+    "egypt": "Egypt", "eg": "Egypt",
+    "kenya": "Kenya", "ke": "Kenya",
+    "philippines": "Philippines", "ph": "Philippines",
+    "thailand": "Thailand", "th": "Thailand",
+    "vietnam": "Vietnam", "vn": "Vietnam",
+    "indonesia": "Indonesia", "id": "Indonesia",
+    "malaysia": "Malaysia", "my": "Malaysia",
+    "singapore": "Singapore", "sg": "Singapore"
+}
+_COUNTRY_ITEMS = tuple(_COUNTRY_MAP.items())
+
+
+def _build_country_automaton():
+    """Build one Aho-Corasick automaton mapping each country key to its position in _COUNTRY_MAP."""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for rank, key in enumerate(_COUNTRY_MAP):
+        automaton.add_word(key, rank)
+    automaton.make_automaton()
+    return automaton
+
+
+def _build_country_key_substrings() -> Dict[str, int]:
+    """Map every substring of a country key to the position of the first key containing it."""
+    substrings = {}
+    for rank, key in enumerate(_COUNTRY_MAP):
+        for start in range(len(key) + 1):
+            for end in range(start, len(key) + 1):
+                substrings.setdefault(key[start:end], rank)
+    return substrings
+
+
+_COUNTRY_AC = _build_country_automaton()
+_COUNTRY_KEY_SUBSTRINGS = _build_country_key_substrings()
+
+
 def _infer_gender_from_name(first_name: str) -> Optional[str]:
     """Infer gender from first name using common name patterns."""
     if not first_name or len(first_name) < 2:
@@ -285,48 +770,15 @@ def _infer_gender_from_name(first_name: str) -> Optional[str]:
     
     first_name_lower = first_name.lower().strip()
     
-    # Common male first names (sample - would ideally use a comprehensive database)
-    male_names = {
-        "john", "james", "robert", "michael", "william", "david", "richard", "joseph", "thomas", "charles",
-        "daniel", "matthew", "anthony", "mark", "donald", "steven", "paul", "andrew", "joshua", "kenneth",
-        "kevin", "brian", "george", "timothy", "ronald", "jason", "edward", "jeffrey", "ryan", "jacob",
-        "gary", "nicholas", "eric", "stephen", "jonathan", "larry", "justin", "scott", "brandon", "benjamin",
-        "samuel", "frank", "gregory", "raymond", "alexander", "patrick", "jack", "dennis", "jerry", "tyler",
-        "aaron", "jose", "henry", "adam", "douglas", "nathan", "zachary", "peter", "kyle", "noah",
-        "ethan", "jeremy", "walter", "christian", "keith", "roger", "terry", "austin", "sean", "gerald",
-        "carl", "harold", "dylan", "arthur", "jordan", "bryan", "billy", "joe", "bruce", "albert",
-        "willie", "gabriel", "logan", "alan", "juan", "wayne", "roy", "ralph", "randy", "eugene",
-        "vincent", "russell", "louis", "philip", "bobby", "johnny", "lawrence", "nicholas", "mason", "lucas"
-    }
-    
-    # Common female first names (sample)
-    female_names = {
-        "mary", "patricia", "jennifer", "linda", "elizabeth", "barbara", "susan", "jessica", "sarah", "karen",
-        "nancy", "lisa", "betty", "margaret", "sandra", "ashley", "kimberly", "emily", "donna", "michelle",
-        "dorothy", "carol", "amanda", "melissa", "deborah", "stephanie", "rebecca", "sharon", "laura", "cynthia",
-        "kathleen", "amy", "angela", "shirley", "anna", "brenda", "pamela", "emma", "nicole", "virginia",
-        "maria", "heather", "diane", "julie", "joyce", "victoria", "kelly", "christina", "joan", "evelyn",
-        "judith", "megan", "cheryl", "andrea", "hannah", "jacqueline", "martha", "gloria", "teresa", "samantha",
-        "janet", "rachel", "catherine", "maria", "frances", "ann", "kathryn", "sara", "janice", "jean",
-        "alice", "madison", "doris", "abigail", "julia", "judy", "grace", "denise", "amber", "marilyn",
-        "beverly", "danielle", "theresa", "sophia", "marie", "diana", "brittany", "natalie", "florence", "rose",
-        "alexis", "kayla", "lauren", "lillian", "audrey", "eva", "lucy", "carolyn", "gabrielle", "avery",
-        "chloe", "ella", "aria", "scarlett", "zoey", "penelope", "layla", "nora", "lily", "eleanor"
-    }
-    
-    if first_name_lower in male_names:
+    if first_name_lower in _MALE_NAMES:
         return "male"
-    elif first_name_lower in female_names:
+    elif first_name_lower in _FEMALE_NAMES:
         return "female"
     
     # Additional pattern-based inference (less reliable)
     # Some name endings are more common for one gender
-    if first_name_lower.endswith(("a", "ia", "ella", "ella", "ette", "ine")):
-        return "female"  # Common female endings
-    elif first_name_lower.endswith(("er", "on", "en", "an", "el")):
-        return "male"  # Common male endings (less reliable)
-    
-    return None
+    # (female endings first, male endings less reliable)
+    return _gender_from_ending(first_name_lower)
 
 
 def _normalize_country(location_text: str) -> Optional[str]:
@@ -336,51 +788,23 @@ def _normalize_country(location_text: str) -> Optional[str]:
     
     location_lower = location_text.lower().strip()
     
-    # Country name mappings (common variations)
-    country_mappings = {
-        "usa": "United States", "us": "United States", "united states": "United States", "america": "United States",
-        "uk": "United Kingdom", "united kingdom": "United Kingdom", "england": "United Kingdom", "britain": "United Kingdom",
-        "canada": "Canada", "ca": "Canada",
-        "australia": "Australia", "au": "Australia",
-        "germany": "Germany", "de": "Germany", "deutschland": "Germany",
-        "france": "France", "fr": "France",
-        "spain": "Spain", "es": "Spain", "espana": "Spain",
-        "italy": "Italy", "it": "Italy", "italia": "Italy",
-        "japan": "Japan", "jp": "Japan",
-        "south korea": "South Korea", "korea": "South Korea", "kr": "South Korea",
-        "china": "China", "cn": "China",
-        "india": "India", "in": "India",
-        "brazil": "Brazil", "br": "Brazil", "brasil": "Brazil",
-        "mexico": "Mexico", "mx": "Mexico",
-        "netherlands": "Netherlands", "nl": "Netherlands", "holland": "Netherlands",
-        "sweden": "Sweden", "se": "Sweden",
-        "norway": "Norway", "no": "Norway",
-        "denmark": "Denmark", "dk": "Denmark",
-        "poland": "Poland", "pl": "Poland",
-        "russia": "Russia", "ru": "Russia",
-        "turkey": "Turkey", "tr": "Turkey",
-        "saudi arabia": "Saudi Arabia", "sa": "Saudi Arabia",
-        "uae": "United Arab Emirates", "united arab emirates": "United Arab Emirates",
-        "south africa": "South Africa", "za": "South Africa",
-        "nigeria": "Nigeria", "ng": "Nigeria",
-        "egypt": "Egypt", "eg": "Egypt",
-        "kenya": "Kenya", "ke": "Kenya",
-        "philippines": "Philippines", "ph": "Philippines",
-        "thailand": "Thailand", "th": "Thailand",
-        "vietnam": "Vietnam", "vn": "Vietnam",
-        "indonesia": "Indonesia", "id": "Indonesia",
-        "malaysia": "Malaysia", "my": "Malaysia",
-        "singapore": "Singapore", "sg": "Singapore"
-    }
-    
     # Direct match
-    if location_lower in country_mappings:
-        return country_mappings[location_lower]
-    
-    # Partial match (location contains country name)
-    for key, country in country_mappings.items():
-        if key in location_lower or location_lower in key:
-            return country
+    if location_lower in _COUNTRY_MAP:
+        return _COUNTRY_MAP[location_lower]
+    
+    # Partial match (location contains country name, or is part of one);
+    # the earliest entry in _COUNTRY_MAP wins
+    if _COUNTRY_AC is not None:
+        best = _COUNTRY_KEY_SUBSTRINGS.get(location_lower)
+        for _, rank in _COUNTRY_AC.iter(location_lower):
+            if best is None or rank < best:
+                best = rank
+        if best is not None:
+            return _COUNTRY_ITEMS[best][1]
+    else:
+        for key, country in _COUNTRY_ITEMS:
+            if key in location_lower or location_lower in key:
+                return country
     
     # Return original if no match found (might be a city)
     return location_text
@@ -395,17 +819,19 @@ def _gather_osint_data(username: str) -> Dict:
     }
     
     # Analyze username patterns
-    if re.match(r'^[a-z0-9]+$', username):
+    traits = _OSINT_RE.match(username)
+    length = len(username)
+    if traits["alnum"] is not None:
         osint["username_patterns"].append("alphanumeric_only")
-    if re.match(r'^[a-z]+[0-9]+$', username):
+    if traits["letters_then_numbers"] is not None:
         osint["username_patterns"].append("letters_then_numbers")
-    if len(username) < 6:
+    if length < 6:
         osint["username_patterns"].append("short_username")
-    if len(username) > 20:
+    if length > 20:
         osint["username_patterns"].append("long_username")
     
     # Check for common patterns that might indicate automated accounts
-    if re.search(r'(bot|admin|support|official)', username, re.I):
+    if traits["official"] is not None:
         osint["potential_connections"].append("may_be_official_account")
     
     return osint
@@ -423,13 +849,8 @@ def _check_handle_threat_intel(username: str) -> Dict:
     }
     
     # Check for suspicious patterns
-    suspicious_patterns = [
-        r'^[0-9]{6,}$',  # All numbers
-        r'^[a-z]{1,3}[0-9]{4,}$',  # Very short prefix + numbers
-    ]
-    
-    for pattern in suspicious_patterns:
-        if re.match(pattern, username):
+    for pattern in _SUSPICIOUS_RES:
+        if pattern.match(username):
             threat_data["is_suspicious"] = True
             threat_data["notes"].append("Matches suspicious username pattern")
             break
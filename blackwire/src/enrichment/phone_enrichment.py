@@ -2,203 +2,418 @@
 
 import os
 import re
+import json
+import logging
+import asyncio
+import threading
 import requests
 import phonenumbers
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional
 from phonenumbers import geocoder, carrier, timezone
 from dotenv import load_dotenv
+from urllib3.util.retry import Retry
 
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.utils.rate_limiter import check_rate_limit, record_api_request, get_api_remaining
-from src.utils.retry import retry_with_backoff
 from src.utils.logger import logger
 from src.utils.config import Config
+from src.utils.http_session import create_session
+from src.utils.cache import TTLCache
+from src.utils.disk_cache import get_disk_cached, set_disk_cached
 
-load_dotenv()
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+    aiohttp = None
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
 
-def enrich_phone(phone_number: str) -> Dict:
+# JSON decoder for API responses (accepts bytes or str)
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+try:
+    from src.enrichment.community_lists import check_phone_against_community_lists
+except Exception:
+    check_phone_against_community_lists = None
+
+# Config already loads .env on import; only touch the file again if no key made it into the environment
+if not os.getenv("NUMLOOKUP_API_KEY") and not getattr(Config, "IPAPI_KEY", None):
+    load_dotenv()
+
+# API keys, resolved once at import (see refresh_api_keys)
+_NUMLOOKUP_KEY = os.getenv("NUMLOOKUP_API_KEY", "")
+_IPAPI_KEY = getattr(Config, "IPAPI_KEY", "")
+
+# Shared keep-alive session for numlookupapi.com and ipapi.co; throttled (429)
+# and 5xx responses are retried by urllib3, waiting as long as Retry-After asks
+_HTTP_RETRY = Retry(
+    total=2,
+    backoff_factor=1.0,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset(["GET"]),
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+SESSION = create_session(pool_connections=4, pool_maxsize=32, max_retries=_HTTP_RETRY)
+SESSION.headers["Accept"] = "application/json"
+
+# Line types that indicate a VOIP number, and readable names for result["number_type"]
+_VOIP_TYPES = frozenset({phonenumbers.PhoneNumberType.VOIP, phonenumbers.PhoneNumberType.VOICEMAIL})
+_TYPE_NAME = {v: k for k, v in vars(phonenumbers.PhoneNumberType).items() if isinstance(v, int)}
+
+# VOIP providers recognised in carrier names, matched case-insensitively in one scan
+_VOIP_CANON = {name.lower(): name for name in ("Twilio", "Bandwidth", "Vonage", "RingCentral", "Google Voice")}
+_VOIP_RE = re.compile("(" + "|".join(re.escape(name) for name in _VOIP_CANON) + ")", re.IGNORECASE)
+
+# Regions tried, in order, for numbers without a country code
+_DEFAULT_REGIONS = ("US", "CA", "GB", "AU", "MX")
+
+# Separators stripped from user input before parsing
+_CLEAN_TABLE = str.maketrans("", "", " \t\r\n\f\v-().")
+
+# Finished results per E.164 number, in memory and on disk (spares the API quota on repeats)
+_PHONE_CACHE = TTLCache(maxsize=50000, ttl_seconds=86400)
+_PHONE_DISK_TTL_HOURS = 24
+
+# Runs the numlookupapi.com and ipapi.com lookups side by side (sized to the session pool)
+_lookup_pool = ThreadPoolExecutor(max_workers=32)
+
+
+def enrich_phone(phone_number: str, force_remote: bool = False) -> Dict:
     """
     Enrich a phone number with VOIP provider, carrier, and location data.
     
+    The numlookupapi.com and ipapi.com lookups run side by side on the
+    shared keep-alive session, and are skipped when phonenumbers already
+    identifies a non-VOIP number's carrier and line type. Results are cached
+    per E.164 number for a day, unless a wanted remote lookup failed.
+    
     Args:
         phone_number: Phone number in E.164 format or any format
+        force_remote: Always run the remote lookups (bypasses the result cache)
         
     Returns:
         Dictionary containing enrichment data
     """
-    result = {
-        "phone_number": phone_number,
-        "formatted": None,
-        "country_code": None,
-        "country": None,
-        "carrier": None,
-        "voip_provider": None,
-        "is_voip": False,
-        "timezone": None,
-        "is_valid": False,
-        "number_type": None,
-        "raw_data": {},
-        "errors": []
-    }
+    return _enrich_phone(phone_number, force_remote=force_remote)
+
+
+def enrich_phones_bulk(numbers: List[str], max_workers: int = 16, force_remote: bool = False) -> List[Dict]:
+    """
+    Enrich many phone numbers concurrently.
     
-    try:
-        # Clean up phone number
-        phone_clean = re.sub(r'[\s\-\(\)\.]', '', phone_number.strip())
+    ipapi.com calls are capped at the quota remaining when the batch starts,
+    so a burst of workers cannot overshoot the monthly limit. Numbers seen in
+    the last day are served from the result cache.
+    
+    Args:
+        numbers: Phone numbers in any format
+        max_workers: Maximum numbers enriched at once
+        force_remote: Always run the remote lookups
         
-        # Try parsing with different approaches
-        # PRIORITY: Try +1 (US/Canada) FIRST for 10-digit numbers (99% of cases)
-        parsed = None
+    Returns:
+        List of enrichment results, in the same order as numbers
+    """
+    remaining = get_api_remaining("ipapi.com")
+    ipapi_slots = threading.Semaphore(remaining) if remaining is not None else None
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(lambda number: _enrich_phone(number, ipapi_slots, force_remote), numbers))
+
+
+def refresh_api_keys() -> None:
+    """Re-read the numlookupapi.com and ipapi.com keys from the environment."""
+    global _NUMLOOKUP_KEY, _IPAPI_KEY
+    load_dotenv()
+    _NUMLOOKUP_KEY = os.getenv("NUMLOOKUP_API_KEY", "")
+    _IPAPI_KEY = os.getenv("IPAPI_KEY", getattr(Config, "IPAPI_KEY", ""))
+
+
+def _enrich_phone(phone_number: str, ipapi_slots: Optional[threading.Semaphore] = None,
+                  force_remote: bool = False) -> Dict:
+    """enrich_phone, optionally drawing ipapi.com calls from a shared budget of slots."""
+    result = _new_phone_result(phone_number)
+    phone_clean = phone_number.strip().translate(_CLEAN_TABLE)
+    
+    _parse_phone(result, phone_number, phone_clean)
+    
+    if result["formatted"] and not force_remote:
+        cached = _load_cached_phone(phone_number, result["formatted"])
+        if cached is not None:
+            return _apply_community_lists(cached, phone_number)
+    
+    # Whether every remote lookup that was wanted ran and returned data
+    complete = True
+    
+    # Enhanced lookup with free APIs
+    if result["is_valid"] and result["formatted"] and (force_remote or _needs_remote_lookup(result)):
+        try:
+            api_key, ipapi_key, use_ipapi = _remote_lookup_plan(ipapi_slots)
+            complete = use_ipapi or not ipapi_key
+            numlookup_future = _lookup_pool.submit(lookup_numlookupapi, result["formatted"], api_key) if api_key else None
+            ipapi_future = _lookup_pool.submit(lookup_ipapi, result["formatted"], ipapi_key) if use_ipapi else None
+            
+            if numlookup_future is not None:
+                try:
+                    numlookup_data = numlookup_future.result()
+                    _apply_numlookup_data(result, numlookup_data)
+                    complete = complete and numlookup_data is not None
+                except Exception:
+                    complete = False  # API lookup failed, continue with basic data
+            
+            if ipapi_future is not None:
+                try:
+                    ipapi_data = ipapi_future.result()
+                    _apply_ipapi_data(result, ipapi_data)
+                    complete = complete and ipapi_data is not None
+                except Exception as e:
+                    complete = False
+                    _log_ipapi_failure(e)
+            elif ipapi_key:
+                _log_ipapi_rate_limited()
+        except Exception as e:
+            complete = False
+            _record_unexpected_error(result, phone_number, e)
+    
+    result = _finish_phone_result(result, phone_clean)
+    if complete:
+        _store_cached_phone(result)
+    return _apply_community_lists(result, phone_number)
+
+
+async def enrich_phone_async(phone_number: str, session=None, force_remote: bool = False) -> Dict:
+    """
+    Async version of enrich_phone; the remote lookups are awaited concurrently.
+    
+    Args:
+        phone_number: Phone number in E.164 format or any format
+        session: Optional aiohttp.ClientSession to reuse (one is opened and closed otherwise)
+        force_remote: Always run the remote lookups
         
-        # Strategy 1: If it's a 10-digit number without +, assume +1 (US/Canada) - MOST COMMON CASE
-        if len(phone_clean) == 10 and not phone_clean.startswith("+"):
-            try:
-                test_number = "+1" + phone_clean
-                parsed = phonenumbers.parse(test_number, None)
-                if phonenumbers.is_valid_number(parsed):
-                    logger.debug(f"Parsed {phone_number} by auto-adding +1 (US/Canada)")
-            except phonenumbers.NumberParseException:
-                pass
+    Returns:
+        Dictionary containing enrichment data (same shape as enrich_phone)
+    """
+    if not AIOHTTP_AVAILABLE:
+        return await asyncio.get_running_loop().run_in_executor(None, enrich_phone, phone_number, force_remote)
+    
+    return await _enrich_phone_async(phone_number, session, force_remote)
+
+
+async def enrich_phones_bulk_async(numbers: List[str], max_concurrency: int = 32,
+                                   force_remote: bool = False) -> List[Dict]:
+    """
+    Async version of enrich_phones_bulk.
+    
+    All lookups share one aiohttp session, so up to max_concurrency requests
+    are in flight at once over reused keep-alive connections instead of one
+    round trip per number. ipapi.com calls are capped at the quota remaining
+    when the batch starts.
+    
+    Args:
+        numbers: Phone numbers in any format
+        max_concurrency: Maximum numbers enriched at once
+        force_remote: Always run the remote lookups
         
-        # Strategy 2: If it's 11 digits starting with 1, try adding +
-        if (not parsed or not phonenumbers.is_valid_number(parsed)) and phone_clean.startswith("1") and len(phone_clean) == 11:
-            try:
-                test_number = "+" + phone_clean
-                parsed = phonenumbers.parse(test_number, None)
-                if phonenumbers.is_valid_number(parsed):
-                    logger.debug(f"Parsed {phone_number} by adding + to 1-prefixed number")
-            except phonenumbers.NumberParseException:
-                pass
+    Returns:
+        List of enrichment results, in the same order as numbers
+    """
+    if not AIOHTTP_AVAILABLE:
+        return await asyncio.get_running_loop().run_in_executor(
+            None, lambda: enrich_phones_bulk(numbers, max_concurrency, force_remote)
+        )
+    
+    remaining = get_api_remaining("ipapi.com")
+    ipapi_slots = threading.Semaphore(remaining) if remaining is not None else None
+    in_flight = asyncio.Semaphore(max_concurrency)
+    
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=max_concurrency, limit_per_host=max_concurrency, ttl_dns_cache=300),
+        headers={"Accept": "application/json"}
+    ) as session:
+        async def enrich_one(number: str) -> Dict:
+            async with in_flight:
+                return await _enrich_phone_async(number, session, force_remote, ipapi_slots)
         
-        # Strategy 3: Try parsing without region (if it has explicit country code like +44, +33, etc.)
-        if not parsed or not phonenumbers.is_valid_number(parsed):
-            try:
-                parsed = phonenumbers.parse(phone_number, None)
-                if phonenumbers.is_valid_number(parsed):
-                    logger.debug(f"Parsed {phone_number} with explicit country code")
+        return list(await asyncio.gather(*(enrich_one(number) for number in numbers)))
+
+
+async def _enrich_phone_async(phone_number: str, session=None, force_remote: bool = False,
+                              ipapi_slots: Optional[threading.Semaphore] = None) -> Dict:
+    """enrich_phone_async, optionally drawing ipapi.com calls from a shared budget of slots."""
+    result = _new_phone_result(phone_number)
+    phone_clean = phone_number.strip().translate(_CLEAN_TABLE)
+    
+    _parse_phone(result, phone_number, phone_clean)
+    
+    if result["formatted"] and not force_remote:
+        cached = _load_cached_phone(phone_number, result["formatted"])
+        if cached is not None:
+            return _apply_community_lists(cached, phone_number)
+    
+    # Whether every remote lookup that was wanted ran and returned data
+    complete = True
+    
+    # Enhanced lookup with free APIs
+    if result["is_valid"] and result["formatted"] and (force_remote or _needs_remote_lookup(result)):
+        own_session = session is None
+        if own_session:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, limit_per_host=20, ttl_dns_cache=300),
+                headers={"Accept": "application/json"}
+            )
+        try:
+            api_key, ipapi_key, use_ipapi = _remote_lookup_plan(ipapi_slots)
+            complete = use_ipapi or not ipapi_key
+            numlookup_task = asyncio.ensure_future(
+                lookup_numlookupapi_async(session, result["formatted"], api_key)
+            ) if api_key else None
+            ipapi_task = asyncio.ensure_future(
+                lookup_ipapi_async(session, result["formatted"], ipapi_key)
+            ) if use_ipapi else None
+            
+            await asyncio.gather(*[t for t in (numlookup_task, ipapi_task) if t is not None],
+                                 return_exceptions=True)
+            
+            if numlookup_task is not None:
+                if numlookup_task.exception() is None:
+                    _apply_numlookup_data(result, numlookup_task.result())
+                    complete = complete and numlookup_task.result() is not None
                 else:
-                    parsed = None
-            except phonenumbers.NumberParseException:
-                parsed = None
-        
-        # Strategy 4: Try with common default regions (US, CA, GB, AU, MX)
-        default_regions = ["US", "CA", "GB", "AU", "MX"]
-        if not parsed or not phonenumbers.is_valid_number(parsed):
-            for region in default_regions:
-                try:
-                    test_parsed = phonenumbers.parse(phone_number, region)
-                    if phonenumbers.is_valid_number(test_parsed):
-                        parsed = test_parsed
-                        logger.debug(f"Parsed {phone_number} using default region: {region}")
-                        break
-                except phonenumbers.NumberParseException:
-                    continue
+                    complete = False
+            
+            if ipapi_task is not None:
+                if ipapi_task.exception() is None:
+                    _apply_ipapi_data(result, ipapi_task.result())
+                    complete = complete and ipapi_task.result() is not None
+                else:
+                    complete = False
+                    _log_ipapi_failure(ipapi_task.exception())
+            elif ipapi_key:
+                _log_ipapi_rate_limited()
+        except Exception as e:
+            complete = False
+            _record_unexpected_error(result, phone_number, e)
+        finally:
+            if own_session:
+                await session.close()
+    
+    result = _finish_phone_result(result, phone_clean)
+    if complete:
+        _store_cached_phone(result)
+    return _apply_community_lists(result, phone_number)
+
+
+def _load_cached_phone(phone_number: str, e164: str) -> Optional[Dict]:
+    """Cached result for e164 (memory, then disk), relabelled with the caller's input."""
+    cached = _PHONE_CACHE.get(e164)
+    if cached is None:
+        cached = get_disk_cached("phone", e164)
+        if cached is None:
+            return None
+        _PHONE_CACHE.set(e164, dict(cached))
+    
+    result = dict(cached)
+    result["phone_number"] = phone_number
+    return result
+
+
+def _store_cached_phone(result: Dict) -> None:
+    """
+    Cache a finished result for a valid number.
+    
+    Only called when every wanted remote lookup succeeded, and before the
+    community list check, which is re-run on every cache hit.
+    """
+    if result.get("formatted") and not result.get("errors"):
+        _PHONE_CACHE.set(result["formatted"], dict(result))
+        set_disk_cached("phone", result["formatted"], result, ttl_hours=_PHONE_DISK_TTL_HOURS)
+
+
+def _needs_remote_lookup(result: Dict) -> bool:
+    """Whether the remote APIs could add to what phonenumbers found (VOIP, no carrier or unknown line type)."""
+    return (
+        result.get("is_voip")
+        or not result.get("carrier")
+        or result.get("number_type") == "UNKNOWN"
+    )
+
+
+# Shape of an enrich_phone result; mutable fields are filled in per copy
+_RESULT_TEMPLATE = {
+    "phone_number": None,
+    "formatted": None,
+    "country_code": None,
+    "country": None,
+    "carrier": None,
+    "voip_provider": None,
+    "is_voip": False,
+    "timezone": None,
+    "is_valid": False,
+    "number_type": None,
+    "raw_data": None,
+    "errors": None
+}
+
+
+def _new_phone_result(phone_number: str) -> Dict:
+    result = _RESULT_TEMPLATE.copy()
+    result["phone_number"] = phone_number
+    result["raw_data"] = {}
+    result["errors"] = []
+    return result
+
+
+def _parse_phone(result: Dict, phone_number: str, phone_clean: str) -> None:
+    """Parse phone_number (phone_clean is it with separators stripped) and fill in the library-derived fields of result."""
+    try:
+        parsed, valid = _try_parse(phone_number, phone_clean)
         
-        if parsed and phonenumbers.is_valid_number(parsed):
+        if valid:
             result["is_valid"] = True
             result["formatted"] = phonenumbers.format_number(
                 parsed, phonenumbers.PhoneNumberFormat.E164
             )
+            number_key = _number_key(parsed)
             result["country_code"] = parsed.country_code
-            result["country"] = geocoder.description_for_number(parsed, "en")
-            result["carrier"] = carrier.name_for_number(parsed, "en")
-            result["timezone"] = timezone.time_zones_for_number(parsed)
+            result["country"] = _geocode(number_key)
+            carrier_name = _carrier_name(number_key) or ""
+            result["carrier"] = carrier_name
+            result["timezone"] = _time_zones(number_key)
             
             # Detect if it's a VOIP number
-            number_type = phonenumbers.number_type(parsed)
-            result["number_type"] = str(number_type)
+            number_type = _number_type(number_key)
+            result["number_type"] = _TYPE_NAME.get(number_type, "UNKNOWN")
             
-            # Common VOIP indicators
-            voip_indicators = [
-                phonenumbers.PhoneNumberType.VOIP,
-                phonenumbers.PhoneNumberType.VOICEMAIL
-            ]
-            
-            if number_type in voip_indicators:
+            if number_type in _VOIP_TYPES:
                 result["is_voip"] = True
-                result["voip_provider"] = carrier.name_for_number(parsed, "en") or "Unknown VOIP"
+                result["voip_provider"] = carrier_name or "Unknown VOIP"
             
             # Try to identify VOIP provider from carrier
-            carrier_name = carrier.name_for_number(parsed, "en") or ""
-            known_voip_providers = ["Twilio", "Bandwidth", "Vonage", "RingCentral", "Google Voice"]
-            
-            for provider in known_voip_providers:
-                if provider.lower() in carrier_name.lower():
-                    result["voip_provider"] = provider
-                    result["is_voip"] = True
-                    break
+            voip_match = _VOIP_RE.search(carrier_name)
+            if voip_match:
+                result["voip_provider"] = _VOIP_CANON[voip_match.group(1).lower()]
+                result["is_voip"] = True
         # Only add errors if we couldn't parse AND have no formatted number
         # Don't show errors if we successfully parsed (even if it was after trying +1)
-        if (not parsed or not phonenumbers.is_valid_number(parsed)) and not result.get("formatted"):
+        if not valid and not result.get("formatted"):
             # Only show error if we truly couldn't parse it
             if not parsed:
                 result["errors"].append(f"Could not parse phone number: {phone_number}. Please use E.164 format (e.g., +14165551234) or 10-digit US/Canada format.")
-            elif not phonenumbers.is_valid_number(parsed):
+            else:
                 result["errors"].append(f"Phone number format is invalid: {phone_number}. Please use E.164 format (e.g., +14165551234) or 10-digit US/Canada format.")
         
-        # Enhanced lookup with free APIs
-        if result["is_valid"] and result["formatted"]:
-            # Try numlookupapi.com (free tier: 100 requests/month)
-            api_key = os.getenv("NUMLOOKUP_API_KEY", "")
-            if api_key:
-                try:
-                    numlookup_data = lookup_numlookupapi(result["formatted"], api_key)
-                    if numlookup_data:
-                        result.update(numlookup_data)
-                except:
-                    pass  # API lookup failed, continue with basic data
-            
-            # Try ipapi.com phone lookup FIRST (free tier: 1000 requests/month)
-            # Use provided key (default) or check environment variable
-            ipapi_key = Config.IPAPI_KEY
-            
-            if ipapi_key and check_rate_limit("ipapi.com"):
-                try:
-                    ipapi_data = lookup_ipapi(result["formatted"], ipapi_key)
-                    record_api_request("ipapi.com")  # Record successful request
-                    if ipapi_data:
-                        # Merge data, prefer API results over library results
-                        if ipapi_data.get("carrier"):
-                            result["carrier"] = ipapi_data["carrier"]
-                        if ipapi_data.get("line_type"):
-                            line_type = ipapi_data["line_type"].upper()
-                            if "VOIP" in line_type:
-                                result["is_voip"] = True
-                                result["voip_provider"] = ipapi_data.get("carrier") or result.get("voip_provider")
-                            result["line_type"] = line_type
-                        if ipapi_data.get("country_code"):
-                            result["country_code"] = ipapi_data["country_code"]
-                        if ipapi_data.get("country_name"):
-                            result["country"] = ipapi_data["country_name"]
-                        if ipapi_data.get("location"):
-                            result["location"] = ipapi_data["location"]
-                        if ipapi_data.get("timezone"):
-                            result["timezone"] = ipapi_data["timezone"]
-                    else:
-                        # If ipapi returned None (rate limit, error, etc.), we already have fallback data from phonenumbers
-                        remaining = get_api_remaining("ipapi.com")
-                        if remaining is not None:
-                            logger.debug(f"ipapi.com returned no data, {remaining} requests remaining")
-                except Exception as e:
-                    # API lookup failed (rate limit, network error, etc.)
-                    # Continue with library-based data - this is fine, we have fallback
-                    error_msg = str(e)
-                    if "rate limit" in error_msg.lower() or "429" in error_msg or "quota" in error_msg.lower():
-                        logger.warning(f"ipapi.com rate limit/quota reached for the month, using phonenumbers library fallback")
-                    else:
-                        logger.debug(f"ipapi.com lookup failed, using fallback: {error_msg}")
-                    # Continue with phonenumbers library data (already populated above)
-            elif ipapi_key:
-                # Rate limited - skip API call
-                remaining = get_api_remaining("ipapi.com")
-                if remaining is not None and remaining == 0:
-                    logger.debug(f"ipapi.com rate limited (0 remaining), using phonenumbers library fallback")
-        
-    except phonenumbers.NumberParseException as e:
-        result["errors"] = [str(e)]
     except phonenumbers.NumberParseException as e:
         error_msg = str(e)
         if "INVALID_COUNTRY_CODE" in error_msg or "Missing or invalid default region" in error_msg:
@@ -209,10 +424,191 @@ def enrich_phone(phone_number: str) -> Dict:
             result["errors"].append(f"Phone parsing error: {error_msg}")
         logger.warning(f"Phone parsing failed for {phone_number}: {error_msg}")
     except Exception as e:
-        error_msg = str(e)
-        result["errors"] = [error_msg]
-        logger.error(f"Unexpected error enriching phone {phone_number}: {error_msg}", exc_info=True)
+        _record_unexpected_error(result, phone_number, e)
+
+
+def _try_parse(phone_number: str, phone_clean: str):
+    """
+    Return (parsed, is_valid) for the first valid parse of phone_number, or (None, False).
+    
+    Dispatches on the shape of phone_clean so the common cases cost a single
+    parse; later strategies only run when the earlier ones gave no valid number.
+    """
+    n = len(phone_clean)
+    starts_plus = phone_clean.startswith("+")
+    
+    # Strategy 1: 10 digits without +, assume +1 (US/Canada) - MOST COMMON CASE
+    if n == 10 and not starts_plus:
+        parsed, valid = _parse_cached("+1" + phone_clean, None)
+        if valid:
+            logger.debug("Parsed %s by auto-adding +1 (US/Canada)", phone_number)
+            return parsed, True
+    # Strategy 2: 11 digits starting with 1, add +
+    elif n == 11 and phone_clean[0] == "1":
+        parsed, valid = _parse_cached("+" + phone_clean, None)
+        if valid:
+            logger.debug("Parsed %s by adding + to 1-prefixed number", phone_number)
+            return parsed, True
+    
+    # Strategy 3: Parse without region (explicit country code like +44, +33, etc.)
+    parsed, valid = _parse_cached(phone_number, None)
+    if valid:
+        logger.debug("Parsed %s with explicit country code", phone_number)
+        return parsed, True
+    
+    # Strategy 4: Try with common default regions (US, CA, GB, AU, MX);
+    # the region is ignored once a number carries a + country code
+    if not starts_plus:
+        region = next((r for r in _DEFAULT_REGIONS if _parse_cached(phone_number, r)[1]), None)
+        if region:
+            logger.debug("Parsed %s using default region: %s", phone_number, region)
+            return _parse_cached(phone_number, region)
+    
+    return None, False
+
+
+@lru_cache(maxsize=8192)
+def _parse_cached(text: str, region: Optional[str]):
+    """
+    Parse and validate a number once per (text, region).
+    
+    Returns:
+        Tuple of (PhoneNumber or None if unparseable, whether it is a valid number).
+        The PhoneNumber is shared between callers and must not be modified.
+    """
+    try:
+        parsed = phonenumbers.parse(text, region)
+    except phonenumbers.NumberParseException:
+        return None, False
+    return parsed, phonenumbers.is_valid_number(parsed)
+
+
+def _number_key(parsed) -> tuple:
+    """
+    Hashable key for the PhoneNumber fields the metadata lookups depend on.
+    
+    (Not the E.164 string: re-parsing it can land on a different national
+    number, e.g. Mexican numbers dialled with the old mobile 1 prefix.)
+    """
+    return (parsed.country_code, parsed.national_number,
+            parsed.italian_leading_zero, parsed.number_of_leading_zeros)
+
+
+def _number_from_key(number_key: tuple):
+    country_code, national_number, italian_leading_zero, number_of_leading_zeros = number_key
+    return phonenumbers.PhoneNumber(
+        country_code=country_code,
+        national_number=national_number,
+        italian_leading_zero=italian_leading_zero,
+        number_of_leading_zeros=number_of_leading_zeros
+    )
+
+
+# phonenumbers metadata lookups, memoized per number (geocoder/carrier prefixes
+# vary in length, so a fixed-length prefix would not be an exact key)
+@lru_cache(maxsize=4096)
+def _geocode(number_key: tuple) -> str:
+    return geocoder.description_for_number(_number_from_key(number_key), "en")
+
+
+@lru_cache(maxsize=4096)
+def _carrier_name(number_key: tuple) -> str:
+    return carrier.name_for_number(_number_from_key(number_key), "en")
+
+
+@lru_cache(maxsize=4096)
+def _time_zones(number_key: tuple) -> tuple:
+    return timezone.time_zones_for_number(_number_from_key(number_key))
+
+
+@lru_cache(maxsize=4096)
+def _number_type(number_key: tuple) -> int:
+    return phonenumbers.number_type(_number_from_key(number_key))
+
+
+def _record_unexpected_error(result: Dict, phone_number: str, error: Exception) -> None:
+    error_msg = str(error)
+    result["errors"].append(error_msg)
+    # Tracebacks only when debugging; formatting them is costly in bulk runs
+    logger.error("Unexpected error enriching phone %s: %s", phone_number, error_msg,
+                 exc_info=logger.isEnabledFor(logging.DEBUG))
+
+
+def _remote_lookup_plan(ipapi_slots: Optional[threading.Semaphore] = None):
+    """
+    Decide which remote lookups to run.
+    
+    Args:
+        ipapi_slots: Optional batch budget; an ipapi.com call needs a free slot
+    
+    Returns:
+        Tuple of (numlookupapi key, ipapi key, whether ipapi may be called now)
+    """
+    # Try numlookupapi.com (free tier: 100 requests/month)
+    api_key = _NUMLOOKUP_KEY
+    
+    # Try ipapi.com phone lookup FIRST (free tier: 1000 requests/month)
+    ipapi_key = _IPAPI_KEY
     
+    use_ipapi = bool(ipapi_key and check_rate_limit("ipapi.com"))
+    if use_ipapi and ipapi_slots is not None:
+        use_ipapi = ipapi_slots.acquire(blocking=False)
+    
+    return api_key, ipapi_key, use_ipapi
+
+
+def _apply_numlookup_data(result: Dict, numlookup_data: Optional[Dict]) -> None:
+    if numlookup_data:
+        result.update(numlookup_data)
+
+
+def _apply_ipapi_data(result: Dict, ipapi_data: Optional[Dict]) -> None:
+    """Record a completed ipapi.com request and merge its data into result."""
+    record_api_request("ipapi.com")  # Record successful request
+    if ipapi_data:
+        # Merge data, prefer API results over library results
+        if ipapi_data.get("carrier"):
+            result["carrier"] = ipapi_data["carrier"]
+        if ipapi_data.get("line_type"):
+            line_type = ipapi_data["line_type"].upper()
+            if "VOIP" in line_type:
+                result["is_voip"] = True
+                result["voip_provider"] = ipapi_data.get("carrier") or result.get("voip_provider")
+            result["line_type"] = line_type
+        if ipapi_data.get("country_code"):
+            result["country_code"] = ipapi_data["country_code"]
+        if ipapi_data.get("country_name"):
+            result["country"] = ipapi_data["country_name"]
+        if ipapi_data.get("location"):
+            result["location"] = ipapi_data["location"]
+        if ipapi_data.get("timezone"):
+            result["timezone"] = ipapi_data["timezone"]
+    else:
+        # If ipapi returned None (rate limit, error, etc.), we already have fallback data from phonenumbers
+        remaining = get_api_remaining("ipapi.com")
+        if remaining is not None:
+            logger.debug("ipapi.com returned no data, %s requests remaining", remaining)
+
+
+def _log_ipapi_failure(error: BaseException) -> None:
+    # API lookup failed (rate limit, network error, etc.)
+    # Continue with library-based data - this is fine, we have fallback
+    error_msg = str(error)
+    if "rate limit" in error_msg.lower() or "429" in error_msg or "quota" in error_msg.lower():
+        logger.warning(f"ipapi.com rate limit/quota reached for the month, using phonenumbers library fallback")
+    else:
+        logger.debug("ipapi.com lookup failed, using fallback: %s", error_msg)
+
+
+def _log_ipapi_rate_limited() -> None:
+    # Rate limited - skip API call
+    remaining = get_api_remaining("ipapi.com")
+    if remaining is not None and remaining == 0:
+        logger.debug("ipapi.com rate limited (0 remaining), using phonenumbers library fallback")
+
+
+def _finish_phone_result(result: Dict, phone_clean: str) -> Dict:
+    """Tidy up errors (only kept, with a country code tip, when the number could not be parsed)."""
     # Only show errors if we have NO results at all (no formatted number, no data)
     # If we successfully parsed and got data, clear any errors
     if result.get("formatted") or result.get("is_valid"):
@@ -222,22 +618,26 @@ def enrich_phone(phone_number: str) -> Dict:
     # Only show error guidance if we truly have no results
     if result["errors"] and not result.get("formatted"):
         # Check if it looks like it might need a country code
-        phone_clean = re.sub(r'[\s\-\(\)\.]', '', phone_number.strip())
         if len(phone_clean) == 10 or (len(phone_clean) == 11 and phone_clean.startswith("1")):
             result["errors"].append("💡 Tip: For US/Canada numbers, try adding +1 at the start (e.g., +15198000997)")
     
+    return result
+
+
+def _apply_community_lists(result: Dict, phone_number: str) -> Dict:
+    """Add community scam list matches (checked on every call, so list updates show up on cached numbers)."""
     # Check against community scam lists (free, no API key needed)
+    if check_phone_against_community_lists is None:
+        return result
     try:
-        from src.enrichment.community_lists import check_phone_against_community_lists
         community_check = check_phone_against_community_lists(phone_number)
         if community_check and community_check.get("found"):
-            if not result.get("threat_intel"):
-                result["threat_intel"] = {}
-            result["threat_intel"]["community_list"] = community_check
+            # New dict, so a threat_intel shared with a cached copy is not modified
+            result["threat_intel"] = {**(result.get("threat_intel") or {}), "community_list": community_check}
             result["is_scam"] = True
             result["threat_level"] = "high"
     except Exception as e:
-        logger.debug(f"Community list check failed: {e}")
+        logger.debug("Community list check failed: %s", e)
     
     return result
 
@@ -247,10 +647,10 @@ def lookup_numlookupapi(phone: str, api_key: str) -> Optional[Dict]:
     try:
         url = f"https://api.numlookupapi.com/v1/validate/{phone}"
         params = {"apikey": api_key}
-        response = requests.get(url, params=params, timeout=10)
+        response = SESSION.get(url, params=params, timeout=10)
         
         if response.status_code == 200:
-            data = response.json()
+            data = _json_loads(response.content)
             if data.get("valid"):
                 return {
                     "carrier": data.get("carrier"),
@@ -260,29 +660,28 @@ def lookup_numlookupapi(phone: str, api_key: str) -> Optional[Dict]:
                     "location": data.get("location")
                 }
     except Exception as e:
-        print(f"NumLookupAPI lookup failed: {e}")
+        logger.debug("NumLookupAPI lookup failed: %s", e)
     
     return None
 
 
-@retry_with_backoff(max_retries=2, base_delay=1.0)
 def lookup_ipapi(phone: str, api_key: str) -> Optional[Dict]:
     """
     Lookup phone using ipapi.com (FREE tier: 1000/month).
     Falls back gracefully if rate limited or API fails.
-    Includes retry logic for transient failures.
+    Throttled and 5xx responses are retried by the session (honouring Retry-After).
     """
     try:
         url = f"https://ipapi.co/phone/{phone}/json/"
         params = {"key": api_key}
-        response = requests.get(url, params=params, timeout=Config.API_TIMEOUT_SECONDS)
+        response = SESSION.get(url, params=params, timeout=Config.API_TIMEOUT_SECONDS)
         
         # Check for rate limiting (HTTP 429 = Too Many Requests)
         if response.status_code == 429:
             raise Exception(f"ipapi.com rate limit reached (HTTP 429) - monthly quota exhausted")
         
         if response.status_code == 200:
-            data = response.json()
+            data = _json_loads(response.content)
             
             # Check for API errors (including rate limits in error response)
             if data.get("error"):
@@ -326,3 +725,75 @@ def lookup_ipapi(phone: str, api_key: str) -> Optional[Dict]:
     
     return None
 
+
+async def lookup_numlookupapi_async(session, phone: str, api_key: str) -> Optional[Dict]:
+    """Async version of lookup_numlookupapi using a shared aiohttp session."""
+    try:
+        url = f"https://api.numlookupapi.com/v1/validate/{phone}"
+        params = {"apikey": api_key}
+        async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            if response.status == 200:
+                data = await response.json(content_type=None, loads=_json_loads)
+                if data.get("valid"):
+                    return {
+                        "carrier": data.get("carrier"),
+                        "line_type": data.get("line_type"),  # mobile, landline, voip
+                        "country_code": data.get("country_code"),
+                        "country_name": data.get("country_name"),
+                        "location": data.get("location")
+                    }
+    except Exception as e:
+        logger.debug("NumLookupAPI lookup failed: %s", e)
+    
+    return None
+
+
+async def lookup_ipapi_async(session, phone: str, api_key: str) -> Optional[Dict]:
+    """
+    Async version of lookup_ipapi using a shared aiohttp session.
+    Raises on rate limit/quota errors so the caller can log them; other failures return None.
+    """
+    try:
+        url = f"https://ipapi.co/phone/{phone}/json/"
+        params = {"key": api_key}
+        async with session.get(url, params=params,
+                               timeout=aiohttp.ClientTimeout(total=Config.API_TIMEOUT_SECONDS)) as response:
+            # Check for rate limiting (HTTP 429 = Too Many Requests)
+            if response.status == 429:
+                raise Exception(f"ipapi.com rate limit reached (HTTP 429) - monthly quota exhausted")
+            
+            if response.status == 200:
+                data = await response.json(content_type=None, loads=_json_loads)
+                
+                # Check for API errors (including rate limits in error response)
+                if data.get("error"):
+                    error_info = data.get("error", {})
+                    error_msg = error_info.get("info", "Unknown API error")
+                    if any(keyword in error_msg.lower() for keyword in ["rate limit", "quota", "exceeded", "limit reached"]):
+                        raise Exception(f"ipapi.com monthly quota exhausted: {error_msg}")
+                    return None
+                
+                return {
+                    "carrier": data.get("carrier"),
+                    "line_type": data.get("type"),  # mobile, landline, voip
+                    "country_code": data.get("country_code"),
+                    "country_name": data.get("country_name"),
+                    "location": data.get("location"),
+                    "timezone": data.get("timezone")
+                }
+    
+    except asyncio.TimeoutError:
+        logger.warning(f"ipapi.com timeout for {phone[:10]}..., using fallback data")
+        return None
+    except aiohttp.ClientError as e:
+        logger.warning(f"ipapi.com network error for {phone[:10]}..., using fallback data: {e}")
+        return None
+    except Exception as e:
+        # Re-raise rate limit/quota errors so we can log them properly
+        error_str = str(e).lower()
+        if any(keyword in error_str for keyword in ["rate limit", "quota", "exceeded", "429"]):
+            raise e
+        return None
+    
+    return None
+
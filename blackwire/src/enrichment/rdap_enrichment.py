@@ -6,8 +6,13 @@ Inspired by rdap-lookup tool capabilities.
 
 import socket
 import ssl
-from typing import Dict, Optional, List
-from datetime import datetime
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict, deque
+from functools import lru_cache
+from typing import Callable, Dict, Optional, List
+from datetime import datetime, timezone
 import re
 import difflib
 
@@ -16,8 +21,11 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.utils.logger import logger
-from src.utils.retry import retry_with_backoff
 from src.utils.rate_limiter import check_rate_limit, record_api_request
+from src.utils.dns_resolver import get_async_resolver
+from src.utils.cache import TTLCache
+from src.utils.disk_cache import get_disk_cached, set_disk_cached
+from src.utils.http_session import create_session
 
 # Try to import dns.resolver (required for email security)
 try:
@@ -29,6 +37,45 @@ except ImportError:
     logger.warning("dnspython not available - email security analysis will be limited")
 
 
+# Try to import cryptography for parsing peer certificates (optional)
+try:
+    from cryptography import x509
+    from cryptography.x509.oid import NameOID
+    CRYPTOGRAPHY_AVAILABLE = True
+except ImportError:
+    CRYPTOGRAPHY_AVAILABLE = False
+    x509 = None
+    NameOID = None
+
+
+# Try to import rapidfuzz for typosquatting similarity (optional, C implementation)
+try:
+    from rapidfuzz import fuzz, process as fuzz_process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+    fuzz = None
+    fuzz_process = None
+
+
+# Try to import ijson for streaming RDAP responses (optional)
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+    ijson = None
+
+
+# Try to import pyahocorasick for single-pass record token scanning (optional)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
+
+
 # Try to import whoisit for RDAP lookups (optional)
 try:
     import whoisit
@@ -37,18 +84,251 @@ except ImportError:
     WHOISIT_AVAILABLE = False
     whoisit = None
 
+# RDAP and certificate data change on the order of days; failures are retried sooner
+_RDAP_CACHE = TTLCache(maxsize=10000, ttl_seconds=86400)
+_SSL_CACHE = TTLCache(maxsize=10000, ttl_seconds=86400)
+_DISK_TTL_HOURS = 24
+_NEGATIVE_DISK_TTL_HOURS = 1
+
+# RDAP event actions copied onto the domain result, as (result field, eventAction)
+_RDAP_EVENT_FIELDS = (
+    ("registration_date", "registration"),
+    ("expiration_date", "expiration"),
+    ("last_changed", "last changed"),
+)
+
+# RDAP members copied onto the domain/IP results, as (result field, member, default)
+_RDAP_DOMAIN_FIELDS = (
+    ("handle", "handle", None),
+    ("status", "status", []),
+    ("entities", "entities", []),
+    ("events", "events", []),
+    ("nameservers", "nameservers", []),
+    ("secure_dns", "secureDNS", {}),
+    ("rdap_conformance", "rdapConformance", []),
+    ("object_class", "objectClassName", None),
+)
+_RDAP_IP_FIELDS = (
+    ("handle", "handle", None),
+    ("start_address", "startAddress", None),
+    ("end_address", "endAddress", None),
+    ("ip_version", "ipVersion", None),
+    ("country", "country", None),
+    ("entities", "entities", []),
+    ("events", "events", []),
+    ("object_class", "objectClassName", None),
+)
+# Top-level RDAP members kept from domain/IP responses (notices, links, remarks
+# and the rest are dropped while the body is read)
+_RDAP_DOMAIN_MEMBERS = frozenset(member for _, member, _ in _RDAP_DOMAIN_FIELDS)
+_RDAP_IP_MEMBERS = frozenset(member for _, member, _ in _RDAP_IP_FIELDS)
+_RDAP_HEADERS = {"Accept": "application/rdap+json, application/json"}
+_RDAP_TIMEOUT_SECONDS = 20
+
+# IANA RDAP bootstrap registry (which server answers for each TLD/IP range) changes rarely
+_BOOTSTRAP_DISK_TTL_HOURS = 7 * 24
+_bootstrap_lock = threading.Lock()
+
+# Shared keep-alive session for RDAP queries, so batch lookups against the same
+# registry reuse TCP/TLS connections
+SESSION = create_session(pool_connections=32, pool_maxsize=32)
+
+# One client context for every SSL/TLS analysis (building it loads the CA bundle;
+# SSLContext is safe to share between threads)
+_SSL_CTX = ssl.create_default_context()
+_SSL_CTX.check_hostname = False
+_SSL_CTX.verify_mode = ssl.CERT_NONE  # We'll verify manually
+
+# Protocol versions probed for the "supported" matrix, each on its own pinned context
+_PROBED_TLS_VERSIONS = (
+    ("TLSv1", ssl.TLSVersion.TLSv1),
+    ("TLSv1.1", ssl.TLSVersion.TLSv1_1),
+    ("TLSv1.2", ssl.TLSVersion.TLSv1_2),
+    ("TLSv1.3", ssl.TLSVersion.TLSv1_3),
+)
+_PROTOCOL_PROBE_TIMEOUT_SECONDS = 2
+_SSL_CONNECT_TIMEOUT_SECONDS = 10
+
+_analysis_pool = None
+_analysis_pool_lock = threading.Lock()
+
+
+def _get_analysis_pool() -> ThreadPoolExecutor:
+    """Get the shared thread pool that runs the blocking RDAP/SSL/DNS stages."""
+    global _analysis_pool
+    if _analysis_pool is None:
+        with _analysis_pool_lock:
+            if _analysis_pool is None:
+                _analysis_pool = ThreadPoolExecutor(max_workers=64, thread_name_prefix="rdap-analysis")
+    return _analysis_pool
+
+
+async def _run_blocking(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(_get_analysis_pool(), func, *args)
+
+
+async def enrich_with_rdap_async(domain: str, ip: Optional[str] = None) -> Dict:
+    """Async version of enrich_with_rdap (runs on the shared analysis pool)."""
+    return await _run_blocking(enrich_with_rdap, domain, ip)
+
+
+def _cached_analysis(memory: TTLCache, entity_type: str, key: str, ok_field: str) -> Optional[Dict]:
+    """Look up a cached analysis result in memory, then on disk (only successes are kept in memory)."""
+    cached = memory.get(key)
+    if cached is not None:
+        return dict(cached)
+    
+    cached = get_disk_cached(entity_type, key)
+    if cached is not None and cached.get(ok_field):
+        memory.set(key, dict(cached))
+    return cached
+
+
+def _store_analysis(memory: TTLCache, entity_type: str, key: str, result: Dict, ok: bool):
+    """Cache an analysis result; failures are kept on disk for a shorter time."""
+    if ok:
+        memory.set(key, dict(result))
+    set_disk_cached(entity_type, key, result,
+                    ttl_hours=_DISK_TTL_HOURS if ok else _NEGATIVE_DISK_TTL_HOURS)
+
 
-def enrich_with_rdap(domain: str, ip: Optional[str] = None) -> Dict:
+def ensure_rdap_bootstrap() -> bool:
+    """
+    Load the IANA RDAP bootstrap data once per process. Returns True if RDAP can be used.
+    
+    The data is kept in the disk cache for a week, so new processes skip the
+    IANA fetch.
+    """
+    if not WHOISIT_AVAILABLE:
+        return False
+    
+    if not whoisit.is_bootstrapped():
+        with _bootstrap_lock:
+            if not whoisit.is_bootstrapped():
+                cached = get_disk_cached("rdap_bootstrap", "iana")
+                if cached:
+                    try:
+                        whoisit.load_bootstrap_data(cached)
+                    except Exception as e:
+                        logger.debug(f"Cached RDAP bootstrap data unusable, refetching: {e}")
+                if not whoisit.is_bootstrapped():
+                    whoisit.bootstrap()
+                    set_disk_cached("rdap_bootstrap", "iana", whoisit.save_bootstrap_data(),
+                                    ttl_hours=_BOOTSTRAP_DISK_TTL_HOURS)
+    return True
+
+
+def enrich_with_rdap(domain: str, ip: Optional[str] = None, session=None) -> Dict:
     """
     Enrich domain/IP with RDAP data.
     
+    The domain and IP objects are looked up and cached separately, for a day
+    (an hour when nothing was found), so a domain-only lookup such as WHOIS
+    and a later domain+IP lookup share the domain query. Only lookups that
+    miss the cache count against the "rdap" rate limit.
+    
     Args:
         domain: Domain name
         ip: IP address (optional)
+        session: requests.Session for the RDAP queries (default: the shared keep-alive SESSION)
     
     Returns:
         Dict with RDAP information
     """
+    session = session or SESSION
+    if not WHOISIT_AVAILABLE:
+        return _enrich_with_rdap(domain, ip, session)
+    
+    result = {
+        "rdap_available": False,
+        "rdap_data": {},
+        "errors": []
+    }
+    for part_domain, part_ip in ((domain, None), (None, ip)):
+        if not (part_domain or part_ip):
+            continue
+        part = _enrich_with_rdap_cached(part_domain, part_ip, session)
+        result["rdap_available"] = result["rdap_available"] or part["rdap_available"]
+        result["rdap_data"].update(part["rdap_data"])
+        result["errors"].extend(part["errors"])
+    return result
+
+
+def _enrich_with_rdap_cached(domain: Optional[str], ip: Optional[str], session) -> Dict:
+    """_enrich_with_rdap for one object (domain or IP), through the RDAP cache and rate limit."""
+    cache_key = f"{(domain or '').lower()}|{ip or ''}"
+    cached = _cached_analysis(_RDAP_CACHE, "rdap", cache_key, "rdap_available")
+    if cached is not None:
+        return cached
+    
+    if not check_rate_limit("rdap"):
+        return {
+            "rdap_available": False,
+            "rdap_data": {},
+            "errors": ["RDAP rate limit reached"]
+        }
+    record_api_request("rdap")
+    
+    result = _enrich_with_rdap(domain, ip, session)
+    _store_analysis(_RDAP_CACHE, "rdap", cache_key, result, result["rdap_available"])
+    return result
+
+
+def _fetch_rdap_object(session, query_type: str, value: str, members: frozenset) -> Dict:
+    """
+    Query the bootstrapped RDAP server for an object, keeping only some top-level members.
+    
+    With ijson the body is streamed member by member, so large responses are
+    never held in full; otherwise it is decoded with response.json().
+    
+    Args:
+        session: requests.Session to send the query on
+        query_type: whoisit query type ("domain" or "ip")
+        value: Domain name or IP address
+        members: Top-level RDAP member names to keep
+    
+    Returns:
+        Dict of the kept members, as raw RDAP JSON
+    """
+    method, url, _ = whoisit.build_query(query_type=query_type, query_value=value)
+    with session.request(method, url, headers=_RDAP_HEADERS, timeout=_RDAP_TIMEOUT_SECONDS,
+                         stream=True) as response:
+        response.raise_for_status()
+        if IJSON_AVAILABLE:
+            # Let urllib3 undo gzip/deflate before ijson reads the raw stream
+            response.raw.decode_content = True
+            items = ijson.kvitems(response.raw, "", use_float=True)
+        else:
+            items = response.json().items()
+        return {key: item for key, item in items if key in members}
+
+
+def _compile_rdap_extractor(name: str, fields) -> Callable[[Dict], Dict]:
+    """
+    Generate a function that copies fields out of an RDAP object with one dict literal.
+    
+    The keys and defaults are inlined into the generated source, so there is
+    no per-field loop at call time; defaults are literals, so each call gets
+    fresh lists/dicts.
+    
+    Args:
+        name: Name for the generated function
+        fields: (result field, RDAP member, default) tuples
+    
+    Returns:
+        Function mapping an RDAP object to the result dict
+    """
+    items = ", ".join(f"{field!r}: rdap.get({member!r}, {default!r})" for field, member, default in fields)
+    namespace = {}
+    exec(f"def {name}(rdap):\n    return {{{items}}}\n", namespace)
+    return namespace[name]
+
+
+_extract_rdap_domain = _compile_rdap_extractor("_extract_rdap_domain", _RDAP_DOMAIN_FIELDS)
+_extract_rdap_ip = _compile_rdap_extractor("_extract_rdap_ip", _RDAP_IP_FIELDS)
+
+
+def _enrich_with_rdap(domain: str, ip: Optional[str], session) -> Dict:
     result = {
         "rdap_available": False,
         "rdap_data": {},
@@ -60,40 +340,28 @@ def enrich_with_rdap(domain: str, ip: Optional[str] = None) -> Dict:
         return result
     
     try:
+        ensure_rdap_bootstrap()
+        
         # RDAP lookup for domain
         if domain:
             try:
-                rdap_domain = whoisit.domain(domain)
+                rdap_domain = _fetch_rdap_object(session, "domain", domain, _RDAP_DOMAIN_MEMBERS)
                 result["rdap_available"] = True
-                result["rdap_data"]["domain"] = {
-                    "handle": rdap_domain.get("handle"),
-                    "status": rdap_domain.get("status", []),
-                    "entities": rdap_domain.get("entities", []),
-                    "events": rdap_domain.get("events", []),
-                    "nameservers": rdap_domain.get("nameservers", []),
-                    "secure_dns": rdap_domain.get("secureDNS", {}),
-                    "rdap_conformance": rdap_domain.get("rdapConformance", []),
-                    "object_class": rdap_domain.get("objectClassName"),
-                }
+                result["rdap_data"]["domain"] = _extract_rdap_domain(rdap_domain)
                 
-                # Extract key dates
-                events = rdap_domain.get("events", [])
-                for event in events:
-                    event_type = event.get("eventAction")
-                    if event_type == "registration":
-                        result["rdap_data"]["domain"]["registration_date"] = event.get("eventDate")
-                    elif event_type == "expiration":
-                        result["rdap_data"]["domain"]["expiration_date"] = event.get("eventDate")
-                    elif event_type == "last changed":
-                        result["rdap_data"]["domain"]["last_changed"] = event.get("eventDate")
+                # Extract key dates (one pass; the last event of each action wins)
+                event_map = {event.get("eventAction"): event.get("eventDate") for event in rdap_domain.get("events", [])}
+                for field, action in _RDAP_EVENT_FIELDS:
+                    if action in event_map:
+                        result["rdap_data"]["domain"][field] = event_map[action]
                 
                 # Extract registrar info from entities
-                entities = rdap_domain.get("entities", [])
-                for entity in entities:
-                    roles = entity.get("roles", [])
-                    if "registrar" in roles:
-                        result["rdap_data"]["domain"]["registrar"] = entity.get("vcardArray", [])
-                        break
+                registrar = next(
+                    (entity for entity in rdap_domain.get("entities", []) if "registrar" in entity.get("roles", ())),
+                    None
+                )
+                if registrar is not None:
+                    result["rdap_data"]["domain"]["registrar"] = registrar.get("vcardArray", [])
                 
             except Exception as e:
                 logger.debug(f"RDAP domain lookup failed for {domain}: {e}")
@@ -102,29 +370,19 @@ def enrich_with_rdap(domain: str, ip: Optional[str] = None) -> Dict:
         # RDAP lookup for IP
         if ip:
             try:
-                rdap_ip = whoisit.ip(ip)
+                rdap_ip = _fetch_rdap_object(session, "ip", ip, _RDAP_IP_MEMBERS)
                 result["rdap_available"] = True
-                result["rdap_data"]["ip"] = {
-                    "handle": rdap_ip.get("handle"),
-                    "start_address": rdap_ip.get("startAddress"),
-                    "end_address": rdap_ip.get("endAddress"),
-                    "ip_version": rdap_ip.get("ipVersion"),
-                    "country": rdap_ip.get("country"),
-                    "entities": rdap_ip.get("entities", []),
-                    "events": rdap_ip.get("events", []),
-                    "object_class": rdap_ip.get("objectClassName"),
-                }
+                result["rdap_data"]["ip"] = _extract_rdap_ip(rdap_ip)
                 
-                # Extract ASN if available
-                entities = rdap_ip.get("entities", [])
-                for entity in entities:
-                    roles = entity.get("roles", [])
-                    if "registrant" in roles or "technical" in roles:
-                        # Try to extract ASN from entity
-                        asn_info = entity.get("asn", {})
-                        if asn_info:
-                            result["rdap_data"]["ip"]["asn"] = asn_info
-                            break
+                # Extract ASN if available (first registrant/technical entity that carries one)
+                asn_info = next(
+                    (entity.get("asn") for entity in rdap_ip.get("entities", [])
+                     if ("registrant" in entity.get("roles", ()) or "technical" in entity.get("roles", ()))
+                     and entity.get("asn")),
+                    None
+                )
+                if asn_info:
+                    result["rdap_data"]["ip"]["asn"] = asn_info
                 
             except Exception as e:
                 logger.debug(f"RDAP IP lookup failed for {ip}: {e}")
@@ -137,11 +395,28 @@ def enrich_with_rdap(domain: str, ip: Optional[str] = None) -> Dict:
     return result
 
 
-@retry_with_backoff(max_retries=2)
 def analyze_ssl_tls(domain: str) -> Dict:
     """
     Comprehensive SSL/TLS analysis for a domain.
     
+    Synchronous wrapper around analyze_ssl_tls_async.
+    
+    Args:
+        domain: Domain name to analyze
+    
+    Returns:
+        Dict with SSL/TLS analysis results
+    """
+    return asyncio.run(analyze_ssl_tls_async(domain))
+
+
+async def analyze_ssl_tls_async(domain: str) -> Dict:
+    """
+    Async version of analyze_ssl_tls.
+    
+    The handshake and protocol probes run on the event loop, so many domains
+    can be analyzed concurrently without holding a thread each.
+    
     Analyzes:
     - Certificate details (issuer, validity, subject)
     - Supported protocols (TLS 1.0, 1.1, 1.2, 1.3)
@@ -149,12 +424,30 @@ def analyze_ssl_tls(domain: str) -> Dict:
     - Certificate chain
     - Security vulnerabilities
     
+    Results are cached per domain for a day (an hour when no TLS connection
+    could be made).
+    
     Args:
         domain: Domain name to analyze
     
     Returns:
         Dict with SSL/TLS analysis results
     """
+    cache_key = domain.lower()
+    cached = _cached_analysis(_SSL_CACHE, "ssl_tls", cache_key, "ssl_available")
+    if cached is not None:
+        return cached
+    
+    result = await _analyze_ssl_tls(domain)
+    _store_analysis(_SSL_CACHE, "ssl_tls", cache_key, result, result["ssl_available"])
+    return result
+
+
+# Letter grade by grade_score // 10 (90+ is A, 80s B, 70s C, 60s D, below F)
+_GRADE_LUT = ("F", "F", "F", "F", "F", "F", "D", "C", "B", "A", "A")
+
+
+async def _analyze_ssl_tls(domain: str) -> Dict:
     result = {
         "ssl_available": False,
         "certificate": {},
@@ -166,20 +459,27 @@ def analyze_ssl_tls(domain: str) -> Dict:
     }
     
     try:
-        # Connect to domain on HTTPS port
-        context = ssl.create_default_context()
-        context.check_hostname = False
-        context.verify_mode = ssl.CERT_NONE  # We'll verify manually
-        
-        with socket.create_connection((domain, 443), timeout=10) as sock:
-            with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                # Get certificate
-                cert = ssock.getpeercert()
-                cert_binary = ssock.getpeercert(binary_form=True)
-                
-                result["ssl_available"] = True
-                
-                # Parse certificate details
+        # Connect to domain on HTTPS port (SNI via server_hostname)
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(domain, 443, ssl=_SSL_CTX, server_hostname=domain),
+            timeout=_SSL_CONNECT_TIMEOUT_SECONDS
+        )
+        try:
+            ssl_object = writer.get_extra_info("ssl_object")
+            
+            # Get certificate
+            cert_binary = ssl_object.getpeercert(binary_form=True)
+            
+            result["ssl_available"] = True
+            
+            # Parse certificate details (from the DER: with CERT_NONE the
+            # getpeercert() dict is empty)
+            not_after = None
+            if CRYPTOGRAPHY_AVAILABLE and cert_binary:
+                details, not_after = _parse_der_certificate(cert_binary)
+                result["certificate"] = dict(details)
+            else:
+                cert = ssl_object.getpeercert()
                 result["certificate"] = {
                     "subject": dict(x[0] for x in cert.get("subject", [])),
                     "issuer": dict(x[0] for x in cert.get("issuer", [])),
@@ -189,67 +489,66 @@ def analyze_ssl_tls(domain: str) -> Dict:
                     "not_after": cert.get("notAfter"),
                     "subject_alt_names": cert.get("subjectAltName", []),
                 }
-                
-                # Check certificate validity
-                days_until_expiry = None
-                not_after_str = cert.get("notAfter")
-                if not_after_str:
-                    try:
-                        not_after = datetime.strptime(not_after_str, "%b %d %H:%M:%S %Y %Z")
-                        days_until_expiry = (not_after - datetime.now()).days
-                        result["certificate"]["days_until_expiry"] = days_until_expiry
-                        result["certificate"]["is_valid"] = days_until_expiry > 0
-                        
-                        if days_until_expiry < 30:
-                            result["security_issues"].append("Certificate expires soon")
-                        if days_until_expiry < 0:
-                            result["security_issues"].append("Certificate expired")
-                    except Exception:
-                        pass
-                
-                # Get SSL version
-                result["protocols"]["version"] = ssock.version()
-                
-                # Get cipher suite
-                cipher = ssock.cipher()
-                if cipher:
-                    result["cipher_suites"] = [{
-                        "name": cipher[0],
-                        "version": cipher[1],
-                        "bits": cipher[2]
-                    }]
-                
-                # Check for weak protocols
-                ssl_version = ssock.version()
-                if ssl_version in ["TLSv1", "TLSv1.1"]:
-                    result["security_issues"].append(f"Weak protocol: {ssl_version}")
-                
-                # Check for weak ciphers
-                if cipher:
-                    cipher_name = cipher[0]
-                    weak_ciphers = ["RC4", "DES", "MD5", "SHA1"]
-                    if any(weak in cipher_name for weak in weak_ciphers):
-                        result["security_issues"].append(f"Weak cipher: {cipher_name}")
-                
-                # Calculate security grade
-                grade_score = 100
-                if result["security_issues"]:
-                    grade_score -= len(result["security_issues"]) * 20
-                if days_until_expiry is not None and days_until_expiry < 30:
-                    grade_score -= 10
-                
-                if grade_score >= 90:
-                    result["grade"] = "A"
-                elif grade_score >= 80:
-                    result["grade"] = "B"
-                elif grade_score >= 70:
-                    result["grade"] = "C"
-                elif grade_score >= 60:
-                    result["grade"] = "D"
-                else:
-                    result["grade"] = "F"
-    
-    except socket.timeout:
+                if cert.get("notAfter"):
+                    not_after = _parse_cert_time(cert["notAfter"])
+            
+            # Check certificate validity
+            days_until_expiry = None
+            if not_after:
+                try:
+                    days_until_expiry = (not_after - datetime.now(timezone.utc).replace(tzinfo=None)).days
+                    result["certificate"]["days_until_expiry"] = days_until_expiry
+                    result["certificate"]["is_valid"] = days_until_expiry > 0
+                    
+                    if days_until_expiry < 30:
+                        result["security_issues"].append("Certificate expires soon")
+                    if days_until_expiry < 0:
+                        result["security_issues"].append("Certificate expired")
+                except Exception:
+                    pass
+            
+            # Get SSL version
+            result["protocols"]["version"] = ssl_object.version()
+            
+            # Get cipher suite
+            cipher = ssl_object.cipher()
+            if cipher:
+                result["cipher_suites"] = [{
+                    "name": cipher[0],
+                    "version": cipher[1],
+                    "bits": cipher[2]
+                }]
+            
+            # Check for weak protocols
+            ssl_version = ssl_object.version()
+            if ssl_version in ["TLSv1", "TLSv1.1"]:
+                result["security_issues"].append(f"Weak protocol: {ssl_version}")
+            
+            # Check for weak ciphers
+            if cipher:
+                cipher_name = cipher[0]
+                weak_ciphers = ["RC4", "DES", "MD5", "SHA1"]
+                if any(weak in cipher_name for weak in weak_ciphers):
+                    result["security_issues"].append(f"Weak cipher: {cipher_name}")
+            
+            # Which protocol versions the server accepts (probed concurrently)
+            result["protocols"]["supported"] = await _probe_protocol_versions(domain)
+            
+            # Calculate security grade
+            grade_score = 100
+            if result["security_issues"]:
+                grade_score -= len(result["security_issues"]) * 20
+            if days_until_expiry is not None and days_until_expiry < 30:
+                grade_score -= 10
+            result["grade"] = _GRADE_LUT[min(10, max(0, grade_score // 10))]
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+    
+    except (socket.timeout, asyncio.TimeoutError):
         result["errors"].append("Connection timeout")
     except socket.gaierror:
         result["errors"].append("DNS resolution failed")
@@ -263,10 +562,197 @@ def analyze_ssl_tls(domain: str) -> Dict:
     return result
 
 
+@lru_cache(maxsize=None)
+def _pinned_tls_context(version: ssl.TLSVersion) -> Optional[ssl.SSLContext]:
+    """Client context that only speaks one protocol version (None if the local OpenSSL can't)."""
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    try:
+        if version < ssl.TLSVersion.TLSv1_2:
+            context.set_ciphers("ALL:@SECLEVEL=0")  # Legacy versions need legacy ciphers
+        context.minimum_version = version
+        context.maximum_version = version
+    except (ValueError, ssl.SSLError):
+        return None
+    return context
+
+
+async def _probe_protocol_versions(domain: str) -> Dict[str, Optional[bool]]:
+    """
+    Check which TLS versions domain accepts, all versions at once.
+    
+    Returns:
+        Dict of version name -> True (handshake succeeded), False (refused),
+        or None (could not be tested, e.g. timeout or not supported locally)
+    """
+    outcomes = await asyncio.gather(
+        *(_probe_protocol_version(domain, _pinned_tls_context(version)) for _, version in _PROBED_TLS_VERSIONS)
+    )
+    return {name: outcome for (name, _), outcome in zip(_PROBED_TLS_VERSIONS, outcomes)}
+
+
+async def _probe_protocol_version(domain: str, context: Optional[ssl.SSLContext]) -> Optional[bool]:
+    if context is None:
+        return None
+    try:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(domain, 443, ssl=context, server_hostname=domain),
+            timeout=_PROTOCOL_PROBE_TIMEOUT_SECONDS
+        )
+    except (ssl.SSLError, ConnectionResetError):
+        return False
+    except (OSError, asyncio.TimeoutError):
+        return None
+    
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except Exception:
+        pass
+    return True
+
+
+# Certificate name attributes, under the OpenSSL long names getpeercert() uses
+_NAME_ATTRIBUTES = {
+    NameOID.COMMON_NAME: "commonName",
+    NameOID.ORGANIZATION_NAME: "organizationName",
+    NameOID.ORGANIZATIONAL_UNIT_NAME: "organizationalUnitName",
+    NameOID.COUNTRY_NAME: "countryName",
+    NameOID.STATE_OR_PROVINCE_NAME: "stateOrProvinceName",
+    NameOID.LOCALITY_NAME: "localityName",
+    NameOID.EMAIL_ADDRESS: "emailAddress",
+    NameOID.SERIAL_NUMBER: "serialNumber",
+    NameOID.DOMAIN_COMPONENT: "domainComponent",
+} if CRYPTOGRAPHY_AVAILABLE else {}
+
+
+def _format_cert_time(moment: datetime) -> str:
+    """Format a UTC time the way getpeercert() does, e.g. 'Jan  5 09:00:00 2026 GMT'."""
+    return f"{moment:%b} {moment.day:2d} {moment:%H:%M:%S %Y} GMT"
+
+
+_CERT_MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
+}
+
+
+def _parse_cert_time(value: str) -> Optional[datetime]:
+    """
+    Parse a getpeercert() time such as 'Jan  5 09:00:00 2026 GMT' into a naive UTC datetime.
+    
+    The format is fixed, so this splits it directly instead of going through
+    strptime's locale-dependent %b/%Z handling.
+    
+    Returns:
+        The parsed datetime, or None if the value is malformed
+    """
+    try:
+        month, day, clock, year = value.split()[:4]
+        hour, minute, second = clock.split(":")
+        return datetime(int(year), _CERT_MONTHS[month], int(day), int(hour), int(minute), int(second))
+    except (KeyError, ValueError):
+        return None
+
+
+def _x509_name(name) -> Dict:
+    return {_NAME_ATTRIBUTES.get(attr.oid, attr.oid.dotted_string): attr.value for attr in name}
+
+
+@lru_cache(maxsize=1024)
+def _parse_der_certificate(cert_binary: bytes):
+    """
+    Parse a DER certificate into the getpeercert()-style fields analyze_ssl_tls reports.
+    
+    Memoized per certificate, so retries and hosts sharing a certificate parse it once.
+    
+    Returns:
+        Tuple of (certificate details dict, expiry as naive UTC datetime); the
+        dict is shared between callers and must be copied before modification
+    """
+    cert = x509.load_der_x509_certificate(cert_binary)
+    not_before = getattr(cert, "not_valid_before_utc", None) or cert.not_valid_before
+    not_after = getattr(cert, "not_valid_after_utc", None) or cert.not_valid_after
+    not_before = not_before.replace(tzinfo=None)
+    not_after = not_after.replace(tzinfo=None)
+    
+    subject_alt_names = []
+    try:
+        for general_name in cert.extensions.get_extension_for_class(x509.SubjectAlternativeName).value:
+            if isinstance(general_name, x509.DNSName):
+                subject_alt_names.append(("DNS", general_name.value))
+            elif isinstance(general_name, x509.IPAddress):
+                subject_alt_names.append(("IP Address", str(general_name.value)))
+    except x509.ExtensionNotFound:
+        pass
+    
+    serial = f"{cert.serial_number:X}"
+    details = {
+        "subject": _x509_name(cert.subject),
+        "issuer": _x509_name(cert.issuer),
+        "version": cert.version.value + 1,
+        "serial_number": serial.zfill(len(serial) + len(serial) % 2),
+        "not_before": _format_cert_time(not_before),
+        "not_after": _format_cert_time(not_after),
+        "subject_alt_names": tuple(subject_alt_names),
+    }
+    return details, not_after
+
+
 def analyze_email_security(domain: str) -> Dict:
     """
     Analyze email security records (SPF, DMARC, DKIM).
     
+    Synchronous wrapper around analyze_email_security_async.
+    
+    Args:
+        domain: Domain name to analyze
+    
+    Returns:
+        Dict with email security analysis
+    """
+    return asyncio.run(analyze_email_security_async(domain))
+
+
+# DKIM selectors probed (records live at selector._domainkey.domain), all in
+# parallel; earlier entries win when several exist. The original five come
+# first, then selectors published by common mail providers.
+_DKIM_SELECTORS = (
+    "default", "mail", "google", "selector1", "dkim",
+    "selector2",                                    # Microsoft 365
+    "k1", "k2", "k3",                               # Mailchimp / Mandrill, Klaviyo
+    "s1", "s2",                                     # SendGrid
+    "fm1", "fm2", "fm3",                            # Fastmail
+    "protonmail", "protonmail2", "protonmail3",     # Proton Mail
+    "zoho", "zmail",                                # Zoho
+    "sig1",                                         # iCloud
+    "mandrill", "mailjet", "mxvault", "cm", "pm",   # Mandrill, Mailjet, MXroute, Campaign Monitor, Postmark
+    "zendesk1", "zendesk2",                         # Zendesk
+    "everlytickey1", "everlytickey2",               # Everlytic
+    "krs", "smtp", "mx", "email", "dkim1", "key1",  # Mailgun and generic names
+)
+
+# Tokens looked for in SPF and DKIM records ("all"/"-all" are matched against
+# the lowercased SPF record, since SPF mechanisms are case-insensitive)
+_EMAIL_RECORD_TOKENS = ("all", "-all", "v=DKIM1", "k=rsa")
+# DMARC p= and pct= tags (\b keeps sp= from being read as the domain policy)
+_DMARC_TAG_RE = re.compile(r"\bp=(?P<policy>none|quarantine|reject)\b|\bpct=(?P<pct>\d*)")
+
+# Negative answers (NXDOMAIN, or NoAnswer for the record type) by (name, record
+# type), so batch runs don't re-probe missing _dmarc/_domainkey records;
+# positive answers are cached by the shared resolver
+_NEGATIVE_DNS_CACHE = TTLCache(maxsize=50000, ttl_seconds=300)
+
+
+async def analyze_email_security_async(domain: str) -> Dict:
+    """
+    Async version of analyze_email_security.
+    
+    The SPF, DMARC and DKIM selector lookups are sent together on the shared
+    async resolver (which caches answers), so the analysis costs about one
+    DNS round trip instead of one per record.
+    
     Args:
         domain: Domain name to analyze
     
@@ -285,108 +771,57 @@ def analyze_email_security(domain: str) -> Dict:
         result["errors"].append("dnspython not available - email security analysis requires dnspython")
         return result
     
+    resolver = get_async_resolver()
+    
     try:
+        names = [domain, f"_dmarc.{domain}"] + [f"{selector}._domainkey.{domain}" for selector in _DKIM_SELECTORS]
+        answers = await asyncio.gather(*(_resolve_txt(resolver, name) for name in names), return_exceptions=True)
+        spf_answers, dmarc_answers, dkim_answers = answers[0], answers[1], answers[2:]
+        
         # Check SPF record
-        try:
-            spf_answers = dns.resolver.resolve(domain, 'TXT')
-            for answer in spf_answers:
-                txt_record = str(answer).strip('"')
-                if txt_record.startswith("v=spf1"):
-                    result["spf"]["present"] = True
-                    result["spf"]["record"] = txt_record
-                    
-                    # Check for common SPF issues
-                    if "all" not in txt_record.lower():
-                        result["spf"]["issues"].append("SPF record missing 'all' mechanism")
-                    if "~all" in txt_record or "-all" not in txt_record:
-                        if "-all" not in txt_record:
-                            result["spf"]["issues"].append("SPF record should use '-all' for strict policy")
-                    
-                    break
-        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+        if isinstance(spf_answers, (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer)):
             result["spf"]["issues"].append("No SPF record found")
-        except Exception as e:
-            logger.debug(f"SPF lookup failed for {domain}: {e}")
-            result["errors"].append(f"SPF lookup failed: {str(e)}")
+        elif isinstance(spf_answers, Exception):
+            logger.debug(f"SPF lookup failed for {domain}: {spf_answers}")
+            result["errors"].append(f"SPF lookup failed: {str(spf_answers)}")
+        else:
+            _apply_spf_answers(result["spf"], spf_answers)
         
         # Check DMARC record
-        try:
-            dmarc_domain = f"_dmarc.{domain}"
-            dmarc_answers = dns.resolver.resolve(dmarc_domain, 'TXT')
-            for answer in dmarc_answers:
-                txt_record = str(answer).strip('"')
-                if txt_record.startswith("v=DMARC1"):
-                    result["dmarc"]["present"] = True
-                    result["dmarc"]["record"] = txt_record
-                    
-                    # Parse DMARC policy
-                    if "p=none" in txt_record:
-                        result["dmarc"]["policy"] = "none"
-                        result["dmarc"]["issues"].append("DMARC policy is 'none' (no protection)")
-                    elif "p=quarantine" in txt_record:
-                        result["dmarc"]["policy"] = "quarantine"
-                    elif "p=reject" in txt_record:
-                        result["dmarc"]["policy"] = "reject"
-                    
-                    # Check for pct (percentage)
-                    if "pct=100" not in txt_record and "pct=" in txt_record:
-                        result["dmarc"]["issues"].append("DMARC not applied to 100% of emails")
-                    
-                    break
-        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+        if isinstance(dmarc_answers, (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer)):
             result["dmarc"]["issues"].append("No DMARC record found")
-        except Exception as e:
-            logger.debug(f"DMARC lookup failed for {domain}: {e}")
-            result["errors"].append(f"DMARC lookup failed: {str(e)}")
+        elif isinstance(dmarc_answers, Exception):
+            logger.debug(f"DMARC lookup failed for {domain}: {dmarc_answers}")
+            result["errors"].append(f"DMARC lookup failed: {str(dmarc_answers)}")
+        else:
+            _apply_dmarc_answers(result["dmarc"], dmarc_answers)
         
-        # Check DKIM (typically in selector._domainkey.domain)
-        # Common selectors: default, mail, google, selector1, etc.
-        common_selectors = ["default", "mail", "google", "selector1", "dkim"]
+        # Check DKIM: the first selector (in _DKIM_SELECTORS order) with a key record wins
         dkim_found = False
-        
-        for selector in common_selectors:
-            try:
-                dkim_domain = f"{selector}._domainkey.{domain}"
-                dkim_answers = dns.resolver.resolve(dkim_domain, 'TXT')
-                for answer in dkim_answers:
-                    txt_record = str(answer).strip('"')
-                    if "v=DKIM1" in txt_record or "k=rsa" in txt_record:
-                        result["dkim"]["present"] = True
-                        result["dkim"]["records"].append({
-                            "selector": selector,
-                            "record": txt_record[:100]  # Truncate for display
-                        })
-                        dkim_found = True
-                        break
-                if dkim_found:
-                    break
-            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+        for selector, selector_answers in zip(_DKIM_SELECTORS, dkim_answers):
+            if isinstance(selector_answers, (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer)):
                 continue
-            except Exception as e:
-                logger.debug(f"DKIM lookup failed for {selector}._domainkey.{domain}: {e}")
+            if isinstance(selector_answers, Exception):
+                logger.debug(f"DKIM lookup failed for {selector}._domainkey.{domain}: {selector_answers}")
+                continue
+            for answer in selector_answers:
+                txt_record = str(answer).strip('"')
+                tokens = _record_tokens(txt_record)
+                if "v=DKIM1" in tokens or "k=rsa" in tokens:
+                    result["dkim"]["present"] = True
+                    result["dkim"]["records"].append({
+                        "selector": selector,
+                        "record": txt_record[:100]  # Truncate for display
+                    })
+                    dkim_found = True
+                    break
+            if dkim_found:
+                break
         
         if not dkim_found:
             result["dkim"]["issues"].append("No DKIM record found (checked common selectors)")
         
-        # Calculate security score
-        score = 0
-        if result["spf"]["present"] and not result["spf"]["issues"]:
-            score += 33
-        elif result["spf"]["present"]:
-            score += 15
-        
-        if result["dmarc"]["present"]:
-            if result["dmarc"]["policy"] == "reject":
-                score += 34
-            elif result["dmarc"]["policy"] == "quarantine":
-                score += 20
-            else:
-                score += 10
-        
-        if result["dkim"]["present"]:
-            score += 33
-        
-        result["security_score"] = score
+        result["security_score"] = _email_security_score(result)
     
     except Exception as e:
         logger.debug(f"Email security analysis failed for {domain}: {e}")
@@ -395,6 +830,128 @@ def analyze_email_security(domain: str) -> Dict:
     return result
 
 
+async def _resolve_txt(resolver, name: str):
+    """Resolve TXT records for name (see _resolve_cached_negative)."""
+    return await _resolve_cached_negative(resolver, name, 'TXT')
+
+
+async def _resolve_cached_negative(resolver, name: str, rdtype: str):
+    """Resolve name/rdtype, answering known-missing records from the negative cache."""
+    key = (name.lower(), rdtype)
+    # Only the exception class is cached: re-raising one shared instance would
+    # grow its traceback on every hit
+    cached = _NEGATIVE_DNS_CACHE.get(key)
+    if cached is not None:
+        raise cached()
+    try:
+        return await resolver.resolve(name, rdtype)
+    except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer) as e:
+        _NEGATIVE_DNS_CACHE.set(key, type(e))
+        raise
+
+
+def _build_email_token_automaton():
+    """Build one Aho-Corasick automaton over _EMAIL_RECORD_TOKENS."""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for token in _EMAIL_RECORD_TOKENS:
+        automaton.add_word(token, token)
+    automaton.make_automaton()
+    return automaton
+
+
+_EMAIL_TOKEN_AC = _build_email_token_automaton()
+
+
+def _record_tokens(txt_record: str) -> set:
+    """Return which _EMAIL_RECORD_TOKENS occur in a TXT record (one pass with pyahocorasick)."""
+    if _EMAIL_TOKEN_AC is not None:
+        return {token for _, token in _EMAIL_TOKEN_AC.iter(txt_record)}
+    return {token for token in _EMAIL_RECORD_TOKENS if token in txt_record}
+
+
+def _apply_spf_answers(spf: Dict, answers) -> None:
+    for answer in answers:
+        txt_record = str(answer).strip('"')
+        if txt_record.startswith("v=spf1"):
+            spf["present"] = True
+            spf["record"] = txt_record
+            
+            # Check for common SPF issues (one scan finds both "all" and a strict "-all")
+            tokens = _record_tokens(txt_record.lower())
+            if "all" not in tokens:
+                spf["issues"].append("SPF record missing 'all' mechanism")
+            if "-all" not in tokens:
+                spf["issues"].append("SPF record should use '-all' for strict policy")
+            
+            break
+
+
+def _apply_dmarc_answers(dmarc: Dict, answers) -> None:
+    for answer in answers:
+        txt_record = str(answer).strip('"')
+        if txt_record.startswith("v=DMARC1"):
+            dmarc["present"] = True
+            dmarc["record"] = txt_record
+            
+            # Parse DMARC policy and pct tags in one pass
+            policy = pct = None
+            for match in _DMARC_TAG_RE.finditer(txt_record):
+                if match.group("policy") and policy is None:
+                    policy = match.group("policy")
+                elif match.group("pct") is not None and pct is None:
+                    pct = match.group("pct")
+            
+            dmarc["policy"] = policy
+            if policy == "none":
+                dmarc["issues"].append("DMARC policy is 'none' (no protection)")
+            
+            # Check for pct (percentage)
+            if pct is not None and pct != "100":
+                dmarc["issues"].append("DMARC not applied to 100% of emails")
+            
+            break
+
+
+def _email_security_score(result: Dict) -> int:
+    score = 0
+    if result["spf"]["present"] and not result["spf"]["issues"]:
+        score += 33
+    elif result["spf"]["present"]:
+        score += 15
+    
+    if result["dmarc"]["present"]:
+        if result["dmarc"]["policy"] == "reject":
+            score += 34
+        elif result["dmarc"]["policy"] == "quarantine":
+            score += 20
+        else:
+            score += 10
+    
+    if result["dkim"]["present"]:
+        score += 33
+    
+    return score
+
+
+# Common typosquatting patterns:
+# 1. Character substitution (homoglyphs)
+# 2. Character insertion/deletion
+# 3. Character transposition
+# 4. TLD swapping
+_HOMOGLYPHS = {
+    'o': ('0',),
+    'i': ('1', 'l'),
+    'e': ('3',),
+    'a': ('@',),
+    's': ('5', '$'),
+}
+_SUSPICIOUS_TLDS = frozenset({"tk", "ml", "ga", "cf", "gq"})
+_DIGIT_RE = re.compile(r'\d')
+
+
 def detect_typosquatting(domain: str) -> Dict:
     """
     Detect potential typosquatting domains.
@@ -421,44 +978,16 @@ def detect_typosquatting(domain: str) -> Dict:
             return result
         
         base_domain = domain_parts[-2]  # Second to last part (e.g., "example" from "example.com")
+        base_lower = base_domain.lower()
         tld = domain_parts[-1]
         
-        # Common typosquatting patterns
-        patterns = []
-        
-        # 1. Character substitution (homoglyphs)
-        homoglyphs = {
-            'o': ['0'],
-            'i': ['1', 'l'],
-            'e': ['3'],
-            'a': ['@'],
-            's': ['5', '$'],
-        }
-        
-        # 2. Character insertion/deletion
-        # 3. Character transposition
-        # 4. TLD swapping
-        
         # Calculate similarity to common legitimate domains
-        # This is a simplified check - in production, you'd check against a database
-        common_domains = [
-            "google", "facebook", "amazon", "microsoft", "apple", "twitter",
-            "instagram", "linkedin", "youtube", "netflix", "paypal", "ebay"
-        ]
-        
-        max_similarity = 0.0
-        most_similar = None
-        
-        for common_domain in common_domains:
-            similarity = difflib.SequenceMatcher(None, base_domain.lower(), common_domain.lower()).ratio()
-            if similarity > max_similarity:
-                max_similarity = similarity
-                most_similar = common_domain
+        max_similarity, most_similar = _closest_common_domain(base_lower)
         
         result["similarity_score"] = max_similarity
         
         # Check for suspicious patterns
-        if max_similarity > 0.85 and base_domain.lower() != most_similar:
+        if max_similarity > 0.85 and base_lower != most_similar:
             result["patterns_detected"].append(f"High similarity ({max_similarity:.1%}) to '{most_similar}'")
             result["risk_level"] = "high"
             result["recommendations"].append("Domain closely resembles a well-known brand - verify legitimacy")
@@ -467,8 +996,7 @@ def detect_typosquatting(domain: str) -> Dict:
             result["risk_level"] = "medium"
         
         # Check for suspicious TLDs
-        suspicious_tlds = ["tk", "ml", "ga", "cf", "gq"]
-        if tld.lower() in suspicious_tlds:
+        if tld.lower() in _SUSPICIOUS_TLDS:
             result["patterns_detected"].append(f"Suspicious TLD: .{tld}")
             if result["risk_level"] == "low":
                 result["risk_level"] = "medium"
@@ -479,7 +1007,7 @@ def detect_typosquatting(domain: str) -> Dict:
             result["recommendations"].append("Short domains are more susceptible to typos")
         
         # Check for numbers in domain (common in typosquatting)
-        if re.search(r'\d', base_domain):
+        if _DIGIT_RE.search(base_domain):
             result["patterns_detected"].append("Contains numbers (common in typosquatting)")
             if result["risk_level"] == "low":
                 result["risk_level"] = "medium"
@@ -491,6 +1019,56 @@ def detect_typosquatting(domain: str) -> Dict:
     return result
 
 
+# Well-known brands checked for lookalikes (simplified - in production, you'd check against a database),
+# bucketed by length: a SequenceMatcher ratio can be at most 2*min(len)/(sum of lens)
+_COMMON_DOMAINS = (
+    "google", "facebook", "amazon", "microsoft", "apple", "twitter",
+    "instagram", "linkedin", "youtube", "netflix", "paypal", "ebay"
+)
+_COMMON_DOMAINS_BY_LENGTH = defaultdict(list)
+for _index, _name in enumerate(_COMMON_DOMAINS):
+    _COMMON_DOMAINS_BY_LENGTH[len(_name)].append((_index, _name))
+
+
+@lru_cache(maxsize=4096)
+def _closest_common_domain(base_domain: str):
+    """
+    Most similar entry of _COMMON_DOMAINS to base_domain (lowercase).
+    
+    With rapidfuzz, one extractOne call scores every brand in C (fuzz.ratio,
+    the normalized Indel similarity). Otherwise difflib ratios are computed,
+    skipping length buckets whose best possible ratio cannot beat the current best.
+    
+    Returns:
+        Tuple of (similarity ratio 0-1, common domain or None)
+    """
+    if RAPIDFUZZ_AVAILABLE:
+        match = fuzz_process.extractOne(base_domain, _COMMON_DOMAINS, scorer=fuzz.ratio, processor=None)
+        if not match or not match[1]:
+            return 0.0, None
+        return match[1] / 100, match[0]
+    
+    n = len(base_domain)
+    bounds = sorted(
+        ((2.0 * min(n, length) / (n + length) if n + length else 0.0, length)
+         for length in _COMMON_DOMAINS_BY_LENGTH),
+        reverse=True
+    )
+    
+    matcher = difflib.SequenceMatcher(None, base_domain)
+    best = (0.0, len(_COMMON_DOMAINS), None)  # (ratio, list index for tie-breaks, name)
+    for bound, length in bounds:
+        if bound < best[0]:
+            break
+        for index, name in _COMMON_DOMAINS_BY_LENGTH[length]:
+            matcher.set_seq2(name)
+            similarity = matcher.ratio()
+            if similarity > best[0] or (similarity == best[0] and similarity > 0 and index < best[1]):
+                best = (similarity, index, name)
+    
+    return best[0], best[2]
+
+
 def enrich_with_rdap_features(domain: str, ip: Optional[str] = None) -> Dict:
     """
     Comprehensive enrichment using RDAP and security analysis features.
@@ -501,6 +1079,27 @@ def enrich_with_rdap_features(domain: str, ip: Optional[str] = None) -> Dict:
     - Email security (SPF/DMARC/DKIM)
     - Typosquatting detection
     
+    Synchronous wrapper around enrich_with_rdap_features_async; async callers
+    should await that directly instead.
+    
+    Args:
+        domain: Domain name
+        ip: IP address (optional)
+    
+    Returns:
+        Dict with all enrichment data
+    """
+    return asyncio.run(enrich_with_rdap_features_async(domain, ip))
+
+
+async def enrich_with_rdap_features_async(domain: str, ip: Optional[str] = None) -> Dict:
+    """
+    Async version of enrich_with_rdap_features.
+    
+    The RDAP, SSL/TLS and email security stages are independent network
+    lookups, so they run concurrently and the total latency is that of the
+    slowest stage rather than the sum.
+    
     Args:
         domain: Domain name
         ip: IP address (optional)
@@ -516,32 +1115,95 @@ def enrich_with_rdap_features(domain: str, ip: Optional[str] = None) -> Dict:
         "errors": []
     }
     
-    # RDAP lookups
-    if check_rate_limit("rdap"):
-        rdap_result = enrich_with_rdap(domain, ip)
-        result["rdap"] = rdap_result
-        if rdap_result.get("errors"):
-            result["errors"].extend(rdap_result["errors"])
-        record_api_request("rdap")
-    
-    # SSL/TLS analysis
+    # Rate limits are checked before scheduling (RDAP checks its own after the
+    # cache lookup); stages run in this order when stitched back
+    stages = [("rdap", "rdap", enrich_with_rdap_async(domain, ip))]
     if check_rate_limit("ssl_analysis"):
-        ssl_result = analyze_ssl_tls(domain)
-        result["ssl_tls"] = ssl_result
-        if ssl_result.get("errors"):
-            result["errors"].extend(ssl_result["errors"])
-        record_api_request("ssl_analysis")
-    
-    # Email security
+        stages.append(("ssl_tls", "ssl_analysis", analyze_ssl_tls_async(domain)))
     if check_rate_limit("email_security"):
-        email_result = analyze_email_security(domain)
-        result["email_security"] = email_result
-        if email_result.get("errors"):
-            result["errors"].extend(email_result["errors"])
-        record_api_request("email_security")
+        stages.append(("email_security", "email_security", analyze_email_security_async(domain)))
+    
+    outcomes = await asyncio.gather(*(coro for _, _, coro in stages), return_exceptions=True)
+    
+    for (key, service, _), outcome in zip(stages, outcomes):
+        if isinstance(outcome, Exception):
+            logger.debug(f"{service} stage failed for {domain}: {outcome}")
+            result["errors"].append(f"{service} failed: {str(outcome)}")
+        else:
+            result[key] = outcome
+            if outcome.get("errors"):
+                result["errors"].extend(outcome["errors"])
+        if service != "rdap":  # enrich_with_rdap records its own requests
+            record_api_request(service)
     
-    # Typosquatting detection
+    # Typosquatting detection (local, no I/O)
     typosquatting_result = detect_typosquatting(domain)
     result["typosquatting"] = typosquatting_result
     
     return result
+
+
+def enrich_many(domains: List[str], ip_map: Optional[Dict[str, str]] = None,
+                max_concurrency: int = 64) -> List[Dict]:
+    """
+    Run enrich_with_rdap_features for many domains with bounded concurrency.
+    
+    Synchronous wrapper around enrich_many_async.
+    
+    Args:
+        domains: Domain names
+        ip_map: Optional domain -> IP address for the RDAP IP lookup
+        max_concurrency: Maximum domains analysed at once
+    
+    Returns:
+        List of enrichment results, in the same order as domains
+    """
+    return asyncio.run(enrich_many_async(domains, ip_map, max_concurrency))
+
+
+async def enrich_many_async(domains: List[str], ip_map: Optional[Dict[str, str]] = None,
+                            max_concurrency: int = 64) -> List[Dict]:
+    """
+    Async version of enrich_many.
+    
+    Every domain shares the analysis thread pool and DNS resolver. Domains
+    are started round-robin by TLD, so requests to a single RDAP registry
+    (which rate-limit per client) are spread over the batch instead of
+    arriving in a burst.
+    
+    Args:
+        domains: Domain names
+        ip_map: Optional domain -> IP address for the RDAP IP lookup
+        max_concurrency: Maximum domains analysed at once
+    
+    Returns:
+        List of enrichment results, in the same order as domains
+    """
+    ip_map = ip_map or {}
+    semaphore = asyncio.Semaphore(max_concurrency)
+    results: List[Optional[Dict]] = [None] * len(domains)
+    
+    async def enrich_one(index: int):
+        domain = domains[index]
+        async with semaphore:
+            results[index] = await enrich_with_rdap_features_async(domain, ip_map.get(domain))
+    
+    # Tasks acquire the semaphore in creation order, so this is the start order
+    await asyncio.gather(*(enrich_one(index) for index in _interleave_by_tld(domains)))
+    return results
+
+
+def _interleave_by_tld(domains: List[str]) -> List[int]:
+    """Indexes of domains, taking one from each TLD in turn."""
+    by_tld = defaultdict(deque)
+    for index, domain in enumerate(domains):
+        by_tld[domain.rstrip(".").rsplit(".", 1)[-1].lower()].append(index)
+    
+    order = []
+    queues = deque(by_tld.values())
+    while queues:
+        queue = queues.popleft()
+        order.append(queue.popleft())
+        if queue:
+            queues.append(queue)
+    return order
@@ -1,15 +1,64 @@
-"""Risk assessment and severity scoring for entities."""
+"""
+Risk assessment and severity scoring for entities.
+
+The network-detection counts in _assess_patterns filter on
+phone_numbers(voip_provider), phone_numbers(country, carrier),
+domain_enrichment(registrar), domain_enrichment(ip_address),
+domain_enrichment(ip_addresses) (GIN) and messaging_handles(platform);
+PostgresClient._create_tables creates indexes on all of them.
+"""
 
 from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from datetime import date, timedelta
+import re
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.utils.logger import logger
+from src.utils.cache import TTLCache
 from src.enrichment.threat_intel import check_threat_intel
 
+# Suspicious handle patterns, told apart by match.lastgroup:
+# "numeric" = all numbers (burner account pattern),
+# "autogen" = very short prefix + numbers (auto-generated account pattern)
+_HANDLE_CLASSIFIER = re.compile(r'^(?P<numeric>[0-9]{6,})$|^(?P<autogen>[a-z]{1,3}[0-9]{4,})$')
+
+# Network-detection matches used by _assess_patterns (each excludes the entity
+# itself, and yields one row per other entity since phone, domain_id and
+# (handle, platform) are unique)
+_VOIP_MATCH_SQL = "SELECT 1 FROM phone_numbers WHERE voip_provider = %s AND phone != %s"
+_CLUSTER_MATCH_SQL = "SELECT 1 FROM phone_numbers WHERE country = %s AND carrier = %s AND phone != %s"
+_REGISTRAR_MATCH_SQL = """SELECT 1 FROM domain_enrichment e JOIN domains d ON d.id = e.domain_id
+    WHERE e.registrar = %s AND d.domain != %s"""
+_IP_MATCH_SQL = """SELECT 1 FROM domain_enrichment e JOIN domains d ON d.id = e.domain_id
+    WHERE (e.ip_address = %s OR e.ip_addresses ? %s) AND d.domain != %s"""
+_PLATFORM_MATCH_SQL = "SELECT 1 FROM messaging_handles WHERE platform = %s AND handle != %s"
+
+# Pattern counts and investigation history per (entity_type, value), reused
+# across repeated assessments in a session; the short TTL lets new data show up
+_PATTERN_CACHE = TTLCache(maxsize=4096, ttl_seconds=60)
+_HISTORY_CACHE = TTLCache(maxsize=4096, ttl_seconds=60)
+
+# enrichment_data fields _assess_patterns reads, per entity type (part of its cache key)
+_PATTERN_FIELDS = {
+    "phone": ("voip_provider", "country", "carrier"),
+    "domain": ("registrar", "ip_address"),
+    "wallet": ("transaction_count", "currency"),
+    "handle": ("platform", "detected_platform"),
+}
+
+# The counts are only compared against fixed thresholds, so each stops at one
+# past its highest threshold (a count at the limit means "at least that many")
+_COUNT_LIMITS = {
+    "voip_count": 6,
+    "cluster_count": 4,
+    "registrar_count": 11,
+    "ip_count": 6,
+    "platform_count": 11,
+}
+
 
 def assess_risk(
     entity_type: str,
@@ -66,36 +115,28 @@ def assess_risk(
             })
     
     # 2. Infrastructure Patterns (indicators of abuse)
-    infrastructure_risk = _assess_infrastructure_patterns(entity_type, enrichment_data)
-    severity_score += infrastructure_risk.get("score", 0)
-    if infrastructure_risk.get("score", 0) > 0:
-        risk_factors.extend(infrastructure_risk.get("factors", []))
+    infrastructure_risk = _assess_infrastructure_patterns(entity_type, enrichment_data, date.today())
+    severity_score += infrastructure_risk["score"]
+    risk_factors.extend(infrastructure_risk["factors"])
     
     # 3. Internal Investigation History (ONLY if there are external threats - don't inflate score from search history alone)
     # This prevents internal search history from inflating risk scores without actual external threat intelligence
     if has_external_threats:
-        if internal_history:
-            internal_risk = _assess_internal_history(internal_history)
-            severity_score += internal_risk.get("score", 0)
-            if internal_risk.get("score", 0) > 0:
-                risk_factors.extend(internal_risk.get("factors", []))
-        elif postgres_client:
+        if not internal_history and postgres_client:
             # Try to get internal history from database
             try:
                 internal_history = _get_internal_history(entity_type, value, postgres_client)
-                if internal_history:
-                    internal_risk = _assess_internal_history(internal_history)
-                    severity_score += internal_risk.get("score", 0)
-                    if internal_risk.get("score", 0) > 0:
-                        risk_factors.extend(internal_risk.get("factors", []))
             except Exception as e:
                 logger.debug(f"Could not get internal history: {e}")
+        if internal_history:
+            internal_risk = _assess_internal_history(internal_history)
+            severity_score += internal_risk["score"]
+            risk_factors.extend(internal_risk["factors"])
     
     # 4. Pattern Analysis (time-based, coordination indicators)
-    pattern_risk = _assess_patterns(entity_type, enrichment_data, postgres_client)
-    severity_score += pattern_risk.get("score", 0)
-    if pattern_risk.get("score", 0) > 0:
-        risk_factors.extend(pattern_risk.get("factors", []))
+    pattern_risk = _assess_patterns(entity_type, value, enrichment_data, postgres_client)
+    severity_score += pattern_risk["score"]
+    risk_factors.extend(pattern_risk["factors"])
     
     # Cap severity score at 100
     severity_score = min(100, severity_score)
@@ -151,22 +192,25 @@ def _assess_external_threats(entity_type: str, value: str, enrichment_data: Dict
         # Check handle against suspicious patterns
         # Most external services require paid APIs, but we can check patterns
         handle = value.lower()
-        suspicious_patterns = [
-            r'^[0-9]{6,}$',  # All numbers (burner account pattern)
-            r'^[a-z]{1,3}[0-9]{4,}$',  # Very short prefix + numbers (auto-generated)
-        ]
-        import re
-        for pattern in suspicious_patterns:
-            if re.match(pattern, handle):
-                threats["threat_level"] = "low"
-                threats["threat_sources"].append("Suspicious username pattern detected")
-                break
+        if _HANDLE_CLASSIFIER.match(handle):
+            threats["threat_level"] = "low"
+            threats["threat_sources"].append("Suspicious username pattern detected")
     
     return threats
 
 
-def _assess_infrastructure_patterns(entity_type: str, enrichment_data: Dict) -> Dict:
-    """Assess risk based on infrastructure patterns (burner domains, VOIP, etc.)."""
+def _assess_infrastructure_patterns(entity_type: str, enrichment_data: Dict, today: Optional[date] = None) -> Dict:
+    """
+    Assess risk based on infrastructure patterns (burner domains, VOIP, etc.).
+    
+    Args:
+        entity_type: Type of entity (phone, domain, wallet, handle)
+        enrichment_data: Enrichment data for the entity
+        today: Date domain ages are measured from (default: date.today())
+    
+    Returns:
+        Dict with the infrastructure score and risk factors
+    """
     factors = []
     score = 0
     
@@ -204,8 +248,8 @@ def _assess_infrastructure_patterns(entity_type: str, enrichment_data: Dict) ->
         creation_date = enrichment_data.get("creation_date")
         if creation_date:
             try:
-                created = datetime.strptime(creation_date, "%Y-%m-%d")
-                days_old = (datetime.now() - created).days
+                created = date.fromisoformat(creation_date)
+                days_old = ((today or date.today()) - created).days
                 if days_old < 90:
                     score += 15
                     factors.append({
@@ -213,7 +257,7 @@ def _assess_infrastructure_patterns(entity_type: str, enrichment_data: Dict) ->
                         "severity": "medium",
                         "message": f"Domain created {days_old} days ago - may be burner domain"
                     })
-            except:
+            except (TypeError, ValueError):
                 pass
         
         # CDN/proxy hiding (Cloudflare, etc.)
@@ -228,19 +272,19 @@ def _assess_infrastructure_patterns(entity_type: str, enrichment_data: Dict) ->
     elif entity_type == "handle":
         # Suspicious handle patterns
         handle = enrichment_data.get("normalized_handle") or enrichment_data.get("handle", "").lower()
+        handle_match = _HANDLE_CLASSIFIER.match(handle) if handle else None
+        handle_pattern = handle_match.lastgroup if handle_match else None
         
-        # All numbers (burner account pattern)
-        if handle and handle.isdigit() and len(handle) >= 6:
+        if handle_pattern == "numeric":
+            # All numbers (burner account pattern)
             score += 10
             factors.append({
                 "type": "numeric_handle",
                 "severity": "medium",
                 "message": "Handle is all numbers - common pattern for burner accounts"
             })
-        
-        # Very short prefix + numbers (auto-generated pattern)
-        import re
-        if handle and re.match(r'^[a-z]{1,3}[0-9]{4,}$', handle):
+        elif handle_pattern == "autogen":
+            # Very short prefix + numbers (auto-generated pattern)
             score += 8
             factors.append({
                 "type": "auto_generated_pattern",
@@ -333,11 +377,76 @@ def _assess_internal_history(internal_history: Dict) -> Dict:
     }
 
 
-def _assess_patterns(entity_type: str, enrichment_data: Dict, postgres_client=None) -> Dict:
+def _fetch_counts(cursor, queries: List[tuple]) -> Dict[str, int]:
+    """
+    Count matching rows for several queries in one SELECT (one round trip).
+    
+    Each count is a scalar subquery capped at _COUNT_LIMITS[name] rows, so
+    PostgreSQL can stop scanning once the highest threshold is passed.
+    
+    Args:
+        cursor: Database cursor
+        queries: (name, match query, params) for each count wanted
+    
+    Returns:
+        Dict of name -> count (at most _COUNT_LIMITS[name])
+    """
+    if not queries:
+        return {}
+    
+    cursor.execute(
+        "SELECT " + ", ".join(
+            f"(SELECT COUNT(*) FROM ({sql} LIMIT {_COUNT_LIMITS[name]}) AS {name})" for name, sql, _ in queries
+        ),
+        [param for _, _, params in queries for param in params]
+    )
+    row = cursor.fetchone() or ()
+    return {name: (row[i] if i < len(row) and row[i] is not None else 0)
+            for i, (name, _, _) in enumerate(queries)}
+
+
+def _count_label(name: str, count: int) -> str:
+    """Format a capped count from _fetch_counts ("11+" when it hit the limit)."""
+    return f"{count}+" if count >= _COUNT_LIMITS[name] else str(count)
+
+
+def invalidate(entity_type: str, value: str):
+    """
+    Drop the cached pattern and history results for an entity.
+    
+    Call after writing new data about the entity, so the next assessment
+    queries the database instead of waiting out the cache TTL.
+    
+    Args:
+        entity_type: Type of entity (phone, domain, wallet, handle)
+        value: Entity value
+    """
+    _PATTERN_CACHE.pop((entity_type, value))
+    _HISTORY_CACHE.pop((entity_type, value))
+
+
+def _assess_patterns(entity_type: str, value: str, enrichment_data: Dict, postgres_client=None) -> Dict:
     """
     Assess risk based on patterns (time-based, coordination).
     Uses database to find similar entities - shows network connections.
+    
+    Results are cached for a minute per entity, as long as the enrichment
+    fields the assessment reads are unchanged.
     """
+    if not (postgres_client and postgres_client.conn):
+        return {"score": 0, "factors": []}
+    
+    fields = tuple(enrichment_data.get(field) for field in _PATTERN_FIELDS.get(entity_type, ()))
+    cached = _PATTERN_CACHE.get((entity_type, value))
+    if cached is not None and cached[0] == fields:
+        return dict(cached[1])
+    
+    result = _query_patterns(entity_type, value, enrichment_data, postgres_client)
+    _PATTERN_CACHE.set((entity_type, value), (fields, dict(result)))
+    return result
+
+
+def _query_patterns(entity_type: str, value: str, enrichment_data: Dict, postgres_client) -> Dict:
     factors = []
     score = 0
     
@@ -346,23 +455,26 @@ def _assess_patterns(entity_type: str, enrichment_data: Dict, postgres_client=No
             cursor = postgres_client.conn.cursor()
             
             if entity_type == "phone":
-                # Find other phones using same VOIP provider (network detection)
                 voip_provider = enrichment_data.get("voip_provider")
+                country = enrichment_data.get("country")
+                carrier = enrichment_data.get("carrier")
+                queries = []
                 if voip_provider:
-                    cursor.execute("""
-                        SELECT COUNT(DISTINCT phone) as count
-                        FROM phone_numbers
-                        WHERE voip_provider = %s AND phone != %s
-                    """, (voip_provider, value))
-                    result = cursor.fetchone()
-                    voip_count = result[0] if result else 0
+                    queries.append(("voip_count", _VOIP_MATCH_SQL, (voip_provider, value)))
+                if country and carrier:
+                    queries.append(("cluster_count", _CLUSTER_MATCH_SQL, (country, carrier, value)))
+                counts = _fetch_counts(cursor, queries)
+                
+                # Find other phones using same VOIP provider (network detection)
+                if voip_provider:
+                    voip_count = counts["voip_count"]
                     
                     if voip_count > 5:
                         score += 15
                         factors.append({
                             "type": "voip_cluster",
                             "severity": "high",
-                            "message": f"⚠️ NETWORK DETECTED: {voip_count} other phone numbers use the same VOIP provider ({voip_provider}) - indicates coordinated operation"
+                            "message": f"⚠️ NETWORK DETECTED: {_count_label('voip_count', voip_count)} other phone numbers use the same VOIP provider ({voip_provider}) - indicates coordinated operation"
                         })
                     elif voip_count > 1:
                         score += 8
@@ -373,46 +485,37 @@ def _assess_patterns(entity_type: str, enrichment_data: Dict, postgres_client=No
                         })
                 
                 # Find phones from same country/carrier (geographic clustering)
-                country = enrichment_data.get("country")
-                carrier = enrichment_data.get("carrier")
                 if country and carrier:
-                    cursor.execute("""
-                        SELECT COUNT(DISTINCT phone) as count
-                        FROM phone_numbers
-                        WHERE country = %s AND carrier = %s AND phone != %s
-                    """, (country, carrier, value))
-                    result = cursor.fetchone()
-                    cluster_count = result[0] if result else 0
+                    cluster_count = counts["cluster_count"]
                     
                     if cluster_count > 3:
                         score += 5
                         factors.append({
                             "type": "geographic_cluster",
                             "severity": "low",
-                            "message": f"{cluster_count} other phones from same country/carrier - possible geographic cluster"
+                            "message": f"{_count_label('cluster_count', cluster_count)} other phones from same country/carrier - possible geographic cluster"
                         })
             
             elif entity_type == "domain":
-                # Find other domains with same registrar/IP/hosting (network detection)
+                # Find other domains with same registrar/IP (network detection)
                 registrar = enrichment_data.get("registrar")
                 ip_address = enrichment_data.get("ip_address")
-                isp = enrichment_data.get("isp")
+                queries = []
+                if registrar:
+                    queries.append(("registrar_count", _REGISTRAR_MATCH_SQL, (registrar, value)))
+                if ip_address:
+                    queries.append(("ip_count", _IP_MATCH_SQL, (ip_address, ip_address, value)))
+                counts = _fetch_counts(cursor, queries)
                 
                 if registrar:
-                    cursor.execute("""
-                        SELECT COUNT(DISTINCT domain) as count
-                        FROM domains
-                        WHERE registrar = %s AND domain != %s
-                    """, (registrar, value))
-                    result = cursor.fetchone()
-                    registrar_count = result[0] if result else 0
+                    registrar_count = counts["registrar_count"]
                     
                     if registrar_count > 10:
                         score += 20
                         factors.append({
                             "type": "registrar_cluster",
                             "severity": "high",
-                            "message": f"⚠️ NETWORK DETECTED: {registrar_count} other domains registered with {registrar} - part of larger operation"
+                            "message": f"⚠️ NETWORK DETECTED: {_count_label('registrar_count', registrar_count)} other domains registered with {registrar} - part of larger operation"
                         })
                     elif registrar_count > 3:
                         score += 10
@@ -423,20 +526,14 @@ def _assess_patterns(entity_type: str, enrichment_data: Dict, postgres_client=No
                         })
                 
                 if ip_address:
-                    cursor.execute("""
-                        SELECT COUNT(DISTINCT domain) as count
-                        FROM domains
-                        WHERE (ip_address = %s OR %s = ANY(ip_addresses)) AND domain != %s
-                    """, (ip_address, ip_address, value))
-                    result = cursor.fetchone()
-                    ip_count = result[0] if result else 0
+                    ip_count = counts["ip_count"]
                     
                     if ip_count > 5:
                         score += 15
                         factors.append({
                             "type": "ip_cluster",
                             "severity": "high",
-                            "message": f"⚠️ NETWORK DETECTED: {ip_count} other domains share the same IP address ({ip_address}) - same hosting/operation"
+                            "message": f"⚠️ NETWORK DETECTED: {_count_label('ip_count', ip_count)} other domains share the same IP address ({ip_address}) - same hosting/operation"
                         })
                     elif ip_count > 1:
                         score += 8
@@ -445,24 +542,6 @@ def _assess_patterns(entity_type: str, enrichment_data: Dict, postgres_client=No
                             "severity": "medium",
                             "message": f"Network connection: {ip_count} other domains on same IP"
                         })
-                
-                # Check hosting provider cluster
-                if isp:
-                    cursor.execute("""
-                        SELECT COUNT(DISTINCT domain) as count
-                        FROM domains
-                        WHERE isp = %s AND domain != %s
-                    """, (isp, value))
-                    result = cursor.fetchone()
-                    isp_count = result[0] if result else 0
-                    
-                    if isp_count > 5:
-                        score += 10
-                        factors.append({
-                            "type": "hosting_cluster",
-                            "severity": "medium",
-                            "message": f"Network connection: {isp_count} other domains use same hosting provider ({isp})"
-                        })
             
             elif entity_type == "wallet":
                 # Find wallets with similar transaction patterns
@@ -497,20 +576,15 @@ def _assess_patterns(entity_type: str, enrichment_data: Dict, postgres_client=No
                 # Find other handles from same platform (network detection)
                 platform = enrichment_data.get("platform") or enrichment_data.get("detected_platform")
                 if platform:
-                    cursor.execute("""
-                        SELECT COUNT(DISTINCT handle) as count
-                        FROM messaging_handles
-                        WHERE platform = %s AND handle != %s
-                    """, (platform, value))
-                    result = cursor.fetchone()
-                    platform_count = result[0] if result else 0
+                    counts = _fetch_counts(cursor, [("platform_count", _PLATFORM_MATCH_SQL, (platform, value))])
+                    platform_count = counts["platform_count"]
                     
                     if platform_count > 10:
                         score += 10
                         factors.append({
                             "type": "platform_cluster",
                             "severity": "medium",
-                            "message": f"Network connection: {platform_count} other handles on same platform ({platform})"
+                            "message": f"Network connection: {_count_label('platform_count', platform_count)} other handles on same platform ({platform})"
                         })
                 
                 # Find handles that appeared with same phone/domain/wallet (coordination)
@@ -520,6 +594,11 @@ def _assess_patterns(entity_type: str, enrichment_data: Dict, postgres_client=No
             cursor.close()
         except Exception as e:
             logger.debug(f"Pattern assessment error: {e}")
+            # Don't leave the shared connection in an aborted transaction
+            try:
+                postgres_client.conn.rollback()
+            except Exception:
+                pass
     
     return {
         "score": score,
@@ -528,10 +607,21 @@ def _assess_patterns(entity_type: str, enrichment_data: Dict, postgres_client=No
 
 
 def _get_internal_history(entity_type: str, value: str, postgres_client) -> Optional[Dict]:
-    """Get internal investigation history from database."""
+    """Get internal investigation history from database (cached for a minute per entity)."""
     if not postgres_client or not postgres_client.conn:
         return None
     
+    cached = _HISTORY_CACHE.get((entity_type, value))
+    if cached is not None:
+        return dict(cached)
+    
+    history = _query_internal_history(entity_type, value, postgres_client)
+    if history is not None:
+        _HISTORY_CACHE.set((entity_type, value), dict(history))
+    return history
+
+
+def _query_internal_history(entity_type: str, value: str, postgres_client) -> Optional[Dict]:
     try:
         cursor = postgres_client.conn.cursor()
         
@@ -9,6 +9,7 @@ from src.utils.logger import logger
 from src.utils.retry import retry_with_backoff
 from src.utils.rate_limiter import check_rate_limit, record_api_request
 from src.utils.cache import get_cached, set_cached
+from src.utils.dns_resolver import get_dnsbl_resolver
 
 
 # Rate limiters for different APIs (using global rate limiter functions)
@@ -503,9 +504,7 @@ def _check_spamhaus(domain: str) -> Optional[Dict]:
         
         # Check DROP list
         try:
-            resolver = dns.resolver.Resolver()
-            resolver.timeout = 5
-            resolver.lifetime = 5
+            resolver = get_dnsbl_resolver()
             query = f"{reversed_domain}.zen.spamhaus.org"
             answers = resolver.resolve(query, 'A')
             if answers:
@@ -517,9 +516,7 @@ def _check_spamhaus(domain: str) -> Optional[Dict]:
         
         # Check DROP-EDROP (extended)
         try:
-            resolver = dns.resolver.Resolver()
-            resolver.timeout = 5
-            resolver.lifetime = 5
+            resolver = get_dnsbl_resolver()
             query = f"{reversed_domain}.zen.spamhaus.org"
             answers = resolver.resolve(query, 'A')
             if answers:
@@ -546,9 +543,7 @@ def _check_surbl(domain: str) -> Optional[Dict]:
     try:
         # SURBL uses DNS lookups
         # Format: domain.multi.surbl.org
-        resolver = dns.resolver.Resolver()
-        resolver.timeout = 5
-        resolver.lifetime = 5
+        resolver = get_dnsbl_resolver()
         
         query = f"{domain}.multi.surbl.org"
         answers = resolver.resolve(query, 'A')
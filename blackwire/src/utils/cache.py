@@ -2,8 +2,11 @@
 
 import os
 import json
+import time
 import hashlib
-from typing import Dict, Optional
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
 from datetime import datetime, timedelta
 from functools import wraps
 
@@ -12,6 +15,57 @@ _cache = {}
 _cache_ttl = {}  # TTL for each cache entry
 
 
+class TTLCache:
+    """
+    Bounded, thread-safe in-memory LRU cache where every entry expires after a fixed TTL.
+    
+    Usage:
+        _WHOIS_CACHE = TTLCache(maxsize=10000, ttl_seconds=7 * 86400)
+        cached = _WHOIS_CACHE.get(domain)
+        ...
+        _WHOIS_CACHE.set(domain, result)
+    """
+    
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data = OrderedDict()  # key -> (expires_at, value), oldest first
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value, or default if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            if entry[0] < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return entry[1]
+    
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry when full."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def pop(self, key: Hashable):
+        """Remove a key if present."""
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+
 def get_cache_key(entity_type: str, value: str) -> str:
     """Generate a cache key for an entity."""
     key_string = f"{entity_type}:{value.lower().strip()}"
@@ -64,6 +118,42 @@ def set_cached(entity_type: str, value: str, data: Dict, ttl_hours: int = 24):
     _cache_ttl[cache_key] = datetime.now() + timedelta(hours=ttl_hours)
 
 
+def get_cached_many(entity_type: str, values: List[str], ttl_hours: int = 24) -> Dict[str, Dict]:
+    """
+    Get cached enrichment data for several values of one entity type.
+    
+    Args:
+        entity_type: Type of entity
+        values: Entity values
+        ttl_hours: Time-to-live in hours (default 24)
+    
+    Returns:
+        Dict of value -> cached data, containing only the values that were cached
+    """
+    found = {}
+    for value in values:
+        data = get_cached(entity_type, value, ttl_hours)
+        if data is not None:
+            found[value] = data
+    return found
+
+
+def set_cached_many(entity_type: str, items: Dict[str, Dict], ttl_hours: int = 24):
+    """
+    Cache enrichment data for several values of one entity type.
+    
+    Args:
+        entity_type: Type of entity
+        items: Dict of value -> data to cache
+        ttl_hours: Time-to-live in hours (default 24)
+    """
+    expires_at = datetime.now() + timedelta(hours=ttl_hours)
+    for value, data in items.items():
+        cache_key = get_cache_key(entity_type, value)
+        _cache[cache_key] = data
+        _cache_ttl[cache_key] = expires_at
+
+
 def clear_cache(entity_type: Optional[str] = None):
     """Clear cache entries, optionally filtered by entity type."""
     if entity_type:
@@ -39,11 +39,17 @@ class Config:
     # Caching
     CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
     CACHE_TTL_HOURS = int(os.getenv("CACHE_TTL_HOURS", "24"))
+    DISK_CACHE_ENABLED = os.getenv("DISK_CACHE_ENABLED", "true").lower() == "true"
+    DISK_CACHE_PATH = os.getenv("DISK_CACHE_PATH", "")  # Defaults to blackwire/cache/
     
     # Request Timeouts
     API_TIMEOUT_SECONDS = int(os.getenv("API_TIMEOUT_SECONDS", "10"))
+    DNS_LIFETIME_SECONDS = float(os.getenv("DNS_LIFETIME_SECONDS", "2.0"))
     DB_CONNECTION_TIMEOUT = int(os.getenv("DB_CONNECTION_TIMEOUT", "5"))
     
+    # DNS (explicit upstreams avoid slow local stub resolvers)
+    DNS_NAMESERVERS = [ns.strip() for ns in os.getenv("DNS_NAMESERVERS", "1.1.1.1,8.8.8.8").split(",") if ns.strip()]
+    
     # Logging
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
     LOG_FILE = os.getenv("LOG_FILE", "logs/blackwire.log")
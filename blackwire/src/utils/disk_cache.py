@@ -0,0 +1,168 @@
+"""Persistent disk cache (SQLite) for data that should survive process restarts."""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from src.utils.cache import get_cache_key
+from src.utils.config import Config
+from src.utils.logger import logger
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+# Datetimes go through default=str so entries read the same as with json.dumps
+_ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if ORJSON_AVAILABLE else 0
+
+# Default location sits next to the logs directory (blackwire/cache/)
+CACHE_DIR = Path(__file__).parent.parent.parent / "cache"
+
+_connection = None
+_lock = threading.Lock()
+
+
+def _get_connection() -> Optional[sqlite3.Connection]:
+    """Open (once) the shared SQLite connection, creating the schema if needed."""
+    global _connection
+
+    if _connection is not None:
+        return _connection
+
+    db_path = Path(Config.DISK_CACHE_PATH) if Config.DISK_CACHE_PATH else CACHE_DIR / "blackwire_cache.sqlite3"
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(str(db_path), timeout=5, check_same_thread=False)
+    # WAL lets several worker processes read while one writes
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS cache ("
+        "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+    )
+    conn.commit()
+    _connection = conn
+    return _connection
+
+
+def get_disk_cached_bytes(entity_type: str, value: str) -> Optional[bytes]:
+    """
+    Get raw cached bytes from the disk cache.
+
+    Args:
+        entity_type: Type of entity
+        value: Entity value
+
+    Returns:
+        Cached bytes if available and not expired, else None
+    """
+    if not Config.DISK_CACHE_ENABLED:
+        return None
+
+    cache_key = get_cache_key(entity_type, value)
+
+    try:
+        with _lock:
+            conn = _get_connection()
+            row = conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (cache_key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            if row[1] < time.time():
+                # Expired, remove it
+                conn.execute("DELETE FROM cache WHERE key = ?", (cache_key,))
+                conn.commit()
+                return None
+
+            return bytes(row[0])
+    except Exception as e:
+        logger.debug(f"Disk cache read failed for {entity_type}: {e}")
+
+    return None
+
+
+def set_disk_cached_bytes(entity_type: str, value: str, data: bytes, ttl_hours: float = 24):
+    """
+    Store raw bytes in the disk cache.
+
+    Args:
+        entity_type: Type of entity
+        value: Entity value
+        data: Bytes to cache
+        ttl_hours: Time-to-live in hours (default 24)
+    """
+    if not Config.DISK_CACHE_ENABLED:
+        return
+
+    cache_key = get_cache_key(entity_type, value)
+    expires_at = time.time() + ttl_hours * 3600
+
+    try:
+        with _lock:
+            conn = _get_connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (cache_key, sqlite3.Binary(data), expires_at)
+            )
+            conn.commit()
+    except Exception as e:
+        logger.debug(f"Disk cache write failed for {entity_type}: {e}")
+
+
+def get_disk_cached(entity_type: str, value: str) -> Optional[Any]:
+    """
+    Get JSON-serializable data from the disk cache.
+
+    Args:
+        entity_type: Type of entity
+        value: Entity value
+
+    Returns:
+        Cached data if available and not expired, else None
+    """
+    raw = get_disk_cached_bytes(entity_type, value)
+    if raw is None:
+        return None
+
+    try:
+        if ORJSON_AVAILABLE:
+            return orjson.loads(raw)
+        return json.loads(raw)
+    except ValueError:
+        return None
+
+
+def set_disk_cached(entity_type: str, value: str, data: Any, ttl_hours: float = 24):
+    """
+    Store JSON-serializable data in the disk cache.
+
+    Args:
+        entity_type: Type of entity
+        value: Entity value
+        data: Data to cache (non-JSON values such as datetimes are stored as strings)
+        ttl_hours: Time-to-live in hours (default 24)
+    """
+    if ORJSON_AVAILABLE:
+        raw = orjson.dumps(data, default=str, option=_ORJSON_OPTIONS)
+    else:
+        raw = json.dumps(data, default=str).encode()
+    set_disk_cached_bytes(entity_type, value, raw, ttl_hours)
+
+
+def clear_disk_cache():
+    """Remove all entries from the disk cache."""
+    try:
+        with _lock:
+            conn = _get_connection()
+            conn.execute("DELETE FROM cache")
+            conn.commit()
+    except Exception as e:
+        logger.debug(f"Disk cache clear failed: {e}")
@@ -0,0 +1,217 @@
+"""Shared DNS resolvers (configured once, with an answer cache shared across lookups)."""
+
+import asyncio
+import socket
+import threading
+from typing import List, Optional, Sequence
+
+from src.utils.config import Config
+
+try:
+    import dns.asyncquery
+    import dns.asyncresolver
+    import dns.entropy
+    import dns.flags
+    import dns.message
+    import dns.rcode
+    import dns.rdataclass
+    import dns.rdatatype
+    import dns.resolver
+    DNS_AVAILABLE = True
+except ImportError:
+    DNS_AVAILABLE = False
+    dns = None
+
+# Answers cached per resolver (dnspython honours record TTLs)
+_CACHE_SIZE = 10000
+
+_resolver = None
+_async_resolver = None
+_dnsbl_resolver = None
+_lock = threading.Lock()
+
+
+def _configure(resolver, lifetime: float):
+    """Apply the shared upstreams, lifetime and answer cache to a resolver."""
+    if Config.DNS_NAMESERVERS:
+        resolver.nameservers = Config.DNS_NAMESERVERS
+    resolver.lifetime = lifetime
+    resolver.cache = dns.resolver.LRUCache(_CACHE_SIZE)
+    return resolver
+
+
+def get_resolver() -> Optional["dns.resolver.Resolver"]:
+    """
+    Get the shared synchronous resolver.
+    
+    Uses explicit upstream nameservers (Config.DNS_NAMESERVERS) so
+    /etc/resolv.conf is not re-read per lookup, a short lifetime and an
+    LRU answer cache shared by every caller.
+    
+    Returns:
+        Resolver, or None if dnspython is not installed
+    """
+    global _resolver
+    if not DNS_AVAILABLE:
+        return None
+    if _resolver is None:
+        with _lock:
+            if _resolver is None:
+                _resolver = _configure(
+                    dns.resolver.Resolver(configure=not Config.DNS_NAMESERVERS),
+                    Config.DNS_LIFETIME_SECONDS
+                )
+    return _resolver
+
+
+def get_async_resolver() -> Optional["dns.asyncresolver.Resolver"]:
+    """Get the shared asyncio resolver (same upstreams, lifetime and cache settings)."""
+    global _async_resolver
+    if not DNS_AVAILABLE:
+        return None
+    if _async_resolver is None:
+        with _lock:
+            if _async_resolver is None:
+                _async_resolver = _configure(
+                    dns.asyncresolver.Resolver(configure=not Config.DNS_NAMESERVERS),
+                    Config.DNS_LIFETIME_SECONDS
+                )
+    return _async_resolver
+
+
+def get_dnsbl_resolver() -> Optional["dns.resolver.Resolver"]:
+    """
+    Get the shared resolver for DNS blocklist queries (Spamhaus, SURBL).
+    
+    Blocklists refuse queries relayed through public resolvers such as
+    1.1.1.1/8.8.8.8, so this one keeps the system configuration and only
+    adds the shared answer cache.
+    """
+    global _dnsbl_resolver
+    if not DNS_AVAILABLE:
+        return None
+    if _dnsbl_resolver is None:
+        with _lock:
+            if _dnsbl_resolver is None:
+                resolver = dns.resolver.Resolver()
+                resolver.timeout = 5
+                resolver.lifetime = 5
+                resolver.cache = dns.resolver.LRUCache(_CACHE_SIZE)
+                _dnsbl_resolver = resolver
+    return _dnsbl_resolver
+
+
+class _PipelinedQueryProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol that hands each response to the waiting query with the same ID."""
+    
+    def __init__(self, pending: dict):
+        self.pending = pending  # query id -> (query message, future)
+    
+    def datagram_received(self, data, addr):
+        try:
+            response = dns.message.from_wire(data)
+        except Exception:
+            return  # Malformed datagram, keep waiting for the real answer
+        
+        entry = self.pending.get(response.id)
+        if entry is not None and not entry[1].done() and entry[0].is_response(response):
+            entry[1].set_result(response)
+    
+    def error_received(self, exc):
+        for _, future in self.pending.values():
+            if not future.done():
+                future.set_exception(exc)
+
+
+def _answer_from_response(query, response):
+    """
+    Extract the answer rdatas for a query (following CNAMEs inside the response).
+    
+    Returns:
+        List of rdata objects, or the dnspython exception the resolver would raise
+    """
+    qname = query.question[0].name
+    rdtype = query.question[0].rdtype
+    
+    if response.rcode() == dns.rcode.NXDOMAIN:
+        return dns.resolver.NXDOMAIN(qnames=[qname])
+    if response.rcode() != dns.rcode.NOERROR:
+        return dns.resolver.NoNameservers(request=query, errors=[])
+    
+    name = qname
+    for _ in range(16):  # CNAME chain limit
+        rrset = response.get_rrset(response.answer, name, dns.rdataclass.IN, rdtype)
+        if rrset is not None:
+            return list(rrset)
+        if rdtype == dns.rdatatype.CNAME:
+            break
+        cname = response.get_rrset(response.answer, name, dns.rdataclass.IN, dns.rdatatype.CNAME)
+        if cname is None:
+            break
+        name = cname[0].target
+    
+    return dns.resolver.NoAnswer()
+
+
+async def resolve_many(qname: str, rdtypes: Sequence[str], nameserver: Optional[str] = None,
+                       timeout: Optional[float] = None) -> List:
+    """
+    Query several record types for one name over a single UDP socket.
+    
+    All queries are sent back-to-back and responses are matched by query ID,
+    so the round trips overlap without a socket per query. Truncated answers
+    are retried over TCP.
+    
+    Args:
+        qname: Name to query
+        rdtypes: Record types, e.g. ("A", "MX", "NS")
+        nameserver: Upstream to query (default: first of Config.DNS_NAMESERVERS)
+        timeout: Seconds to wait for all answers (default: Config.DNS_LIFETIME_SECONDS)
+    
+    Returns:
+        One entry per record type, in order: a list of rdatas, or the exception
+        for that type (NXDOMAIN/NoAnswer, or a timeout/socket error)
+    """
+    nameserver = nameserver or Config.DNS_NAMESERVERS[0]
+    timeout = timeout or Config.DNS_LIFETIME_SECONDS
+    loop = asyncio.get_running_loop()
+    
+    queries = []
+    futures = []
+    pending = {}
+    for rdtype in rdtypes:
+        query = dns.message.make_query(qname, rdtype)
+        while query.id in pending:
+            query.id = dns.entropy.random_16()
+        future = loop.create_future()
+        pending[query.id] = (query, future)
+        queries.append(query)
+        futures.append(future)
+    
+    family = socket.AF_INET6 if ":" in nameserver else socket.AF_INET
+    transport, _ = await loop.create_datagram_endpoint(
+        lambda: _PipelinedQueryProtocol(pending), remote_addr=(nameserver, 53), family=family
+    )
+    try:
+        for query in queries:
+            transport.sendto(query.to_wire())
+        responses = await asyncio.gather(
+            *[asyncio.wait_for(future, timeout) for future in futures],
+            return_exceptions=True
+        )
+    finally:
+        transport.close()
+    
+    results = []
+    for query, response in zip(queries, responses):
+        if isinstance(response, BaseException):
+            results.append(response)
+            continue
+        if response.flags & dns.flags.TC:
+            try:
+                response = await dns.asyncquery.tcp(query, nameserver, timeout=timeout)
+            except Exception as e:
+                results.append(e)
+                continue
+        results.append(_answer_from_response(query, response))
+    return results
@@ -0,0 +1,40 @@
+"""HTTP session factory with keep-alive connection pooling for API calls."""
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+
+def create_session(
+    pool_connections: int = 32,
+    pool_maxsize: int = 64,
+    max_retries=0,
+    user_agent: str = DEFAULT_USER_AGENT
+) -> requests.Session:
+    """
+    Create a requests.Session that reuses TCP/TLS connections across calls.
+    
+    Args:
+        pool_connections: Number of per-host connection pools to keep
+        pool_maxsize: Maximum idle connections kept per host
+        max_retries: Retry policy passed to the adapter (int or urllib3 Retry)
+        user_agent: User-Agent header sent with every request
+    
+    Returns:
+        Configured session (safe to share across threads for simple GETs)
+    
+    Usage:
+        SESSION = create_session()
+        response = SESSION.get(url, timeout=10)
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=max_retries
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = user_agent
+    return session
@@ -20,6 +20,7 @@ class RateLimiter:
         self._limits = {
             "ipapi.com": (1000, 30 * 24 * 3600),  # 1000/month = ~1.38/hour
             "ip-api.com": (45, 60),  # 45/minute
+            "ip-api.com/batch": (15, 60),  # 15 batch requests/minute (100 IPs each)
             "iplocate.io": (100, 60),  # Approximate
             "blockchain.info": (1, 1),  # ~1/second
             "blockchair.com": (100, 3600),  # 100/hour
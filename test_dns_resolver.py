@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Tests for the pipelined DNS answer handling in BlackWire's shared resolver."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add blackwire to path
+blackwire_path = Path(__file__).parent / "blackwire"
+sys.path.insert(0, str(blackwire_path))
+
+dns = pytest.importorskip("dns")
+import dns.flags
+import dns.message
+import dns.rcode
+import dns.resolver
+import dns.rrset
+
+from src.utils.dns_resolver import _answer_from_response
+
+
+def _response(qname, rdtype, rcode=dns.rcode.NOERROR, answers=()):
+    """
+    Build a response to a fresh query, with (name, type, rdata) answer records.
+    
+    The response goes through the wire format, as it does when it arrives
+    over UDP.
+    """
+    query = dns.message.make_query(qname, rdtype)
+    response = dns.message.make_response(query)
+    response.set_rcode(rcode)
+    for name, answer_type, rdata in answers:
+        response.answer.append(dns.rrset.from_text(name, 300, "IN", answer_type, rdata))
+    return query, dns.message.from_wire(response.to_wire())
+
+
+def test_noerror_returns_rdatas():
+    query, response = _response("example.com.", "A", answers=[("example.com.", "A", "93.184.216.34")])
+
+    answer = _answer_from_response(query, response)
+
+    assert [rdata.to_text() for rdata in answer] == ["93.184.216.34"]
+
+
+def test_nxdomain_returns_nxdomain():
+    query, response = _response("missing.example.com.", "A", rcode=dns.rcode.NXDOMAIN)
+
+    answer = _answer_from_response(query, response)
+
+    assert isinstance(answer, dns.resolver.NXDOMAIN)
+
+
+@pytest.mark.parametrize("rcode", [dns.rcode.SERVFAIL, dns.rcode.REFUSED])
+def test_server_failure_returns_no_nameservers(rcode):
+    query, response = _response("example.com.", "MX", rcode=rcode)
+
+    answer = _answer_from_response(query, response)
+
+    assert isinstance(answer, dns.resolver.NoNameservers)
+    assert str(answer)
+
+
+def test_cname_chain_is_followed():
+    query, response = _response("www.example.com.", "A", answers=[
+        ("www.example.com.", "CNAME", "edge.example.net."),
+        ("edge.example.net.", "CNAME", "lb.example.org."),
+        ("lb.example.org.", "A", "192.0.2.10"),
+    ])
+
+    answer = _answer_from_response(query, response)
+
+    assert [rdata.to_text() for rdata in answer] == ["192.0.2.10"]
+
+
+def test_cname_query_returns_the_cname_itself():
+    query, response = _response("www.example.com.", "CNAME", answers=[
+        ("www.example.com.", "CNAME", "edge.example.net."),
+    ])
+
+    answer = _answer_from_response(query, response)
+
+    assert [rdata.to_text() for rdata in answer] == ["edge.example.net."]
+
+
+def test_empty_noerror_returns_no_answer():
+    query, response = _response("example.com.", "AAAA")
+
+    answer = _answer_from_response(query, response)
+
+    assert isinstance(answer, dns.resolver.NoAnswer)
+
+
+def test_dangling_cname_returns_no_answer():
+    query, response = _response("www.example.com.", "A", answers=[
+        ("www.example.com.", "CNAME", "edge.example.net."),
+    ])
+
+    answer = _answer_from_response(query, response)
+
+    assert isinstance(answer, dns.resolver.NoAnswer)
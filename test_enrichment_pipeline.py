@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Tests for batch enrichment of non-domain entities on the pipeline's worker threads."""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+# Add blackwire to path
+blackwire_path = Path(__file__).parent / "blackwire"
+sys.path.insert(0, str(blackwire_path))
+
+from src.enrichment import enrichment_pipeline
+from src.utils.config import Config
+
+# Module body for the lazy enrichers: slow to import, so concurrent first
+# accesses from worker threads would overlap if the module were loaded there
+_ENRICHER_SOURCE = '''
+import time
+
+from lazy_enricher_loads import LOADS
+
+LOADS.append(__name__)
+time.sleep(0.2)
+
+
+def enrich(value):
+    return {"value": value}
+'''
+
+
+@pytest.fixture
+def lazy_enrichers(tmp_path, monkeypatch):
+    """Point phone, wallet and handle enrichment at lazily loaded test modules."""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    (tmp_path / "lazy_enricher_loads.py").write_text("LOADS = []\n")
+    monkeypatch.delitem(sys.modules, "lazy_enricher_loads", raising=False)
+    import lazy_enricher_loads
+    monkeypatch.setattr(Config, "CACHE_ENABLED", False)
+
+    enrichers = {}
+    for entity_type in ("phone", "wallet", "handle"):
+        name = f"lazy_{entity_type}_enricher"
+        (tmp_path / f"{name}.py").write_text(_ENRICHER_SOURCE)
+        monkeypatch.delitem(sys.modules, name, raising=False)
+        enrichers[entity_type] = (enrichment_pipeline._lazy_module(name), "enrich")
+
+    monkeypatch.setattr(enrichment_pipeline, "_ENRICHERS", {**enrichment_pipeline._ENRICHERS, **enrichers})
+    yield lazy_enricher_loads.LOADS
+    for entity_type in enrichers:
+        sys.modules.pop(f"lazy_{entity_type}_enricher", None)
+
+
+def test_enrich_entities_loads_each_enricher_once(lazy_enrichers):
+    pairs = [("phone", f"+1415555{n:04d}") for n in range(8)]
+    pairs += [("wallet", "0x52908400098527886E0F7030069857D2E4169EE7")] * 4
+    pairs += [("handle", f"@user{n}") for n in range(8)]
+
+    results = enrichment_pipeline.enrich_entities(pairs, max_concurrency=8)
+
+    assert sorted(lazy_enrichers) == ["lazy_handle_enricher", "lazy_phone_enricher", "lazy_wallet_enricher"]
+    assert [result["errors"] for result in results] == [[]] * len(pairs)
+    assert all(result["enriched"] for result in results)
+    assert [result["data"]["value"] for result in results] == [result["value"] for result in results]
+
+
+def test_concurrent_enrich_entity_loads_each_enricher_once(lazy_enrichers):
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda n: enrichment_pipeline.enrich_entity("handle", f"@user{n}"), range(4)))
+
+    assert lazy_enrichers == ["lazy_handle_enricher"]
+    assert [result["errors"] for result in results] == [[]] * 4
+    assert all(result["enriched"] for result in results)